@@ -1,14 +1,10 @@
 import logging
 import os
 from pathlib import Path
-from typing import Annotated, Any, List, Optional, override
+from typing import TYPE_CHECKING, Annotated, Any, List, Optional, override
 
-import jsonschema
 import pydantic
 import typer
-import yaml
-import yaml.scanner
-from dotenv import load_dotenv
 from pydantic import BaseModel, Field
 
 from ignite.composers import Composer, ContainerComposer, WorkspaceComposer
@@ -23,6 +19,10 @@ from ignite.models.config import Configuration
 from ignite.resolvers import PathResolver
 from ignite.utils import load_yaml_config
 
+if TYPE_CHECKING:
+    import jsonschema
+    import yaml.scanner
+
 REPOSITORY_CONTEXT_ENV_VAR = "REPOSITORY_CONTEXT"
 
 # Configure logger for CLI module
@@ -33,6 +33,8 @@ def __get_repository_context() -> Path:
     """Get the repository context from the environment variable."""
     repository_context = os.getenv(REPOSITORY_CONTEXT_ENV_VAR, None)
     if repository_context is None:
+        from dotenv import load_dotenv
+
         load_dotenv()
         repository_context = os.getenv(REPOSITORY_CONTEXT_ENV_VAR)
     if repository_context is None:
@@ -42,7 +44,7 @@ def __get_repository_context() -> Path:
     return Path(repository_context)
 
 
-def __handle_yaml_error(error: yaml.scanner.ScannerError) -> None:
+def __handle_yaml_error(error: "yaml.scanner.ScannerError") -> None:
     """Handle YAML parsing errors with structured logging."""
     message = ConfigurationFileErrorMessage.model_construct(
         line=error.problem_mark.line,
@@ -57,7 +59,7 @@ def __handle_yaml_error(error: yaml.scanner.ScannerError) -> None:
     raise typer.Exit(1)
 
 
-def __handle_schema_error(error: jsonschema.ValidationError) -> None:
+def __handle_schema_error(error: "jsonschema.ValidationError") -> None:
     """Handle JSON Schema validation errors with structured logging."""
     message = JsonSchemaValidationErrorMessage.model_construct(
         json_path=error.json_path,
@@ -144,6 +146,9 @@ def command(
         resolve_path=True,
     ),
 ):
+    import jsonschema
+    import yaml.scanner
+
     command = Command(configuration_path=configuration, context_path=context)
     schema = Configuration.model_json_schema()
     try:
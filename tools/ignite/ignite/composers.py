@@ -210,8 +210,7 @@ class Composer:
             else:
                 raise ValueError(f"Unsupported file write policy: {file_policy}.")
 
-        with open(output_path, "w") as f:
-            f.write(content)
+        output_path.write_bytes(content.encode("utf-8"))
         FilesystemMessage.save_file(output_path).log(self.logger)
         return
 
@@ -6,13 +6,12 @@ from ignite.cli import cli
 
 
 class TyperHandler(logging.Handler):
+    STDOUT_LEVELS = frozenset((logging.INFO, logging.DEBUG))
+
     def emit(self, record):
         try:
             msg = self.format(record)
-            if record.levelno in [logging.INFO, logging.DEBUG]:
-                err = False
-            else:
-                err = True
+            err = record.levelno not in self.STDOUT_LEVELS
             typer.echo(msg, err=err)
         except Exception:
             self.handleError(record)
@@ -1,11 +1,8 @@
-import configparser
 import io
 import json
 import logging
 from pathlib import Path
-from typing import Callable, List
-
-import yaml
+from typing import Callable, Dict, List, Type
 
 from ignite.utils import merge_dicts
 
@@ -49,10 +46,14 @@ class YamlFileMerger(FileMerger):
         super().__init__()
 
     def read(self, source: Path):
+        import yaml
+
         with open(source, "r") as f:
             return yaml.safe_load(f)
 
     def write(self, data, writer: Callable[[str], None]):
+        import yaml
+
         writer(yaml.dump(data, indent=2))
 
     def merge(self, sources: List[Path]):
@@ -68,6 +69,8 @@ class IniFileMerger(FileMerger):
         super().__init__()
 
     def read(self, source: Path):
+        import configparser
+
         config = configparser.ConfigParser()
         config.read(source)
         data = {}
@@ -96,6 +99,8 @@ class IniFileMerger(FileMerger):
         return data
 
     def write(self, data, writer: Callable[[str], None]):
+        import configparser
+
         config = configparser.ConfigParser()
         for section, values in data.items():
             if section not in config:
@@ -116,3 +121,11 @@ class IniFileMerger(FileMerger):
             data = self.read(src)
             merge_dicts(merged_data, data)
         return merged_data
+
+
+FILE_MERGERS: Dict[str, Type[FileMerger]] = {
+    ".json": JsonFileMerger,
+    ".yaml": YamlFileMerger,
+    ".yml": YamlFileMerger,
+    ".ini": IniFileMerger,
+}
@@ -11,7 +11,7 @@ from pydantic import (
     model_validator,
 )
 
-from ignite.mergers import FileMerger, IniFileMerger, JsonFileMerger, YamlFileMerger
+from ignite.mergers import FILE_MERGERS
 from ignite.models.common import Identifier, IdentifierPattern
 
 
@@ -330,15 +330,10 @@ class ResolvedFolder(BaseModel):
         if variables is None:
             raise ValueError("Variables cannot be None.")
         extension = pathlib.Path(self.destination).suffix
-        merger: FileMerger = None
-        if extension == ".json":
-            merger = JsonFileMerger()
-        elif extension in [".yaml", ".yml"]:
-            merger = YamlFileMerger()
-        elif extension == ".ini":
-            merger = IniFileMerger()
-        else:
+        merger_class = FILE_MERGERS.get(extension.lower())
+        if merger_class is None:
             raise ValueError(f"Unsupported file extension: {extension}")
+        merger = merger_class()
         data = merger.merge(self.sources)
         content = None
 
@@ -1,5 +1,6 @@
+import os
 from pathlib import Path
-from typing import List, Optional
+from typing import Dict, List, Optional, Set, Tuple, Union
 
 from ignite.models.fs import ReservedFileName
 
@@ -23,6 +24,20 @@ class PathResolver:
         """
         self.__repository_context: Path = repository_context
         self.__user_context: Path = user_context
+        self.__repository_root: str = os.fspath(repository_context)
+        self.__user_root: str = os.fspath(user_context)
+        self.__resolved_paths: Dict[Tuple[str, str], Path] = {}
+        self.__missing_paths: Set[Tuple[str, str]] = set()
+        self.__directory_files: Dict[str, List[Path]] = {}
+
+    def invalidate(self) -> None:
+        """
+        Clear the cached lookups so subsequent resolutions probe the filesystem
+        again.
+        """
+        self.__resolved_paths.clear()
+        self.__missing_paths.clear()
+        self.__directory_files.clear()
 
     def resolve(
         self, paths: List[Path], ref_paths: Optional[List[Path]] = None
@@ -51,9 +66,11 @@ class PathResolver:
         if ref_paths:
             self._resolve_ref(ref_paths, paths)
 
+        all_file_name = ReservedFileName.ALL.value
         for path in paths:
-            repository_path = Path(self.__repository_context, path.parent)
-            if path.name == ReservedFileName.ALL:
+            parent = os.fspath(path.parent)
+            repository_path = self._join_directory(self.__repository_root, parent)
+            if path.name == all_file_name:
                 resolved_paths.extend(self._resolve_all_file(repository_path))
                 continue
 
@@ -62,7 +79,7 @@ class PathResolver:
                 resolved_paths.append(repository_file)
                 continue
 
-            user_path = Path(self.__user_context, path.parent)
+            user_path = self._join_directory(self.__user_root, parent)
             user_file_stem = path.stem.removeprefix(".")
             user_file = self._resolve_path(user_path, user_file_stem)
             if user_file:
@@ -73,38 +90,84 @@ class PathResolver:
 
         return resolved_paths
 
-    def _resolve_path(self, path: Path, filename: str) -> Optional[Path]:
+    @staticmethod
+    def _join_directory(root: str, parent: str) -> str:
+        """
+        Join a context root and a relative parent directory as plain strings.
+
+        Args:
+            root (str): The context root directory
+            parent (str): The parent directory relative to the root
+
+        Returns:
+            str: The joined directory, or the root itself for the current directory
+        """
+        if parent == os.curdir:
+            return root
+        return os.path.join(root, parent)
+
+    def _resolve_path(self, path: Union[str, Path], filename: str) -> Optional[Path]:
         """
         Find a file with the given filename in the specified directory.
 
+        Lookups are cached per resolver instance, keyed by the directory and
+        filename, so repeated lookups skip the directory scan. Misses are
+        remembered as well until :meth:`invalidate` is called.
+
         Args:
-            path (Path): Directory to search in
+            path (Union[str, Path]): Directory to search in
             filename (str): Name of the file to find (without extension)
 
         Returns:
             Optional[Path]: Path to the found file, or None if not found
         """
-        for file in path.iterdir():
-            if file.is_file and file.stem == filename:
+        key = (os.fspath(path), filename)
+        resolved_path = self.__resolved_paths.get(key)
+        if resolved_path is not None:
+            return resolved_path
+        if key in self.__missing_paths:
+            return None
+        for file in self._list_files(path):
+            if file.stem == filename:
+                self.__resolved_paths[key] = file
                 return file
+        self.__missing_paths.add(key)
         return None
 
-    def _resolve_all_file(self, path: Path) -> List[Path]:
+    def _resolve_all_file(self, path: Union[str, Path]) -> List[Path]:
         """
         Get all files in the specified directory.
 
         Args:
-            path (Path): Directory to search for files
+            path (Union[str, Path]): Directory to search for files
 
         Returns:
             List[Path]: List of all files found in the directory
         """
-        resolved_paths = []
-        for file in path.iterdir():
-            if file.is_file():
-                resolved_paths.append(file)
-                continue
-        return resolved_paths
+        return list(self._list_files(path))
+
+    def _list_files(self, path: Union[str, Path]) -> List[Path]:
+        """
+        List the files of the specified directory.
+
+        The directory is read once with a single scandir pass and the listing
+        is cached per resolver instance until :meth:`invalidate` is called.
+        Directories are handled as plain strings and only the listed files are
+        turned into Path objects.
+
+        Args:
+            path (Union[str, Path]): Directory to list
+
+        Returns:
+            List[Path]: List of files found in the directory, in directory order
+        """
+        key = os.fspath(path)
+        files = self.__directory_files.get(key)
+        if files is None:
+            with os.scandir(key) as entries:
+                files = [Path(entry.path) for entry in entries if entry.is_file()]
+            self.__directory_files[key] = files
+        return files
 
     def _resolve_ref(self, ref_paths: List[Path], paths: List[Path]) -> None:
         """
@@ -120,20 +183,27 @@ class PathResolver:
             paths (List[Path]): List of paths that may contain $ref patterns.
                 This list is modified in-place.
         """
+        ref_file_name = ReservedFileName.REF.value
+        # Indexed once per call, every $ref entry is then a single lookup
+        ref_index = self._index_ref_paths(ref_paths)
         for path in paths:
-            if path.name == ReservedFileName.REF:
-                resolved_paths = self._resolve_ref_file(ref_paths, path)
+            if path.name == ref_file_name:
+                resolved_paths = self._resolve_ref_file(ref_index, path)
                 index = paths.index(path)
                 paths.remove(path)
                 for resolved_path in reversed(resolved_paths):
                     paths.insert(index, resolved_path)
 
-    def _resolve_ref_file(self, ref_paths: List[Path], ref_file: Path) -> List[Path]:
+    @staticmethod
+    def _resolve_ref_file(
+        ref_index: Dict[str, List[Path]], ref_file: Path
+    ) -> List[Path]:
         """
         Find reference paths that match the parent directory of the reference file.
 
         Args:
-            ref_paths (List[Path]): List of reference paths to search through
+            ref_index (Dict[str, List[Path]]): Reference paths grouped by parent
+                directory, as built by :meth:`_index_ref_paths`
             ref_file (Path): Reference file path whose parent directory is used
                 for matching
 
@@ -141,8 +211,21 @@ class PathResolver:
             List[Path]: List of reference paths that have the same parent
                 directory as the reference file
         """
-        paths = []
+        return list(ref_index.get(str(ref_file.parent), []))
+
+    @staticmethod
+    def _index_ref_paths(ref_paths: List[Path]) -> Dict[str, List[Path]]:
+        """
+        Group reference paths by their parent directory.
+
+        Args:
+            ref_paths (List[Path]): List of reference paths to index
+
+        Returns:
+            Dict[str, List[Path]]: Reference paths keyed by parent directory,
+                in their original order
+        """
+        ref_index: Dict[str, List[Path]] = {}
         for ref_path in ref_paths:
-            if ref_path.parent == ref_file.parent:
-                paths.append(ref_path)
-        return paths
+            ref_index.setdefault(str(ref_path.parent), []).append(ref_path)
+        return ref_index
@@ -2,9 +2,6 @@ import json
 from pathlib import Path
 from typing import Dict
 
-import yaml
-from jsonschema import SchemaError, ValidationError, validate
-
 
 def load_yaml_config(file_path: Path, schema: Dict) -> Dict:
     """
@@ -23,6 +20,8 @@ def load_yaml_config(file_path: Path, schema: Dict) -> Dict:
         json.JSONDecodeError: If the schema JSON is invalid.
         ValidationError: If the configuration does not match the schema.
     """
+    import yaml
+    from jsonschema import SchemaError, validate
 
     if len(schema.keys()) == 0:
         raise SchemaError("Schema is empty")
@@ -60,6 +59,8 @@ def merge_dicts(a: Dict, b: Dict) -> None:
         - Lists are concatenated (not merged element-wise)
         - Other data types are overwritten if they exist in both dictionaries
         - Keys that only exist in 'b' are added to 'a'
+        - Values are dispatched on their exact type, so subclasses of dict or
+          list (e.g. OrderedDict) are overwritten instead of being merged
 
     Example:
         >>> a = {'x': 1, 'y': {'a': 1, 'b': 2}, 'z': [1, 2]}
@@ -73,10 +74,12 @@ def merge_dicts(a: Dict, b: Dict) -> None:
         current_a, current_b = stack.pop()
         for key, value in current_b.items():
             if key in current_a:
-                if isinstance(current_a[key], dict) and isinstance(value, dict):
-                    stack.append((current_a[key], value))
-                elif isinstance(current_a[key], list) and isinstance(value, list):
-                    current_a[key] = current_a[key] + value
+                current_value = current_a[key]
+                value_type = type(value)
+                if value_type is dict and type(current_value) is dict:
+                    stack.append((current_value, value))
+                elif value_type is list and type(current_value) is list:
+                    current_a[key] = current_value + value
                 else:
                     current_a[key] = value
             else:
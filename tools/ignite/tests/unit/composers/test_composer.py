@@ -1,6 +1,6 @@
 import logging
 from pathlib import Path
-from unittest.mock import Mock, mock_open, patch
+from unittest.mock import Mock, patch
 
 import pytest
 from assertpy import assert_that
@@ -152,7 +152,7 @@ class TestComposerFolderPolicies:
         # User confirms folder creation
         mock_confirm.return_value = True
 
-        with patch("builtins.open", mock_open()) as mock_file:
+        with patch.object(Path, "write_bytes", autospec=True) as mock_write_bytes:
             composer._save_file(output_path, "test content")
 
         mock_confirm.assert_called_once_with(
@@ -160,8 +160,7 @@ class TestComposerFolderPolicies:
                 output_path.parent
             )
         )
-        mock_file.assert_called_once_with(output_path, "w")
-        mock_file().write.assert_called_once_with("test content")
+        mock_write_bytes.assert_called_once_with(output_path, b"test content")
 
         # Check that folder creation message was logged
         assert_that(
@@ -207,13 +206,12 @@ class TestComposerFolderPolicies:
         composer = Composer()
         output_path = tmp_path / "nonexistent" / "test.txt"
 
-        with patch("builtins.open", mock_open()) as mock_file:
+        with patch.object(Path, "write_bytes", autospec=True) as mock_write_bytes:
             composer._save_file(
                 output_path, "test content", folder_policy=FolderCreatePolicy.ALWAYS
             )
 
-        mock_file.assert_called_once_with(output_path, "w")
-        mock_file().write.assert_called_once_with("test content")
+        mock_write_bytes.assert_called_once_with(output_path, b"test content")
 
         # Check that folder creation message was logged
         assert_that(
@@ -259,14 +257,13 @@ class TestComposerFilePolicies:
         # User confirms overwrite
         mock_confirm.return_value = True
 
-        with patch("builtins.open", mock_open()) as mock_file:
+        with patch.object(Path, "write_bytes", autospec=True) as mock_write_bytes:
             composer._save_file(output_path, "new content")
 
         mock_confirm.assert_called_once_with(
             "File '{}' already exists. Do you want to overwrite it?".format(output_path)
         )
-        mock_file.assert_called_once_with(output_path, "w")
-        mock_file().write.assert_called_once_with("new content")
+        mock_write_bytes.assert_called_once_with(output_path, b"new content")
 
     @patch("typer.confirm")
     def test_ask_policy_when_user_declines_overwrite(
@@ -231,6 +231,24 @@ class TestResolvedFolderResolveFormats:
         assert_that(content_data["name"]).is_equal_to(template_variables.project_name)
         assert_that(content_data["version"]).is_equal_to("1.0.0")
 
+    def test_resolve_with_uppercase_extension(
+        self,
+        json_source_files: Dict[str, Path],
+        template_variables: FileTemplateVariables,
+    ):
+        """Test ResolvedFolder resolve method with an uppercase extension."""
+        sources = [str(json_source_files["source1"])]
+        destination = "/path/to/destination.JSON"
+
+        resolved_folder = ResolvedFolder(sources=sources, destination=destination)
+        result = resolved_folder.resolve(template_variables)
+
+        assert_that(result).is_instance_of(ResolvedFile)
+        assert_that(result.path).is_equal_to(destination)
+
+        content_data = json.loads(result.content)
+        assert_that(content_data["version"]).is_equal_to("1.0.0")
+
 
 class TestResolvedFolderResolveScenarios:
     """Test ResolvedFolder resolve method with different scenarios."""
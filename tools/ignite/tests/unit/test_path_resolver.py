@@ -8,11 +8,20 @@ from ignite.models.fs import ReservedFileName
 from ignite.resolvers import PathResolver
 
 
-@pytest.fixture()
+@pytest.fixture(scope="module")
 def repository_context():
     return Path("files")
 
 
+@pytest.fixture(scope="module")
+def shared_resolver(repository_context, tmp_path_factory):
+    """Resolver shared by tests that do not mutate the user context."""
+    user_context = tmp_path_factory.mktemp("user-context")
+    return PathResolver(
+        repository_context=repository_context, user_context=user_context
+    )
+
+
 class TestPathResolver:
     """Test cases for PathResolver class."""
 
@@ -26,16 +35,12 @@ class TestPathResolver:
         assert_that(resolver._PathResolver__user_context).is_equal_to(user_context)
 
     def test_resolve_simple_file_in_repository(
-        self, repository_context, user_context, tmp_path
+        self, repository_context, shared_resolver
     ):
         """Test resolving a simple file that exists in repository context."""
-        resolver = PathResolver(
-            repository_context=repository_context, user_context=user_context
-        )
-
         path = Path("vscode") / "settings" / "python" / "base"
         paths = [path]
-        result = resolver.resolve(paths)
+        result = shared_resolver.resolve(paths)
 
         assert_that(result).is_length(1)
         assert_that(result[0]).is_equal_to(
@@ -60,63 +65,45 @@ class TestPathResolver:
         assert_that(result).is_length(1)
         assert_that(result[0]).is_equal_to(user_file)
 
-    def test_resolve_file_not_found(self, repository_context, user_context):
+    def test_resolve_file_not_found(self, shared_resolver):
         """Test resolving a file that doesn't exist in either context."""
-        resolver = PathResolver(
-            repository_context=repository_context, user_context=user_context
-        )
-
         paths = [Path("nonexistent.txt")]
 
         with pytest.raises(
             FileNotFoundError,
             match="Can't find nonexistent.txt in repository or user context.",
         ):
-            resolver.resolve(paths)
+            shared_resolver.resolve(paths)
 
-    def test_resolve_all_file_in_repository(
-        self, repository_context, user_context, tmp_path
-    ):
+    def test_resolve_all_file_in_repository(self, shared_resolver):
         """Test resolving $all file in repository context."""
-        resolver = PathResolver(
-            repository_context=repository_context, user_context=user_context
-        )
-
         path = Path("vscode") / "settings" / "python" / ReservedFileName.ALL
 
         paths = [path]
-        result = resolver.resolve(paths)
+        result = shared_resolver.resolve(paths)
 
         assert_that(result).is_not_empty()
 
-    def test_resolve_with_ref_paths(self, repository_context, user_context):
+    def test_resolve_with_ref_paths(self, repository_context, shared_resolver):
         """Test resolving paths with reference paths."""
-        resolver = PathResolver(
-            repository_context=repository_context, user_context=user_context
-        )
-
         path = Path("vscode") / "settings" / "python" / ReservedFileName.REF.value
         ref_paths = [Path("vscode") / "settings" / "python" / "base"]
         paths = [path]
 
-        result = resolver.resolve(paths, ref_paths)
+        result = shared_resolver.resolve(paths, ref_paths)
 
         assert_that(result).is_length(1)
         assert_that(result[0]).is_equal_to(
             repository_context / "vscode" / "settings" / "python" / "base.json"
         )
 
-    def test_resolve_with_ref_paths_no_match(self, repository_context, user_context):
+    def test_resolve_with_ref_paths_no_match(self, shared_resolver):
         """Test resolving with ref paths that don't match."""
-        resolver = PathResolver(
-            repository_context=repository_context, user_context=user_context
-        )
-
         path = Path("vscode") / "settings" / "python" / ReservedFileName.REF.value
         ref_paths = [Path("vscode") / "settings" / "nothing"]
         paths = [path]
 
-        result = resolver.resolve(paths, ref_paths)
+        result = shared_resolver.resolve(paths, ref_paths)
 
         assert_that(result).is_empty()
 
@@ -139,84 +126,133 @@ class TestPathResolver:
         )
         assert_that(result[1]).is_equal_to(user_context / "user.txt")
 
-    def test_resolve_path_method_found(self, repository_context, user_context):
+    def test_resolve_path_method_found(self, repository_context, shared_resolver):
         """Test _resolve_path method when file is found."""
-        resolver = PathResolver(
-            repository_context=repository_context, user_context=user_context
-        )
-
         test_dir = repository_context / "vscode" / "settings" / "python"
 
-        result = resolver._resolve_path(test_dir, "base")
+        result = shared_resolver._resolve_path(test_dir, "base")
 
         assert_that(result).is_equal_to(test_dir / "base.json")
 
-    def test_resolve_path_method_not_found(self, repository_context, user_context):
+    def test_resolve_path_method_not_found(self, repository_context, shared_resolver):
         """Test _resolve_path method when file is not found."""
-        resolver = PathResolver(
-            repository_context=repository_context, user_context=user_context
-        )
-
         test_dir = repository_context / "vscode" / "settings" / "python"
 
-        result = resolver._resolve_path(test_dir, "not_exist")
+        result = shared_resolver._resolve_path(test_dir, "not_exist")
 
         assert_that(result).is_none()
 
-    def test_resolve_all_file_method(self, repository_context, user_context):
-        """Test _resolve_all_file method."""
+    def test_resolve_path_method_cached(self, repository_context, shared_resolver):
+        """Test _resolve_path method reuses previously resolved files."""
+        test_dir = repository_context / "vscode" / "settings" / "python"
+
+        first = shared_resolver._resolve_path(test_dir, "base")
+        with patch("ignite.resolvers.os.scandir") as scandir:
+            second = shared_resolver._resolve_path(test_dir, "base")
+
+        scandir.assert_not_called()
+        assert_that(second).is_equal_to(first)
+
+    def test_resolve_path_method_cached_miss(self, repository_context, user_context):
+        """Test _resolve_path method remembers missing files until invalidated."""
         resolver = PathResolver(
             repository_context=repository_context, user_context=user_context
         )
 
+        assert_that(resolver._resolve_path(user_context, "late")).is_none()
+
+        (user_context / "late.txt").write_text("late content")
+
+        assert_that(resolver._resolve_path(user_context, "late")).is_none()
+
+        resolver.invalidate()
+
+        assert_that(resolver._resolve_path(user_context, "late")).is_equal_to(
+            user_context / "late.txt"
+        )
+
+    def test_resolve_all_file_method(self, repository_context, shared_resolver):
+        """Test _resolve_all_file method."""
         test_dir = repository_context / "vscode" / "settings" / "python"
 
-        result = resolver._resolve_all_file(test_dir)
+        result = shared_resolver._resolve_all_file(test_dir)
 
         assert_that(result).is_not_empty()
 
-    def test_resolve_ref_method(self, repository_context, user_context):
-        """Test _resolve_ref method."""
-        resolver = PathResolver(
-            repository_context=repository_context, user_context=user_context
-        )
+    def test_resolve_all_file_method_reuses_listing(
+        self, repository_context, shared_resolver
+    ):
+        """Test _resolve_all_file method shares the directory listing."""
+        test_dir = repository_context / "vscode" / "settings" / "python"
 
+        shared_resolver._resolve_path(test_dir, "base")
+        with patch("ignite.resolvers.os.scandir") as scandir:
+            result = shared_resolver._resolve_all_file(test_dir)
+
+        scandir.assert_not_called()
+        assert_that(result).contains(test_dir / "base.json")
+
+    def test_resolve_ref_method(self, shared_resolver):
+        """Test _resolve_ref method."""
         ref_paths = [Path("base")]
         paths = [Path(ReservedFileName.REF)]
 
-        resolver._resolve_ref(ref_paths, paths)
+        shared_resolver._resolve_ref(ref_paths, paths)
 
         # The $ref should be replaced with matching ref_paths
         assert_that(paths).is_length(1)
         assert_that(paths[0]).is_equal_to(Path("base"))
 
-    def test_resolve_ref_file_method(self, repository_context, user_context):
+    def test_resolve_ref_file_method(self, shared_resolver):
         """Test _resolve_ref_file method."""
-        resolver = PathResolver(
-            repository_context=repository_context, user_context=user_context
-        )
-
         ref_paths = [Path("base")]
         ref_file = Path(ReservedFileName.REF)
 
-        result = resolver._resolve_ref_file(ref_paths, ref_file)
+        result = shared_resolver._resolve_ref_file(
+            shared_resolver._index_ref_paths(ref_paths), ref_file
+        )
 
         assert_that(result).is_length(1)
         assert_that(result[0]).is_equal_to(Path("base"))
 
-    def test_resolve_ref_file_method_no_matches(self, repository_context, user_context):
+    def test_resolve_ref_file_method_no_matches(self, shared_resolver):
         """Test _resolve_ref_file method with no matching paths."""
-        resolver = PathResolver(
-            repository_context=repository_context, user_context=user_context
-        )
-
         ref_paths = [Path("vscode") / "settings" / "python" / "base"]
         ref_file = Path("vscode") / "tasks" / "base"
 
-        result = resolver._resolve_ref_file(ref_paths, ref_file)
+        result = shared_resolver._resolve_ref_file(
+            shared_resolver._index_ref_paths(ref_paths), ref_file
+        )
 
         assert_that(result).is_empty()
 
+    def test_resolve_ref_file_method_keeps_order(self, shared_resolver):
+        """Test _resolve_ref_file method keeps matching paths in order."""
+        ref_paths = [
+            Path("vscode") / "settings" / "python" / "base",
+            Path("vscode") / "tasks" / "build",
+            Path("vscode") / "settings" / "python" / "black",
+        ]
+        ref_file = Path("vscode") / "settings" / "python" / ReservedFileName.REF
+
+        result = shared_resolver._resolve_ref_file(
+            shared_resolver._index_ref_paths(ref_paths), ref_file
+        )
+
+        assert_that(result).is_equal_to([ref_paths[0], ref_paths[2]])
+
+    def test_resolve_ref_method_sees_mutated_ref_paths(self, shared_resolver):
+        """Test _resolve_ref method indexes the ref_paths it is given on every call."""
+        ref_paths = [Path("vscode") / "settings" / "python" / "base"]
+        ref_file = Path("vscode") / "settings" / "python" / ReservedFileName.REF
+
+        shared_resolver._resolve_ref(ref_paths, [ref_file])
+        ref_paths.append(Path("vscode") / "settings" / "python" / "black")
+        paths = [ref_file]
+        shared_resolver._resolve_ref(ref_paths, paths)
+
+        assert_that(paths).is_equal_to(ref_paths)
+
     def test_resolve_with_mixed_file_types(self, repository_context, user_context):
         """Test resolving mixed file types (repository, user, $all, $ref)."""
         resolver = PathResolver(
@@ -251,24 +287,16 @@ class TestPathResolver:
             repository_context / "vscode" / "settings" / "python" / "base.json"
         )
 
-    def test_resolve_empty_paths_list(self, repository_context, user_context):
+    def test_resolve_empty_paths_list(self, shared_resolver):
         """Test resolving an empty list of paths."""
-        resolver = PathResolver(
-            repository_context=repository_context, user_context=user_context
-        )
-
-        result = resolver.resolve([])
+        result = shared_resolver.resolve([])
 
         assert_that(result).is_empty()
 
-    def test_resolve_none_ref_paths(self, repository_context, user_context):
+    def test_resolve_none_ref_paths(self, shared_resolver):
         """Test resolving with None ref_paths."""
-        resolver = PathResolver(
-            repository_context=repository_context, user_context=user_context
-        )
-
         paths = [Path("test.txt")]
 
         # Should not raise an error
         with pytest.raises(FileNotFoundError):
-            resolver.resolve(paths, None)
+            shared_resolver.resolve(paths, None)
@@ -1,3 +1,5 @@
+from collections import OrderedDict
+
 import pytest
 from assertpy import assert_that
 
@@ -234,3 +236,13 @@ def test_function_returns_none():
     result = merge_dicts(a, b)
 
     assert_that(result).is_none()
+
+
+def test_dict_subclass_overwrites_dict():
+    """Test that dict subclasses are assigned rather than merged."""
+    a = {"x": {"a": 1}}
+    b = {"x": OrderedDict(b=2)}
+
+    merge_dicts(a, b)
+
+    assert_that(a["x"]).is_same_as(b["x"])
@@ -1,8 +1,13 @@
+import asyncio
+import os
 from enum import Enum
+from functools import partial
+from typing import TYPE_CHECKING, Any, Coroutine, Dict, Optional
 import typer
-from mutex.database.models import DatabaseConfig, LockAcquisitionRequest, LockReleaseRequest
-from mutex.database.postgresql import PostgreSQLDatabase
-from mutex.service import MutexService
+from mutex import DAEMON_SOCKET_ENV
+
+if TYPE_CHECKING:
+    from mutex.service import MutexService
 
 class DatabaseType(str, Enum):
     POSTGRE = "postgres"
@@ -24,24 +29,60 @@ app = typer.Typer(
     add_completion=False
 )
 
+daemon_app = typer.Typer(
+    name="daemon",
+    help="Run a local daemon batching lock requests.",
+    no_args_is_help=True
+)
+app.add_typer(daemon_app)
+
+# Options shared by several commands, built once at import
+_KEY_OPTION = typer.Option(..., help="The key of the lock.")
+_HOLDER_OPTION = typer.Option(..., help="The holder of the lock.")
+_TIMEOUT_OPTION = typer.Option(60, help="The timeout in seconds.")
+
 def __get_service(
     database_type: str,
     database_connection_uri: str, 
     database_pool_size: int, 
     database_max_overflow: int, 
-    database_pool_timeout: int
-) -> MutexService:
+    database_pool_timeout: int,
+    database_min_size: Optional[int],
+    database_max_queries: int,
+    database_max_inactive_connection_lifetime: float
+) -> "MutexService":
+    # Backend imports pull in asyncpg and pydantic, keep them off the --help path
+    from mutex.database.models import DatabaseConfig
+    from mutex.database.postgresql import PostgreSQLDatabase
+    from mutex.service import MutexService
+
     database_config = DatabaseConfig(
         connection_uri=database_connection_uri,
         pool_size=database_pool_size,
         max_overflow=database_max_overflow,
-        pool_timeout=database_pool_timeout
+        pool_timeout=database_pool_timeout,
+        min_size=database_min_size,
+        max_queries=database_max_queries,
+        max_inactive_connection_lifetime=database_max_inactive_connection_lifetime
     )
     
     database = PostgreSQLDatabase(database_config)
     service = MutexService(database)
     return service
 
+async def __send_to_daemon(payload: Dict[str, Any]) -> Optional[bool]:
+    # Route through a running daemon when one is advertised, None means fall back
+    from mutex.daemon import send_request
+
+    socket_path = os.environ.get(DAEMON_SOCKET_ENV)
+    if not socket_path:
+        return None
+    return await send_request(socket_path, payload)
+
+def __run(coroutine: Coroutine[Any, Any, None]) -> None:
+    # Typer calls commands synchronously, drive the coroutine to completion here
+    asyncio.run(coroutine)
+
 @app.callback()
 def callback(
     ctx: typer.Context,
@@ -49,14 +90,22 @@ def callback(
     database_connection_uri: str = typer.Option(..., envvar="DATABASE_URI", help="The connection URI of the database."),
     database_pool_size: int = typer.Option(10, envvar="DATABASE_POOL_SIZE", help="The pool size of the database."),
     database_max_overflow: int = typer.Option(20, envvar="DATABASE_MAX_OVERFLOW", help="The maximum overflow of the database."),
-    database_pool_timeout: int = typer.Option(30, envvar="DATABASE_POOL_TIMEOUT", help="The pool timeout of the database.")
+    database_pool_timeout: int = typer.Option(30, envvar="DATABASE_POOL_TIMEOUT", help="The pool timeout of the database."),
+    database_min_size: Optional[int] = typer.Option(None, envvar="MUTEX_DB_MIN_SIZE", help="The connections kept open in the pool, defaults to a quarter of the pool size."),
+    database_max_queries: int = typer.Option(50000, envvar="MUTEX_DB_MAX_QUERIES", help="The queries served by a connection before it is replaced."),
+    database_max_inactive_connection_lifetime: float = typer.Option(300.0, envvar="MUTEX_DB_MAX_INACTIVE_CONNECTION_LIFETIME", help="The seconds an idle connection is kept open.")
 ):
-    ctx.obj = __get_service(
+    # Build the service lazily so subcommand --help never loads the backend
+    ctx.obj = partial(
+        __get_service,
         database_type, 
         database_connection_uri, 
         database_pool_size, 
         database_max_overflow, 
-        database_pool_timeout
+        database_pool_timeout,
+        database_min_size,
+        database_max_queries,
+        database_max_inactive_connection_lifetime
     )
 
 @app.command(
@@ -64,25 +113,41 @@ def callback(
     help="Acquire a lock.", 
     no_args_is_help=True
 )
-async def acquire(
+def acquire(
     ctx: typer.Context,
-    key: str = typer.Option(..., help="The key of the lock."),
-    holder: str = typer.Option(..., help="The holder of the lock."),
-    timeout: int = typer.Option(60, help="The timeout in seconds.")
+    key: str = _KEY_OPTION,
+    holder: str = _HOLDER_OPTION,
+    timeout: int = _TIMEOUT_OPTION
 ):
+    __run(__acquire(ctx, key, holder, timeout))
+
+
+async def __acquire(ctx: typer.Context, key: str, holder: str, timeout: int) -> None:
+    from mutex.database.models import LockAcquisitionRequest
+
     request = LockAcquisitionRequest(key, holder, timeout)
-    service = ctx.obj
+
+    service = None
 
     try:
-        await service.initialize()
-        success = await service.acquire(request)
-        if success:
-            typer.Exit(0)
-        else:
-            typer.Exit(1)
+        success = await __send_to_daemon({
+            "operation": "acquire",
+            "key": key,
+            "holder": holder,
+            "timeout": timeout
+        })
+        if success is None:
+            service = ctx.obj()
+            await service.initialize()
+            success = await service.acquire(request)
     except Exception as e:
         typer.echo(f"❌ Error acquiring lock: {e}", err=True)
         raise typer.Exit(2)
+    finally:
+        if service is not None:
+            await service.shutdown()
+
+    raise typer.Exit(code=0 if success else 1)
 
 
 @app.command(
@@ -90,24 +155,39 @@ async def acquire(
     help="Release a lock.", 
     no_args_is_help=True
 )
-async def release(
+def release(
     ctx: typer.Context,
-    key: str = typer.Option(..., help="The key of the lock."),
-    holder: str = typer.Option(..., help="The holder of the lock.")
+    key: str = _KEY_OPTION,
+    holder: str = _HOLDER_OPTION
 ):
+    __run(__release(ctx, key, holder))
+
+
+async def __release(ctx: typer.Context, key: str, holder: str) -> None:
+    from mutex.database.models import LockReleaseRequest
+
     request = LockReleaseRequest(key, holder)
-    service = ctx.obj
+
+    service = None
 
     try:
-        await service.initialize()
-        success = await service.release(request)
-        if success:
-            typer.Exit(0)
-        else:
-            typer.Exit(1)
+        success = await __send_to_daemon({
+            "operation": "release",
+            "key": key,
+            "holder": holder
+        })
+        if success is None:
+            service = ctx.obj()
+            await service.initialize()
+            success = await service.release(request)
     except Exception as e:
         typer.echo(f"❌ Error releasing lock: {e}", err=True)
         raise typer.Exit(2)
+    finally:
+        if service is not None:
+            await service.shutdown()
+
+    raise typer.Exit(code=0 if success else 1)
 
 
 @app.command(
@@ -115,19 +195,48 @@ async def release(
     help="Cleanup locks.", 
     no_args_is_help=True
 )
-async def cleanup(
+def cleanup(
     ctx: typer.Context,
     holder_pattern: str = typer.Option(..., help="The holder pattern of the locks to cleanup.")
 ):
-    service = ctx.obj
+    __run(__cleanup(ctx, holder_pattern))
+
+
+async def __cleanup(ctx: typer.Context, holder_pattern: str) -> None:
+    service = ctx.obj()
 
     try:
         await service.initialize()
         success = await service.cleanup(holder_pattern)
-        if success:
-            typer.Exit(0)
-        else:
-            typer.Exit(1)
     except Exception as e:
         typer.echo(f"❌ Error cleaning up locks: {e}", err=True)
-        raise typer.Exit(2)
\ No newline at end of file
+        raise typer.Exit(2)
+    finally:
+        await service.shutdown()
+
+    raise typer.Exit(code=0 if success else 1)
+
+
+@daemon_app.command(
+    name="start",
+    help="Start the daemon and serve lock requests on a unix socket.",
+    no_args_is_help=True
+)
+def daemon_start(
+    ctx: typer.Context,
+    socket_path: str = typer.Option(..., "--socket", envvar=DAEMON_SOCKET_ENV, help="The unix socket path to listen on."),
+    batch_window_ms: int = typer.Option(10, help="The window in milliseconds used to batch acquisitions.")
+):
+    __run(__daemon_start(ctx, socket_path, batch_window_ms))
+
+
+async def __daemon_start(ctx: typer.Context, socket_path: str, batch_window_ms: int) -> None:
+    from mutex.daemon import MutexDaemon
+
+    daemon = MutexDaemon(ctx.obj(), socket_path, batch_window_ms)
+
+    try:
+        await daemon.serve()
+    except Exception as e:
+        typer.echo(f"❌ Error running daemon: {e}", err=True)
+        raise typer.Exit(2)
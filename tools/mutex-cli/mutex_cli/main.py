@@ -1,7 +1,20 @@
+import sys
 from mutex_cli import app
 
+VERSION_FLAGS = ("--version", "-V")
+
+
+def __print_version() -> None:
+    from importlib.metadata import version
+
+    print(version("mutex-cli"))
+
 
 def main():
+    # Answer version queries before Typer parses the required database options
+    if len(sys.argv) > 1 and sys.argv[1] in VERSION_FLAGS:
+        __print_version()
+        sys.exit(0)
     app()
 
 if __name__ == "__main__":
@@ -0,0 +1 @@
+DAEMON_SOCKET_ENV = "MUTEX_DAEMON_SOCK"
@@ -0,0 +1,240 @@
+import asyncio
+import json
+import logging
+import os
+import time
+from dataclasses import dataclass, field
+from typing import Any, Dict, List, Optional
+from mutex.database.base import DatabaseError
+from mutex.database.models import LockAcquisitionRequest, LockReleaseRequest
+from mutex.service import MutexService
+
+logger = logging.getLogger(__name__)
+
+
+@dataclass
+class _PendingAcquire:
+    """Acquire request waiting for the next batch window"""
+    key: str
+    holder: str
+    deadline: float
+    future: asyncio.Future
+    attempt: int = field(default=0)
+
+
+class MutexDaemon:
+    """Local daemon coalescing lock acquisitions into batched inserts"""
+
+    def __init__(self, service: MutexService, socket_path: str, batch_window_ms: int = 10):
+        self._service = service
+        self._socket_path = socket_path
+        self._batch_window = batch_window_ms / 1000
+        self._queue: asyncio.Queue = asyncio.Queue()
+
+    async def serve(self) -> None:
+        """Serve requests on the unix socket until cancelled"""
+        await self._service.initialize()
+
+        # A socket left behind by a crashed daemon would make bind fail
+        if os.path.exists(self._socket_path):
+            os.unlink(self._socket_path)
+
+        server = await asyncio.start_unix_server(self._handle_client, path=self._socket_path)
+        batcher = asyncio.create_task(self._batch_loop())
+        logger.info("🚀 Mutex daemon listening on '%s'", self._socket_path)
+
+        try:
+            async with server:
+                await server.serve_forever()
+        finally:
+            # Let an in-flight batch finish unwinding before the pool goes away
+            batcher.cancel()
+            try:
+                await batcher
+            except asyncio.CancelledError:
+                pass
+            if os.path.exists(self._socket_path):
+                os.unlink(self._socket_path)
+            await self._service.shutdown()
+            logger.info("Mutex daemon stopped")
+
+    async def _handle_client(self, reader: asyncio.StreamReader, writer: asyncio.StreamWriter) -> None:
+        """Answer a single newline-delimited JSON request"""
+        try:
+            await self._answer(reader, writer)
+        finally:
+            writer.close()
+
+    async def _answer(self, reader: asyncio.StreamReader, writer: asyncio.StreamWriter) -> None:
+        """Read the request, dispatch it while the client is connected and write the response"""
+        payload = None
+        try:
+            line = await reader.readline()
+            if not line:
+                return
+            payload = json.loads(line)
+            response = await self._dispatch_while_connected(payload, reader)
+            if response is None:
+                return
+        except (ValueError, KeyError, TypeError) as e:
+            response = {"success": False, "error": str(e)}
+        except DatabaseError as e:
+            logger.error("❌ Database error in daemon: %s", e)
+            response = {"success": False, "error": str(e)}
+        except Exception as e:
+            # Any other failure still gets an answer, the client would otherwise block on readline
+            logger.exception("❌ Unexpected error in daemon")
+            response = {"success": False, "error": f"Internal daemon error: {e}"}
+
+        try:
+            writer.write(json.dumps(response).encode() + b"\n")
+            await writer.drain()
+        except ConnectionError:
+            logger.warning("⚠️ Client disconnected before its response was written")
+            # Nobody will release a lock granted to a client that never learnt about it
+            if response.get("success") and payload.get("operation") == "acquire":
+                await self._release_orphan(payload["key"], payload["holder"])
+
+    @staticmethod
+    async def _until_disconnected(reader: asyncio.StreamReader) -> None:
+        """Return once the client hangs up, it sends nothing after its request line"""
+        while await reader.read(1024):
+            pass
+
+    async def _dispatch_while_connected(
+        self, payload: Dict[str, Any], reader: asyncio.StreamReader
+    ) -> Optional[Dict[str, Any]]:
+        """Dispatch a request, cancelling it when the client hangs up, None in that case"""
+        dispatch = asyncio.ensure_future(self._dispatch(payload))
+        disconnected = asyncio.ensure_future(self._until_disconnected(reader))
+        try:
+            await asyncio.wait({dispatch, disconnected}, return_when=asyncio.FIRST_COMPLETED)
+        except asyncio.CancelledError:
+            dispatch.cancel()
+            raise
+        finally:
+            disconnected.cancel()
+        if not dispatch.done():
+            # Cancels the waiter future, the batcher then releases a lock acquired meanwhile
+            dispatch.cancel()
+            logger.warning("⚠️ Client disconnected before its request was answered")
+            return None
+        return dispatch.result()
+
+    async def _dispatch(self, payload: Dict[str, Any]) -> Dict[str, Any]:
+        """Route a decoded request to the matching operation"""
+        operation = payload["operation"]
+
+        if operation == "acquire":
+            request = LockAcquisitionRequest(payload["key"], payload["holder"], payload.get("timeout", 60))
+            success = await self._enqueue_acquire(request)
+        elif operation == "release":
+            request = LockReleaseRequest(payload["key"], payload["holder"])
+            success = await self._service.release(request)
+        else:
+            raise ValueError(f"Unsupported operation: {operation}")
+
+        return {"success": success}
+
+    async def _enqueue_acquire(self, request: LockAcquisitionRequest) -> bool:
+        """Queue an acquisition and wait for a batch to settle it"""
+        loop = asyncio.get_running_loop()
+        pending = _PendingAcquire(
+            key=request.key,
+            holder=request.holder,
+            deadline=time.monotonic() + request.timeout,
+            future=loop.create_future()
+        )
+        self._queue.put_nowait(pending)
+        return await pending.future
+
+    async def _batch_loop(self) -> None:
+        """Drain the queue every batch window into a single insert"""
+        while True:
+            batch = [await self._queue.get()]
+            await asyncio.sleep(self._batch_window)
+            while not self._queue.empty():
+                batch.append(self._queue.get_nowait())
+            try:
+                await self._settle(batch)
+            except Exception as e:
+                # A failed batch only fails its own waiters, the loop keeps serving the next ones
+                logger.exception("❌ Batched acquisition failed")
+                for pending in batch:
+                    if not pending.future.done():
+                        pending.future.set_exception(e)
+
+    async def _settle(self, batch: List[_PendingAcquire]) -> None:
+        """Insert one row per distinct key and resolve the waiters"""
+        # Requests contending for the same key inside one window go to the next one
+        selected: Dict[str, _PendingAcquire] = {}
+        deferred: List[_PendingAcquire] = []
+        for pending in batch:
+            if pending.future.done():
+                continue
+            if pending.key in selected:
+                deferred.append(pending)
+            else:
+                selected[pending.key] = pending
+
+        try:
+            acquired = await self._service.try_acquire_many(
+                [(pending.key, pending.holder) for pending in selected.values()]
+            )
+        except DatabaseError as e:
+            logger.error("❌ Database error during batched acquisition: %s", e)
+            acquired = set()
+
+        for pending in selected.values():
+            if (pending.key, pending.holder) in acquired:
+                if not pending.future.done():
+                    pending.future.set_result(True)
+                else:
+                    # The client went away while the insert was in flight, give the lock back
+                    await self._release_orphan(pending.key, pending.holder)
+            else:
+                self._retry(pending)
+
+        for pending in deferred:
+            self._retry(pending)
+
+    async def _release_orphan(self, key: str, holder: str) -> None:
+        """Release a row acquired for a waiter that is no longer listening"""
+        try:
+            await self._service.release(LockReleaseRequest(key, holder))
+        except DatabaseError as e:
+            logger.error("❌ Database error releasing orphaned mutex '%s': %s", key, e)
+
+    def _retry(self, pending: _PendingAcquire) -> None:
+        """Requeue a contended request after a backoff, or fail it on timeout"""
+        if pending.future.done():
+            return
+        delay = self._service.retry_delay(pending.attempt)
+        if time.monotonic() + delay > pending.deadline:
+            logger.error("❌ Timeout waiting for mutex '%s' to be released", pending.key)
+            pending.future.set_result(False)
+            return
+        pending.attempt += 1
+        asyncio.get_running_loop().call_later(delay, self._queue.put_nowait, pending)
+
+
+async def send_request(socket_path: str, payload: Dict[str, Any]) -> Optional[bool]:
+    """Send a request to a running daemon, None when no daemon is reachable"""
+    try:
+        reader, writer = await asyncio.open_unix_connection(socket_path)
+    except OSError:
+        return None
+
+    try:
+        writer.write(json.dumps(payload).encode() + b"\n")
+        await writer.drain()
+        line = await reader.readline()
+    finally:
+        writer.close()
+
+    if not line:
+        raise RuntimeError("Mutex daemon closed the connection without answering")
+    response = json.loads(line)
+    if "error" in response:
+        raise RuntimeError(response["error"])
+    return response["success"]
@@ -1,12 +1,8 @@
-from typing import List, Union, Optional, Any, Dict
+from typing import Callable, List, Union, Optional, Any, Dict
 from abc import ABC, abstractmethod
-from contextlib import asynccontextmanager
 from mutex.database.record import Record, LockRecord
 from mutex.database.statement import Statement, StatementBuilder
 from mutex.database.models import DatabaseConfig
-import logging
-
-logger = logging.getLogger(__name__)
 
 
 class DatabaseError(Exception):
@@ -47,33 +43,9 @@ class Database(ABC):
         """Close database connection"""
         pass
     
-    @asynccontextmanager
-    async def transaction(self):
-        """Context manager for database transactions"""
-        if not self.is_connected:
-            raise ConnectionError("Database not connected")
-        
-        try:
-            await self._begin_transaction()
-            yield self
-            await self._commit_transaction()
-        except Exception as e:
-            await self._rollback_transaction()
-            raise QueryError(f"Transaction failed: {e}") from e
-    
-    @abstractmethod
-    async def _begin_transaction(self) -> None:
-        """Begin a new transaction"""
-        pass
-    
-    @abstractmethod
-    async def _commit_transaction(self) -> None:
-        """Commit the current transaction"""
-        pass
-    
     @abstractmethod
-    async def _rollback_transaction(self) -> None:
-        """Rollback the current transaction"""
+    def transaction(self):
+        """Context manager running a block in one transaction on one connection"""
         pass
 
     @abstractmethod
@@ -119,4 +91,14 @@ class Database(ABC):
     @abstractmethod
     async def delete_one(self, statement: Statement) -> bool:
         """Delete a single record"""
-        pass
\ No newline at end of file
+        pass
+    
+    @abstractmethod
+    async def listen(self, channel: str, callback: Callable[[str], None]) -> None:
+        """Call back with the payload of every notification sent on a channel"""
+        pass
+    
+    @abstractmethod
+    async def notify(self, channel: str, payload: str) -> None:
+        """Send a notification on a channel"""
+        pass
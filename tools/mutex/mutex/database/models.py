@@ -1,44 +1,58 @@
-from datetime import datetime
-from typing import Optional
-from pydantic import BaseModel, Field, field_validator, validator
+from dataclasses import dataclass
+from datetime import datetime, timezone
+from typing import Annotated, Optional
+from pydantic import BaseModel, Field, StringConstraints, field_validator, model_validator
+
+
+def utc_now() -> datetime:
+    """Current time as a timezone-aware UTC datetime"""
+    return datetime.now(timezone.utc)
+
+
+def _validate_lock_value(name: str, value: str) -> str:
+    """Strip a lock key/holder and check it is neither empty nor too long"""
+    if not value or not value.strip():
+        raise ValueError(f'{name} cannot be empty or whitespace only')
+    value = value.strip()
+    if len(value) > 255:
+        raise ValueError(f'{name} must be at most 255 characters')
+    return value
+
+
+# Stripped and length-checked by pydantic-core, no Python validator per field
+LockValue = Annotated[str, StringConstraints(strip_whitespace=True, min_length=1, max_length=255)]
 
 
 class LockModel(BaseModel):
     """Model for lock records in the database"""
-    key: str = Field(..., min_length=1, max_length=255, description="Lock key")
-    holder: str = Field(..., min_length=1, max_length=255, description="Lock holder identifier")
-    created_at: datetime = Field(default_factory=datetime.utcnow, description="Lock creation timestamp")
-    
-    @field_validator('key', 'holder')
-    def validate_not_empty(cls, v):
-        if not v or not v.strip():
-            raise ValueError('Value cannot be empty or whitespace only')
-        return v.strip()
+    key: LockValue = Field(..., description="Lock key")
+    holder: LockValue = Field(..., description="Lock holder identifier")
+    created_at: datetime = Field(default_factory=utc_now, description="Lock creation timestamp")
 
 
-class LockAcquisitionRequest(BaseModel):
+@dataclass(slots=True, frozen=True)
+class LockAcquisitionRequest:
     """Model for lock acquisition requests"""
-    key: str = Field(..., min_length=1, max_length=255)
-    holder: str = Field(..., min_length=1, max_length=255)
-    timeout: Optional[int] = Field(default=60, ge=1, le=3600, description="Timeout in seconds")
-    
-    @field_validator('key', 'holder')
-    def validate_not_empty(cls, v):
-        if not v or not v.strip():
-            raise ValueError('Value cannot be empty or whitespace only')
-        return v.strip()
+    key: str
+    holder: str
+    timeout: Optional[int] = 60  # seconds
+
+    def __post_init__(self):
+        object.__setattr__(self, 'key', _validate_lock_value('key', self.key))
+        object.__setattr__(self, 'holder', _validate_lock_value('holder', self.holder))
+        if self.timeout is not None and not 1 <= self.timeout <= 3600:
+            raise ValueError('timeout must be between 1 and 3600 seconds')
 
 
-class LockReleaseRequest(BaseModel):
+@dataclass(slots=True, frozen=True)
+class LockReleaseRequest:
     """Model for lock release requests"""
-    key: str = Field(..., min_length=1, max_length=255)
-    holder: str = Field(..., min_length=1, max_length=255)
-    
-    @field_validator('key', 'holder')
-    def validate_not_empty(cls, v):
-        if not v or not v.strip():
-            raise ValueError('Value cannot be empty or whitespace only')
-        return v.strip()
+    key: str
+    holder: str
+
+    def __post_init__(self):
+        object.__setattr__(self, 'key', _validate_lock_value('key', self.key))
+        object.__setattr__(self, 'holder', _validate_lock_value('holder', self.holder))
 
 
 class DatabaseConfig(BaseModel):
@@ -47,9 +61,20 @@ class DatabaseConfig(BaseModel):
     pool_size: int = Field(default=10, ge=1, le=100, description="Connection pool size")
     max_overflow: int = Field(default=20, ge=0, le=100, description="Maximum overflow connections")
     pool_timeout: int = Field(default=30, ge=1, le=300, description="Pool timeout in seconds")
+    min_size: Optional[int] = Field(default=None, ge=1, le=100, description="Connections kept open in the pool, defaults to a quarter of the pool size")
+    max_queries: int = Field(default=50000, ge=1, description="Queries served by a connection before it is replaced")
+    max_inactive_connection_lifetime: float = Field(default=300.0, ge=0, description="Seconds an idle connection is kept open, 0 keeps it forever")
     
     @field_validator('connection_uri')
     def validate_connection_uri(cls, v):
         if not v or not v.strip():
             raise ValueError('Connection URI cannot be empty')
-        return v.strip() 
\ No newline at end of file
+        return v.strip()
+    
+    @model_validator(mode='after')
+    def validate_min_size(self):
+        if self.min_size is None:
+            self.min_size = max(1, self.pool_size // 4)
+        elif self.min_size > self.pool_size:
+            raise ValueError('min_size cannot be greater than pool_size')
+        return self
@@ -1,6 +1,9 @@
-from typing import List, Optional, Union
+from typing import Callable, List, Optional, Union
+from contextlib import asynccontextmanager
+from functools import lru_cache
 import asyncpg
 import logging
+import sys
 from mutex.database.base import Database, DatabaseError, ConnectionError, QueryError
 from mutex.database.record import Record, LockRecord
 from mutex.database.statement import Statement
@@ -9,22 +12,33 @@ from mutex.database.models import DatabaseConfig
 logger = logging.getLogger(__name__)
 
 
+@lru_cache(maxsize=256)
+def _returning(query: str) -> str:
+    """Query returning one row per affected row, counted without parsing the command status"""
+    if " RETURNING " in query:
+        return query
+    # Interned like the statement query, the prepared statement cache keys on the text
+    return sys.intern(f"{query} RETURNING 1")
+
+
 class PostgreSQLDatabase(Database):
     """PostgreSQL database implementation with connection pooling"""
     
     def __init__(self, config: DatabaseConfig):
         super().__init__(config)
         self._pool = None
+        # Dedicated connection kept out of the pool, LISTEN is bound to its session
+        self._listener = None
     
     async def connect(self) -> None:
         """Establish database connection pool"""
         try:
             self._pool = await asyncpg.create_pool(
                 self.config.connection_uri,
-                min_size=1,
+                min_size=self.config.min_size,
                 max_size=self.config.pool_size,
-                max_queries=50000,
-                max_inactive_connection_lifetime=300.0,
+                max_queries=self.config.max_queries,
+                max_inactive_connection_lifetime=self.config.max_inactive_connection_lifetime,
                 command_timeout=self.config.pool_timeout
             )
             self._is_connected = True
@@ -35,131 +49,145 @@ class PostgreSQLDatabase(Database):
     
     async def disconnect(self) -> None:
         """Close database connection pool"""
+        if self._listener:
+            await self._listener.close()
+            self._listener = None
         if self._pool:
             await self._pool.close()
             self._pool = None
             self._is_connected = False
             logger.info("PostgreSQL connection pool closed")
     
-    async def _get_connection(self):
-        """Get a connection from the pool"""
+    @property
+    def is_connected(self) -> bool:
+        """Check if the connection pool is open"""
+        return self._is_connected and self._pool is not None
+    
+    @asynccontextmanager
+    async def _acquire(self):
+        """Borrow a pooled connection for the duration of the block"""
         if not self.is_connected:
             raise ConnectionError("Database not connected")
-        return await self._pool.acquire()
-    
-    async def _release_connection(self, conn):
-        """Release a connection back to the pool"""
-        await self._pool.release(conn)
-    
-    async def _begin_transaction(self) -> None:
-        """Begin a new transaction"""
-        conn = await self._get_connection()
-        await conn.execute("BEGIN")
-    
-    async def _commit_transaction(self) -> None:
-        """Commit the current transaction"""
-        conn = await self._get_connection()
-        await conn.execute("COMMIT")
-    
-    async def _rollback_transaction(self) -> None:
-        """Rollback the current transaction"""
-        conn = await self._get_connection()
-        await conn.execute("ROLLBACK")
+        async with self._pool.acquire() as conn:
+            yield conn
+    
+    @asynccontextmanager
+    async def transaction(self):
+        """Run the block in a single transaction on a single pooled connection"""
+        async with self._acquire() as conn:
+            try:
+                async with conn.transaction():
+                    yield conn
+            except Exception as e:
+                raise QueryError(f"Transaction failed: {e}") from e
 
     async def create_table(self, statement: Statement) -> None:
         """Create a table"""
-        conn = await self._get_connection()
-        try:
-            result = await conn.execute(statement.query, *statement.args)
-            if result == "CREATE TABLE":
-                logger.info(f"Table created: {statement.query}")
-            else:
-                logger.warning(f"Table creation failed: {result}")
-        except Exception as e:
-            raise QueryError(f"Failed to create table: {e}") from e
-        finally:
-            await self._release_connection(conn)
+        async with self._acquire() as conn:
+            try:
+                result = await conn.execute(statement.query, *statement.args)
+            except Exception as e:
+                raise QueryError(f"Failed to create table: {e}") from e
+        if result == "CREATE TABLE":
+            logger.info("Table created: %s", statement.query)
+        else:
+            logger.warning("Table creation failed: %s", result)
     
     async def fetch_many(self, statement: Statement) -> List[Record]:
         """Fetch multiple records"""
-        conn = await self._get_connection()
-        try:
-            records = await conn.fetch(statement.query, *statement.args)
-            return [Record(**dict(record)) for record in records]
-        except Exception as e:
-            raise QueryError(f"Failed to fetch records: {e}") from e
-        finally:
-            await self._release_connection(conn)
+        async with self._acquire() as conn:
+            try:
+                records = await conn.fetch(statement.query, *statement.args)
+            except Exception as e:
+                raise QueryError(f"Failed to fetch records: {e}") from e
+        # Rows come typed from the database, Record only wraps their mapping
+        return [Record(**record) for record in records]
     
     async def fetch_one(self, statement: Statement) -> Optional[Record]:
         """Fetch a single record"""
-        conn = await self._get_connection()
-        try:
-            record = await conn.fetchrow(statement.query, *statement.args)
-            if record:
-                return Record(**dict(record))
-            return None
-        except Exception as e:
-            raise QueryError(f"Failed to fetch record: {e}") from e
-        finally:
-            await self._release_connection(conn)
+        async with self._acquire() as conn:
+            try:
+                record = await conn.fetchrow(statement.query, *statement.args)
+            except Exception as e:
+                raise QueryError(f"Failed to fetch record: {e}") from e
+        if record:
+            return Record(**record)
+        return None
+    
+    async def _count_rows(self, statement: Statement, action: str) -> int:
+        """Execute a statement and count the rows it affected"""
+        async with self._acquire() as conn:
+            try:
+                rows = await conn.fetch(_returning(statement.query), *statement.args)
+            except Exception as e:
+                raise QueryError(f"Failed to {action} records: {e}") from e
+        return len(rows)
     
     async def insert_many(self, statement: Statement) -> int:
-        """Insert multiple records"""
-        conn = await self._get_connection()
-        try:
-            result = await conn.execute(statement.query, *statement.args)
-            # Parse result like "INSERT 0 5" to get count
-            if result.startswith("INSERT"):
-                parts = result.split()
-                return int(parts[2]) if len(parts) > 2 else 0
-            return 0
-        except Exception as e:
-            raise QueryError(f"Failed to insert records: {e}") from e
-        finally:
-            await self._release_connection(conn)
+        """Insert multiple records
+        
+        Statements carrying args_list are sent with executemany, pipelined in a
+        single implicit transaction. Their INSERT has no ON CONFLICT clause, every
+        row is inserted or the whole batch fails, so the count is the batch size.
+        """
+        if statement.args_list is None:
+            return await self._count_rows(statement, "insert")
+        async with self._acquire() as conn:
+            try:
+                await conn.executemany(statement.query, statement.args_list)
+            except Exception as e:
+                raise QueryError(f"Failed to insert records: {e}") from e
+        return len(statement.args_list)
+    
+    async def _execute_bool(self, statement: Statement, action: str) -> bool:
+        """Execute a single-row statement and report whether exactly one row was affected"""
+        if statement.args_list is not None:
+            raise ValueError(f"Cannot {action} a single record with a batch of arguments")
+        async with self._acquire() as conn:
+            try:
+                rows = await conn.fetch(_returning(statement.query), *statement.args)
+            except Exception as e:
+                raise QueryError(f"Failed to {action} record: {e}") from e
+        return len(rows) == 1
     
     async def insert_one(self, statement: Statement) -> bool:
         """Insert a single record"""
-        inserted_count = await self.insert_many(statement)
-        return inserted_count == 1
+        return await self._execute_bool(statement, "insert")
     
     async def update_many(self, statement: Statement) -> int:
         """Update multiple records"""
-        conn = await self._get_connection()
-        try:
-            result = await conn.execute(statement.query, *statement.args)
-            # Parse result like "UPDATE 3" to get count
-            if result.startswith("UPDATE"):
-                parts = result.split()
-                return int(parts[1]) if len(parts) > 1 else 0
-            return 0
-        except Exception as e:
-            raise QueryError(f"Failed to update records: {e}") from e
-        finally:
-            await self._release_connection(conn)
+        return await self._count_rows(statement, "update")
     
     async def update_one(self, statement: Statement) -> bool:
         """Update a single record"""
-        updated_count = await self.update_many(statement)
-        return updated_count == 1
+        return await self._execute_bool(statement, "update")
     
     async def delete_many(self, statement: Statement) -> int:
         """Delete multiple records"""
-        conn = await self._get_connection()
-        try:
-            result = await conn.execute(statement.query, *statement.args)
-            # Parse result like "DELETE 2" to get count
-            if result.startswith("DELETE"):
-                parts = result.split()
-                return int(parts[1]) if len(parts) > 1 else 0
-            return 0
-        except Exception as e:
-            raise QueryError(f"Failed to delete records: {e}") from e
-        finally:
-            await self._release_connection(conn)
+        return await self._count_rows(statement, "delete")
     
     async def delete_one(self, statement: Statement) -> bool:
         """Delete a single record"""
-        deleted_count = await self.delete_many(statement)
-        return deleted_count == 1
\ No newline at end of file
+        return await self._execute_bool(statement, "delete")
+    
+    async def listen(self, channel: str, callback: Callable[[str], None]) -> None:
+        """Call back with the payload of every notification sent on a channel"""
+        if not self.is_connected:
+            raise ConnectionError("Database not connected")
+        try:
+            if self._listener is None:
+                self._listener = await asyncpg.connect(self.config.connection_uri)
+            await self._listener.add_listener(
+                channel,
+                lambda connection, pid, channel, payload: callback(payload)
+            )
+        except Exception as e:
+            raise QueryError(f"Failed to listen on channel '{channel}': {e}") from e
+    
+    async def notify(self, channel: str, payload: str) -> None:
+        """Send a notification on a channel"""
+        async with self._acquire() as conn:
+            try:
+                await conn.execute("SELECT pg_notify($1, $2)", channel, payload)
+            except Exception as e:
+                raise QueryError(f"Failed to notify channel '{channel}': {e}") from e
@@ -1,21 +1,38 @@
-from typing import Any, Dict, Optional
-from pydantic import BaseModel, Field
+from dataclasses import dataclass
+from typing import Any, Dict, Iterator, Optional
 from datetime import datetime, timezone
 
 
-class Record(BaseModel):
-    """Database record with validation and type safety"""
+class Record:
+    """Database record with dictionary-like and attribute access"""
+
+    # One slot around the row mapping, no per-instance model metadata
+    __slots__ = ("_data",)
     
     def __init__(self, **data):
-        super().__init__(**data)
+        self._data = data
+    
+    def __getattr__(self, key: str) -> Any:
+        """Allow attribute access to the selected columns"""
+        if key == "_data":
+            # Slot not set yet, e.g. while copying, avoid recursing into ourselves
+            raise AttributeError(key)
+        try:
+            return self._data[key]
+        except KeyError:
+            raise AttributeError(key) from None
     
     def get(self, key: str, default: Any = None) -> Any:
         """Get value by key with default"""
-        return getattr(self, key, default)
+        return self._data.get(key, default)
+    
+    def keys(self):
+        """Selected column names, allows unpacking with **"""
+        return self._data.keys()
     
     def to_dict(self) -> Dict[str, Any]:
         """Convert to dictionary"""
-        return self.model_dump()
+        return dict(self._data)
     
     @classmethod
     def from_dict(cls, data: Dict[str, Any]) -> 'Record':
@@ -24,18 +41,37 @@ class Record(BaseModel):
     
     def __getitem__(self, key: str) -> Any:
         """Allow dictionary-like access"""
-        return getattr(self, key)
+        return self._data[key]
     
     def __contains__(self, key: str) -> bool:
         """Check if key exists"""
-        return hasattr(self, key)
+        return key in self._data
+    
+    def __iter__(self) -> Iterator[str]:
+        """Iterate over column names"""
+        return iter(self._data)
+    
+    def __len__(self) -> int:
+        """Number of selected columns"""
+        return len(self._data)
+    
+    def __eq__(self, other: object) -> bool:
+        """Records are equal when they hold the same columns and values"""
+        if isinstance(other, Record):
+            return self._data == other._data
+        return NotImplemented
+    
+    def __repr__(self) -> str:
+        """Debug representation with the column values"""
+        return f"{type(self).__name__}({self._data!r})"
 
 
-class LockRecord(Record):
+@dataclass(slots=True, frozen=True)
+class LockRecord:
     """Specific record type for lock data"""
-    name: str = Field(..., description="Lock name/key")
-    holder: str = Field(..., description="Lock holder identifier")
-    created_at: datetime = Field(..., description="Lock creation timestamp")
+    holder: str  # Lock holder identifier
+    key: Optional[str] = None  # Lock key, absent when the query did not select it
+    created_at: Optional[datetime] = None  # Lock creation timestamp
     
     @property
     def age_seconds(self) -> float:
@@ -46,5 +82,3 @@ class LockRecord(Record):
     def is_stale(self, max_age_seconds: int = 3600) -> bool:
         """Check if lock is stale (older than max_age_seconds)"""
         return self.age_seconds > max_age_seconds
-    
-    
\ No newline at end of file
@@ -1,128 +1,222 @@
-from typing import List, Optional, Any, Dict
+from typing import List, Optional, Any, Dict, Tuple
 from dataclasses import dataclass
 from datetime import datetime
-import logging
-from .models import LockModel
+from functools import lru_cache
+import sys
+from .models import LockModel, utc_now
 
-logger = logging.getLogger(__name__)
 
-
-@dataclass
+@dataclass(slots=True)
 class Statement:
     """SQL statement with parameters"""
     query: str
     args: tuple = ()
+    # One argument tuple per row of a single-row query, executed as a batch with executemany
+    args_list: Optional[List[tuple]] = None
+    
+    def __post_init__(self):
+        # asyncpg caches prepared statements per connection keyed by query text,
+        # interning makes repeated lookups for the same shape hit on identity
+        self.query = sys.intern(self.query)
     
     def __str__(self):
         return self.query.format(*self.args)
 
 
+# Positional parameters $1..$128, built once and sliced instead of formatted per call
+_PLACEHOLDERS = tuple(f"${i}" for i in range(1, 129))
+
+
+def _placeholders(start: int, count: int) -> Tuple[str, ...]:
+    """Placeholders for count parameters following the first start ones"""
+    if start + count <= len(_PLACEHOLDERS):
+        return _PLACEHOLDERS[start:start + count]
+    return tuple(f"${i + 1}" for i in range(start, start + count))
+
+
+def _values_clause(width: int, count: int) -> str:
+    """Row tuples of a multi-row VALUES clause, parameters numbered row after row"""
+    return ", ".join(
+        f"({', '.join(_placeholders(row * width, width))})"
+        for row in range(count)
+    )
+
+
+def _where_clause(keys: Tuple[str, ...], start: int = 0, operator: str = "=") -> str:
+    """Conditions of a WHERE clause, one placeholder per key after the first start ones"""
+    return " AND ".join(
+        f"{key} {operator} {placeholder}"
+        for key, placeholder in zip(keys, _placeholders(start, len(keys)))
+    )
+
+
+# Query text only depends on the statement shape, repeated shapes skip the formatting
+@lru_cache(maxsize=256)
+def _build_query(
+    operation: str,
+    table: str,
+    columns: Tuple[str, ...] = (),
+    where_keys: Tuple[str, ...] = (),
+    suffix: str = ""
+) -> str:
+    """Build the query text for a statement shape, parameter values are bound separately"""
+    if operation in ("select", "select_like"):
+        cols = "*" if not columns else ", ".join(columns)
+        query = f"SELECT {cols} FROM {table}"
+    elif operation == "insert":
+        placeholders = ", ".join(_placeholders(0, len(columns)))
+        query = f"INSERT INTO {table} ({', '.join(columns)}) VALUES ({placeholders})"
+    elif operation == "update":
+        set_clause = ", ".join(f"{col} = {placeholder}" for col, placeholder in zip(columns, _placeholders(0, len(columns))))
+        query = f"UPDATE {table} SET {set_clause}"
+    elif operation in ("delete", "delete_like"):
+        query = f"DELETE FROM {table}"
+    else:
+        raise ValueError(f"Unsupported operation: {operation}")
+    
+    if where_keys:
+        operator = "LIKE" if operation.endswith("_like") else "="
+        # Where placeholders follow the ones already taken by the column values
+        offset = len(columns) if operation == "update" else 0
+        query += f" WHERE {_where_clause(where_keys, offset, operator)}"
+    
+    # Interned once here, Statement then interns the cached object by identity
+    return sys.intern(query + suffix)
+
+
+# Python types to SQL types, strings are sized from the field and anything else is TEXT
+_SQL_TYPES = {
+    int: "INTEGER",
+    float: "REAL",
+    bool: "BOOLEAN",
+    # Timestamps are timezone-aware, asyncpg returns aware datetimes for TIMESTAMPTZ
+    datetime: "TIMESTAMPTZ",
+}
+
+
+def _column_definition(field_name: str, field_info) -> str:
+    """Build the column definition of a Pydantic model field"""
+    field_type = field_info.annotation
+    
+    if field_type is str:
+        # Pydantic v2 keeps length constraints in the field metadata, not on FieldInfo
+        max_length = next(
+            (m.max_length for m in field_info.metadata if getattr(m, 'max_length', None) is not None),
+            255
+        )
+        sql_type = f"VARCHAR({max_length})"
+    else:
+        sql_type = _SQL_TYPES.get(field_type, "TEXT")
+    
+    # Handle default values, required fields carry the PydanticUndefined sentinel as default
+    default_factory = field_info.default_factory
+    default = field_info.default
+    if field_info.is_required():
+        sql_type += " NOT NULL"
+    elif default_factory is not None:
+        if default_factory is utc_now:
+            sql_type += " DEFAULT CURRENT_TIMESTAMP"
+        else:
+            sql_type += " DEFAULT NULL"
+    elif default is None:
+        sql_type += " DEFAULT NULL"
+    else:
+        sql_type += f" DEFAULT {default}"
+    
+    return f"{field_name} {sql_type}"
+
+
 class StatementBuilder:
     """Builder pattern for creating SQL statements"""
     
     @staticmethod
     def select(table: str, columns: Optional[List[str]] = None, where: Optional[Dict[str, Any]] = None) -> Statement:
         """Build SELECT statement"""
-        cols = "*" if not columns else ", ".join(columns)
-        query = f"SELECT {cols} FROM {table}"
-        args = ()
-        
-        if where:
-            conditions = []
-            for key, value in where.items():
-                conditions.append(f"{key} = ${len(args) + 1}")
-                args += (value,)
-            query += f" WHERE {' AND '.join(conditions)}"
-        
-        return Statement(query, args)
+        where = where or {}
+        query = _build_query("select", table, tuple(columns or ()), tuple(where))
+        return Statement(query, tuple(where.values()))
 
     @staticmethod
     def select_like(table: str, columns: Optional[List[str]] = None, where: Optional[Dict[str, Any]] = None) -> Statement:
         """Build SELECT statement with LIKE"""
-        cols = "*" if not columns else ", ".join(columns)
-        query = f"SELECT {cols} FROM {table}"
-        args = ()
-        
-        if where:
-            conditions = []
-            for key, value in where.items():
-                conditions.append(f"{key} LIKE ${len(args) + 1}")
-                args += (value,)
-            query += f" WHERE {' AND '.join(conditions)}"
-        
-        return Statement(query, args)
+        where = where or {}
+        query = _build_query("select_like", table, tuple(columns or ()), tuple(where))
+        return Statement(query, tuple(where.values()))
         
     
     @staticmethod
     def insert(table: str, data: Dict[str, Any], on_conflict: Optional[str] = None) -> Statement:
         """Build INSERT statement"""
-        columns = list(data.keys())
-        placeholders = [f"${i+1}" for i in range(len(columns))]
-        
-        query = f"INSERT INTO {table} ({', '.join(columns)}) VALUES ({', '.join(placeholders)})"
-        args = tuple(data.values())
-        
-        if on_conflict:
-            query += f" ON CONFLICT {on_conflict}"
-        
-        return Statement(query, args)
+        suffix = f" ON CONFLICT {on_conflict}" if on_conflict else ""
+        query = _build_query("insert", table, tuple(data), suffix=suffix)
+        return Statement(query, tuple(data.values()))
+    
+    @staticmethod
+    def insert_many(table: str, rows: List[Dict[str, Any]]) -> Statement:
+        """Build a batched INSERT statement, every row must have the same columns"""
+        if not rows:
+            raise ValueError("Cannot build an INSERT statement without rows")
+        
+        columns = tuple(rows[0])
+        args_list = []
+        for row in rows:
+            if tuple(row) != columns:
+                raise ValueError(f"Row columns {tuple(row)} do not match {columns}")
+            args_list.append(tuple(row.values()))
+        
+        # One single-row query for every batch size, executemany binds each row in turn
+        query = _build_query("insert", table, columns)
+        return Statement(query, args_list=args_list)
     
     @staticmethod
     def update(table: str, data: Dict[str, Any], where: Optional[Dict[str, Any]] = None) -> Statement:
         """Build UPDATE statement"""
-        set_clause = ", ".join([f"{col} = ${i+1}" for i, col in enumerate(data.keys())])
-        query = f"UPDATE {table} SET {set_clause}"
-        args = tuple(data.values())
-        
-        if where:
-            conditions = []
-            for key, value in where.items():
-                conditions.append(f"{key} = ${len(args) + 1}")
-                args += (value,)
-            query += f" WHERE {' AND '.join(conditions)}"
-        
-        return Statement(query, args)
+        where = where or {}
+        query = _build_query("update", table, tuple(data), tuple(where))
+        return Statement(query, tuple(data.values()) + tuple(where.values()))
     
     @staticmethod
     def delete(table: str, where: Optional[Dict[str, Any]] = None) -> Statement:
         """Build DELETE statement"""
-        query = f"DELETE FROM {table}"
-        args = ()
-        
-        if where:
-            conditions = []
-            for key, value in where.items():
-                conditions.append(f"{key} = ${len(args) + 1}")
-                args += (value,)
-            query += f" WHERE {' AND '.join(conditions)}"
-        
-        return Statement(query, args)
+        where = where or {}
+        query = _build_query("delete", table, where_keys=tuple(where))
+        return Statement(query, tuple(where.values()))
     
     @staticmethod
-    def delete_like(table: str, where: Optional[Dict[str, Any]] = None) -> Statement:
-        """Build DELETE statement"""
-        query = f"DELETE FROM {table}"
-        args = ()
-        
-        if where:
-            conditions = []
-            for key, value in where.items():
-                conditions.append(f"{key} LIKE ${len(args) + 1}")
-                args += (value,)
-            query += f" WHERE {' AND '.join(conditions)}"
-        
-        return Statement(query, args)
+    def delete_like(table: str, where: Optional[Dict[str, Any]] = None, returning: Optional[List[str]] = None) -> Statement:
+        """Build DELETE statement with LIKE"""
+        where = where or {}
+        suffix = f" RETURNING {', '.join(returning)}" if returning else ""
+        query = _build_query("delete_like", table, where_keys=tuple(where), suffix=suffix)
+        return Statement(query, tuple(where.values()))
     
     @staticmethod
     def insert_on_conflict_do_nothing(table: str, data: Dict[str, Any], conflict_column: str) -> Statement:
         """Build INSERT ... ON CONFLICT DO NOTHING statement"""
-        columns = list(data.keys())
-        placeholders = [f"${i+1}" for i in range(len(columns))]
-        
-        query = f"INSERT INTO {table} ({', '.join(columns)}) VALUES ({', '.join(placeholders)}) ON CONFLICT ({conflict_column}) DO NOTHING"
-        args = tuple(data.values())
-        
-        return Statement(query, args)
+        query = _build_query("insert", table, tuple(data), suffix=f" ON CONFLICT ({conflict_column}) DO NOTHING")
+        return Statement(query, tuple(data.values()))
+    
+    @staticmethod
+    def insert_many_on_conflict_do_nothing(
+        table: str,
+        columns: List[str],
+        rows: List[tuple],
+        conflict_column: str,
+        returning: Optional[List[str]] = None
+    ) -> Statement:
+        """Build a multi-row INSERT ... ON CONFLICT DO NOTHING statement"""
+        values = _values_clause(len(columns), len(rows))
+        # Flatten into one list, growing a tuple per row would copy it every time
+        args = []
+        for row in rows:
+            args.extend(row)
+        
+        query = f"INSERT INTO {table} ({', '.join(columns)}) VALUES {values} ON CONFLICT ({conflict_column}) DO NOTHING"
+        
+        if returning:
+            query += f" RETURNING {', '.join(returning)}"
+        
+        return Statement(query, tuple(args))
     
     @staticmethod
     def create_table(table: str, columns: List[str]) -> Statement:
@@ -134,50 +228,21 @@ class StatementBuilder:
     @staticmethod
     def create_table_from_model(table_name: str, model_class, primary_keys: Optional[List[str]] = None) -> Statement:
         """Build CREATE TABLE statement from a Pydantic model"""
-        columns = []
-        
-        for field_name, field_info in model_class.model_fields.items():
-            field_type = field_info.annotation
-            
-            # Map Python types to SQL types
-            if field_type == str:
-                max_length = getattr(field_info, 'max_length', 255)
-                sql_type = f"VARCHAR({max_length})"
-            elif field_type == int:
-                sql_type = "INTEGER"
-            elif field_type == float:
-                sql_type = "REAL"
-            elif field_type == bool:
-                sql_type = "BOOLEAN"
-            elif field_type == datetime:
-                sql_type = "TIMESTAMP"
-            else:
-                sql_type = "TEXT"
-            
-            # Handle default values
-            if hasattr(field_info, 'default_factory') and field_info.default_factory:
-                if field_info.default_factory == datetime.utcnow:
-                    sql_type += " DEFAULT CURRENT_TIMESTAMP"
-                else:
-                    sql_type += " DEFAULT NULL"
-            elif field_info.default is not None:
-                sql_type += f" DEFAULT {field_info.default}"
-            elif not field_info.is_required():
-                sql_type += " DEFAULT NULL"
-            else:
-                sql_type += " NOT NULL"
-            
-            columns.append(f"{field_name} {sql_type}")
+        columns = (
+            _column_definition(field_name, field_info)
+            for field_name, field_info in model_class.model_fields.items()
+        )
+        columns_str = ", ".join(columns)
         
         # Add primary key constraint if specified
         if primary_keys:
-            columns.append(f"PRIMARY KEY ({', '.join(primary_keys)})")
+            columns_str += f", PRIMARY KEY ({', '.join(primary_keys)})"
         
-        columns_str = ", ".join(columns)
         query = f"CREATE TABLE IF NOT EXISTS {table_name} ({columns_str})"
         return Statement(query)
     
     @staticmethod
     def create_locks_table() -> Statement:
         """Create the locks table based on LockModel"""
-        return StatementBuilder.create_table_from_model("locks", LockModel, primary_keys=["name", "holder"])
\ No newline at end of file
+        # ON CONFLICT (key) needs a unique index on key, one holder per lock
+        return StatementBuilder.create_table_from_model("locks", LockModel, primary_keys=["key"])
\ No newline at end of file
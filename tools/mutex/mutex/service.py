@@ -1,15 +1,20 @@
 import asyncio
+import random
 import time
 import logging
-from typing import Optional
+from operator import itemgetter
+from typing import Dict, List, Optional, Set, Tuple
 from contextlib import asynccontextmanager
 from mutex.database.base import Database, DatabaseError
 from mutex.database.models import LockAcquisitionRequest, LockReleaseRequest, DatabaseConfig
 from mutex.database.record import LockRecord, Record
-from mutex.database.statement import StatementBuilder
+from mutex.database.statement import Statement, StatementBuilder
 
 logger = logging.getLogger(__name__)
 
+# Positional LockRecord fields of a row, picked in one call instead of one lookup each
+_lock_record_fields = itemgetter("holder", "key", "created_at")
+
 
 class MutexService:
     """Service for managing distributed mutexes"""
@@ -18,153 +23,242 @@ class MutexService:
         self._table_name = "locks"
         self._database = database
         self._default_timeout = 60  # seconds
+        self._retry_base_delay = 0.005  # seconds
+        self._retry_max_delay = 1.0  # seconds
+        # Guards the connect/disconnect lifecycle when workers share the service
+        self._lifecycle_lock = asyncio.Lock()
+        self._initialized = False
+        # Releases are announced on this channel, waiters wake up instead of polling
+        self._release_channel = "mutex_released"
+        self._release_waiters: Dict[str, Set[asyncio.Event]] = {}
+        self._listening = False
+        self._listen_poll_interval = 5.0  # seconds, safety net for missed notifications
+        self._wait_log_interval = 10.0  # seconds between "waiting again" logs of one waiter
+        # Statement shapes are fixed per service, only the bound values change per call
+        self._acquire_insert_query = StatementBuilder.insert_on_conflict_do_nothing(
+            table=self._table_name,
+            data={"key": None, "holder": None},
+            conflict_column="key"
+        ).query
+        self._acquire_select_query = StatementBuilder.select(
+            table=self._table_name,
+            columns=["holder", "created_at"],
+            where={"key": None}
+        ).query
+        self._release_delete_query = StatementBuilder.delete(
+            table=self._table_name,
+            where={"key": None, "holder": None}
+        ).query
+        self._release_select_query = StatementBuilder.select(
+            table=self._table_name,
+            columns=["holder"],
+            where={"key": None}
+        ).query
+        self._cleanup_delete_query = StatementBuilder.delete_like(
+            table=self._table_name,
+            where={"holder": None},
+            returning=["key", "holder", "created_at"]
+        ).query
+    
+    def retry_delay(self, attempt: int) -> float:
+        """Exponential backoff with jitter, capped at the maximum retry delay"""
+        # Bound the exponent, the float product would overflow on long waits
+        delay = self._retry_base_delay * (2 ** min(attempt, 16)) * random.uniform(0.5, 1.5)
+        # Capped after the jitter, the maximum is a hard bound
+        return min(self._retry_max_delay, delay)
     
     async def initialize(self) -> None:
         """Initialize the mutex service"""
-        await self._database.connect()
-        statement = StatementBuilder.create_locks_table()
-        await self._database.create_table(statement)
+        async with self._lifecycle_lock:
+            if self._initialized:
+                return
+            await self._database.connect()
+            try:
+                statement = StatementBuilder.create_locks_table()
+                await self._database.create_table(statement)
+            except BaseException:
+                await self._database.disconnect()
+                raise
+            self._initialized = True
         logger.info("Mutex service initialized")
     
     async def shutdown(self) -> None:
         """Shutdown the mutex service"""
-        await self._database.disconnect()
+        async with self._lifecycle_lock:
+            if not self._initialized:
+                return
+            await self._database.disconnect()
+            self._initialized = False
+            self._listening = False
         logger.info("Mutex service shutdown")
     
+    async def _listen_for_releases(self) -> bool:
+        """Subscribe once to release notifications, False when unavailable"""
+        async with self._lifecycle_lock:
+            if not self._listening:
+                try:
+                    await self._database.listen(self._release_channel, self._on_release)
+                    self._listening = True
+                except DatabaseError as e:
+                    logger.warning("⚠️ Release notifications unavailable, falling back to polling: %s", e)
+        return self._listening
+    
+    def _on_release(self, key: str) -> None:
+        """Wake up every local waiter of a released lock"""
+        for event in self._release_waiters.get(key, ()):
+            event.set()
+    
+    async def _wait_for_release(self, event: asyncio.Event, attempt: int, remaining: float) -> None:
+        """Wait for a release notification, or the next poll when none arrives"""
+        if self._listening:
+            timeout = min(self._listen_poll_interval, remaining)
+        else:
+            timeout = min(self.retry_delay(attempt), remaining)
+        try:
+            await asyncio.wait_for(event.wait(), timeout=max(timeout, 0))
+        except asyncio.TimeoutError:
+            pass
+    
     async def acquire(self, request: LockAcquisitionRequest) -> bool:
         """Acquire a lock with timeout"""
-        start_time = time.time()
+        start_time = time.monotonic()
         key = request.key
         holder = request.holder
         timeout_seconds = request.timeout or self._default_timeout
 
-        insert_statement = StatementBuilder.insert_on_conflict_do_nothing(
-            table=self._table_name,
-            data={
-                "key": key,
-                "holder": holder
-            },
-            conflict_column="key"
-        )
-
-        fetch_one_statement = StatementBuilder.select(
-            table=self._table_name,
-            columns=["holder", "created_at"],
-            where={
-                "key": key
-            }
-        )
+        insert_statement = Statement(self._acquire_insert_query, (key, holder))
+        fetch_one_statement = Statement(self._acquire_select_query, (key,))
         
-        while True:
-            try:
-                elapsed_time = time.time() - start_time
+        # Registered before the first insert so a release in between is not missed
+        released = asyncio.Event()
+        self._release_waiters.setdefault(key, set()).add(released)
+        
+        attempt = 0
+        last_wait_log = None
+        subscribed = False
+        try:
+            while True:
+                try:
+                    elapsed_time = time.monotonic() - start_time
 
-                if  elapsed_time > timeout_seconds:
-                    logger.error("❌ Timeout waiting for mutex to be released")
-                    return False
+                    if  elapsed_time > timeout_seconds:
+                        logger.error("❌ Timeout waiting for mutex to be released")
+                        return False
 
-                logger.info(f"🔒 Attempting to acquire mutex with holder '{holder}'...")
-                
-                is_inserted = await self._database.insert_one(insert_statement)
-                
-                if is_inserted:
-                    logger.info(f"✅ Mutex acquired with key '{key}' and holder '{holder}'")
-                    return True
-                else:
-                    record: Optional[Record] = await self._database.fetch_one(fetch_one_statement)
+                    logger.info("🔒 Attempting to acquire mutex with holder '%s'...", holder)
                     
-                    if record:
-                        lock_record = LockRecord(**record)
-                        logger.info(f"🔍 Mutex is locked by {lock_record.holder}, waiting again {elapsed_time:.1f}s...")
-                        await asyncio.sleep(1)
+                    released.clear()
+                    is_inserted = await self._database.insert_one(insert_statement)
+                    
+                    if is_inserted:
+                        logger.info("✅ Mutex acquired with key '%s' and holder '%s'", key, holder)
+                        return True
                     else:
-                        # Race condition: lock was released between our attempts
-                        logger.info("🔄 Lock was released, retrying...")
-                        await asyncio.sleep(0.1)
-            except DatabaseError as e:
-                logger.error(f"❌ Database error during lock acquisition: {e}")
-                await asyncio.sleep(1)
-                continue
+                        # Uncontended acquisitions never need the LISTEN connection, subscribe on first contention
+                        if not subscribed:
+                            await self._listen_for_releases()
+                            subscribed = True
+                        record: Optional[Record] = await self._database.fetch_one(fetch_one_statement)
+                        
+                        if record:
+                            # Contended waiters retry often, only report the wait periodically
+                            if last_wait_log is None or elapsed_time - last_wait_log >= self._wait_log_interval:
+                                logger.info("🔍 Mutex is locked by %s, waiting again %.1fs...", record["holder"], elapsed_time)
+                                last_wait_log = elapsed_time
+                            await self._wait_for_release(released, attempt, timeout_seconds - elapsed_time)
+                            attempt += 1
+                        else:
+                            # Race condition: lock was released between our attempts
+                            logger.info("🔄 Lock was released, retrying...")
+                            attempt = 0
+                except DatabaseError as e:
+                    logger.error("❌ Database error during lock acquisition: %s", e)
+                    # Never back off past the deadline, the timeout check runs on the next pass
+                    remaining = timeout_seconds - (time.monotonic() - start_time)
+                    await asyncio.sleep(max(0, min(self.retry_delay(attempt), remaining)))
+                    attempt += 1
+                    continue
+        finally:
+            waiters = self._release_waiters[key]
+            waiters.discard(released)
+            if not waiters:
+                del self._release_waiters[key]
+    
+    async def try_acquire_many(self, requests: List[Tuple[str, str]]) -> Set[Tuple[str, str]]:
+        """Attempt to acquire several locks in one round-trip, without waiting"""
+        if not requests:
+            return set()
+
+        insert_statement = StatementBuilder.insert_many_on_conflict_do_nothing(
+            table=self._table_name,
+            columns=["key", "holder"],
+            rows=requests,
+            conflict_column="key",
+            returning=["key", "holder"]
+        )
+
+        records = await self._database.fetch_many(insert_statement)
+        acquired = {(record["key"], record["holder"]) for record in records}
+        logger.info("🔒 Acquired %d of %d batched mutexes", len(acquired), len(requests))
+        return acquired
+    
+    async def _notify_release(self, key: str) -> None:
+        """Announce a released lock to waiters, they still poll if this fails"""
+        try:
+            await self._database.notify(self._release_channel, key)
+        except DatabaseError as e:
+            logger.warning("⚠️ Failed to notify release of '%s': %s", key, e)
     
     async def release(self, request: LockReleaseRequest) -> bool:
         """Release a lock"""
         key = request.key
         holder = request.holder
 
-        select_statement = StatementBuilder.select(
-            table=self._table_name,
-            columns=["holder"],
-            where={
-                "key": key
-            }
-        )
-
-        delete_statement = StatementBuilder.delete(
-            table=self._table_name,
-            where={
-                "key": key,
-                "holder": holder
-            }
-        )
+        select_statement = Statement(self._release_select_query, (key,))
+        delete_statement = Statement(self._release_delete_query, (key, holder))
         
         try:        
             # Try to release the lock atomically
             is_deleted = await self._database.delete_one(delete_statement)
             
             if is_deleted:
-                logger.info(f"✅ Mutex released with key '{key}'")
+                logger.info("✅ Mutex released with key '%s'", key)
+                await self._notify_release(key)
                 return True
             else:
                 # Check if lock exists but we don't own it
                 record: Optional[Record] = await self._database.fetch_one(select_statement)
                 if record:
-                    lock_record = LockRecord(**record)
-                    logger.info(f"⚠️ Lock '{key}' is held by '{lock_record.holder}', not by us (prefix: '{holder}')")
+                    logger.info("⚠️ Lock '%s' is held by '%s', not by us (prefix: '%s')", key, record["holder"], holder)
                     return False
                 else:
-                    logger.info(f"⚠️ No lock found for key '{key}'")
+                    logger.info("⚠️ No lock found for key '%s'", key)
                     return True
         except DatabaseError as e:
-            logger.error(f"❌Database error during lock release: {e}")
+            logger.error("❌Database error during lock release: %s", e)
             return False
     
     async def cleanup(self, holder_pattern: str) -> bool:
         """Clean up all locks for a specific holder pattern"""
 
-        select_statement = StatementBuilder.select_like(
-            table=self._table_name,
-            columns=["holder", "created_at"],
-            where={
-                "holder": f"{holder_pattern}%"
-            }
-        )
-
-        delete_statement = StatementBuilder.delete_like(
-            table=self._table_name,
-            where={
-                "holder": f"{holder_pattern}%"
-            }
-        )
+        # Delete and report the removed locks in a single round-trip
+        delete_statement = Statement(self._cleanup_delete_query, (f"{holder_pattern}%",))
 
         try:
-            records = await self._database.fetch_many(select_statement)
+            records = await self._database.fetch_many(delete_statement)
             
             if not records:
-                logger.info(f"✅ No locks found with holder pattern '{holder_pattern}'")
+                logger.info("✅ No locks found with holder pattern '%s'", holder_pattern)
                 return True
             
-            lock_records = [LockRecord(**record) for record in records]
-            
-            logger.info(f"🔍 Found {len(records)} locks to clean with holder pattern '{holder_pattern}':")
-            for lock_record in lock_records:
-                elapsed = asyncio.get_event_loop().time() - lock_record.created_at.timestamp()
-                logger.info(f"  - {lock_record.key} (held by {lock_record.holder}, age: {elapsed:.1f}s)")
-            
-            deleted_count = await self._database.delete_many(delete_statement)
-            
-            logger.info(f"✅ Successfully deleted {deleted_count} locks with holder pattern '{holder_pattern}'")
+            logger.info("✅ Successfully deleted %d locks with holder pattern '%s':", len(records), holder_pattern)
+            now = time.time()
+            for record in records:
+                lock_record = LockRecord(*_lock_record_fields(record))
+                elapsed = now - lock_record.created_at.timestamp()
+                logger.info("  - %s (held by %s, age: %.1fs)", lock_record.key, lock_record.holder, elapsed)
             
             return True
         except DatabaseError as e:
-            logger.error(f"❌Database error during cleanup: {e}")
-            return 0
\ No newline at end of file
+            logger.error("❌Database error during cleanup: %s", e)
+            return 0
@@ -0,0 +1,179 @@
+import asyncio
+from typing import List, Set, Tuple
+
+from assertpy import assert_that
+
+from mutex.daemon import MutexDaemon, _PendingAcquire, send_request
+from mutex.database.base import DatabaseError
+from mutex.database.models import LockAcquisitionRequest, LockReleaseRequest
+
+
+class FakeService:
+    """Stand-in for MutexService recording the batches it is asked to insert."""
+
+    def __init__(self, grant: bool = True, delay: float = 0.001):
+        self.grant = grant
+        self.delay = delay
+        self.batches: List[List[Tuple[str, str]]] = []
+        self.released: List[LockReleaseRequest] = []
+        self.failures = 0
+
+    def retry_delay(self, attempt: int) -> float:
+        return self.delay
+
+    async def try_acquire_many(self, requests: List[Tuple[str, str]]) -> Set[Tuple[str, str]]:
+        if self.failures:
+            self.failures -= 1
+            raise RuntimeError("connection reset")
+        self.batches.append(list(requests))
+        return set(requests) if self.grant else set()
+
+    async def release(self, request: LockReleaseRequest) -> bool:
+        self.released.append(request)
+        return True
+
+
+async def _with_batcher(daemon: MutexDaemon, coroutine):
+    batcher = asyncio.create_task(daemon._batch_loop())
+    try:
+        return await coroutine
+    finally:
+        batcher.cancel()
+
+
+class TestMutexDaemon:
+    """Test cases for the batching daemon."""
+
+    def test_batch_inserts_one_row_per_key(self, tmp_path):
+        """Requests for the same key in one window are deferred to the next batch."""
+        service = FakeService()
+        daemon = MutexDaemon(service, str(tmp_path / "daemon.sock"))
+
+        async def scenario():
+            return await asyncio.gather(
+                daemon._enqueue_acquire(LockAcquisitionRequest("a", "first")),
+                daemon._enqueue_acquire(LockAcquisitionRequest("a", "second")),
+                daemon._enqueue_acquire(LockAcquisitionRequest("b", "third")),
+            )
+
+        results = asyncio.run(_with_batcher(daemon, scenario()))
+
+        assert_that(results).is_equal_to([True, True, True])
+        assert_that(service.batches[0]).is_equal_to([("a", "first"), ("b", "third")])
+        assert_that(service.batches[1]).is_equal_to([("a", "second")])
+
+    def test_acquire_times_out(self, tmp_path):
+        """A request still contended past its deadline resolves to False."""
+        service = FakeService(grant=False, delay=5)
+        daemon = MutexDaemon(service, str(tmp_path / "daemon.sock"))
+
+        result = asyncio.run(
+            _with_batcher(daemon, daemon._enqueue_acquire(LockAcquisitionRequest("a", "holder", timeout=1)))
+        )
+
+        assert_that(result).is_false()
+        assert_that(service.batches).is_length(1)
+
+    def test_failed_batch_does_not_stop_the_loop(self, tmp_path):
+        """A batch that raises fails its own waiters and later batches still settle."""
+        service = FakeService()
+        service.failures = 1
+        daemon = MutexDaemon(service, str(tmp_path / "daemon.sock"))
+
+        async def scenario():
+            first = await asyncio.gather(
+                daemon._enqueue_acquire(LockAcquisitionRequest("a", "holder")), return_exceptions=True
+            )
+            second = await daemon._enqueue_acquire(LockAcquisitionRequest("a", "holder"))
+            return first[0], second
+
+        first, second = asyncio.run(_with_batcher(daemon, scenario()))
+
+        assert_that(first).is_instance_of(RuntimeError)
+        assert_that(second).is_true()
+
+    def test_database_error_retries_batch(self, tmp_path):
+        """A database error is treated as contention and the request is retried."""
+        service = FakeService()
+        daemon = MutexDaemon(service, str(tmp_path / "daemon.sock"))
+        original = service.try_acquire_many
+        calls = []
+
+        async def flaky(requests):
+            calls.append(requests)
+            if len(calls) == 1:
+                raise DatabaseError("connection lost")
+            return await original(requests)
+
+        service.try_acquire_many = flaky
+
+        result = asyncio.run(_with_batcher(daemon, daemon._enqueue_acquire(LockAcquisitionRequest("a", "holder"))))
+
+        assert_that(result).is_true()
+        assert_that(calls).is_length(2)
+
+    def test_orphaned_acquisition_is_released(self, tmp_path):
+        """A row acquired for a waiter that already gave up is released again."""
+        service = FakeService()
+        daemon = MutexDaemon(service, str(tmp_path / "daemon.sock"))
+
+        async def scenario():
+            future = asyncio.get_running_loop().create_future()
+            pending = _PendingAcquire(key="a", holder="holder", deadline=float("inf"), future=future)
+            original = service.try_acquire_many
+
+            async def cancel_then_acquire(requests):
+                future.cancel()
+                return await original(requests)
+
+            service.try_acquire_many = cancel_then_acquire
+            await daemon._settle([pending])
+
+        asyncio.run(scenario())
+
+        assert_that(service.released).is_equal_to([LockReleaseRequest("a", "holder")])
+
+    def test_disconnected_client_lock_is_released(self, tmp_path):
+        """A client hanging up while its acquisition is in flight does not keep the lock."""
+        service = FakeService()
+        socket_path = str(tmp_path / "daemon.sock")
+        daemon = MutexDaemon(service, socket_path)
+
+        async def scenario():
+            inserting = asyncio.Event()
+            proceed = asyncio.Event()
+            original = service.try_acquire_many
+
+            async def gated(requests):
+                inserting.set()
+                await proceed.wait()
+                return await original(requests)
+
+            service.try_acquire_many = gated
+            server = await asyncio.start_unix_server(daemon._handle_client, path=socket_path)
+            async with server:
+                _, writer = await asyncio.open_unix_connection(socket_path)
+                writer.write(b'{"operation": "acquire", "key": "a", "holder": "holder"}\n')
+                await writer.drain()
+                await inserting.wait()
+                writer.close()
+                await writer.wait_closed()
+                # Give the daemon a chance to notice the hang up before the insert returns
+                await asyncio.sleep(0.05)
+                proceed.set()
+                await asyncio.sleep(0.05)
+
+        asyncio.run(_with_batcher(daemon, scenario()))
+
+        assert_that(service.batches).is_equal_to([[("a", "holder")]])
+        assert_that(service.released).is_equal_to([LockReleaseRequest("a", "holder")])
+
+
+class TestSendRequest:
+    """Test cases for the daemon client."""
+
+    def test_unreachable_socket_returns_none(self, tmp_path):
+        """No daemon listening means the caller falls back to the database."""
+        result = asyncio.run(send_request(str(tmp_path / "missing.sock"), {"operation": "acquire"}))
+
+        assert_that(result).is_none()
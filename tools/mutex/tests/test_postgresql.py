@@ -0,0 +1,84 @@
+import asyncio
+from contextlib import asynccontextmanager
+
+from assertpy import assert_that
+
+from mutex.database.models import DatabaseConfig
+from mutex.database.postgresql import PostgreSQLDatabase
+from mutex.database.statement import Statement, StatementBuilder
+
+
+class FakeConnection:
+    """Stand-in for an asyncpg connection returning a fixed number of rows."""
+
+    def __init__(self, rows: int = 0):
+        self.rows = rows
+        self.fetched = []
+        self.batched = []
+
+    async def fetch(self, query, *args):
+        self.fetched.append((query, args))
+        return [(1,)] * self.rows
+
+    async def executemany(self, query, args_list):
+        self.batched.append((query, args_list))
+
+
+class FakePool:
+    def __init__(self, connection: FakeConnection):
+        self.connection = connection
+
+    @asynccontextmanager
+    async def acquire(self):
+        yield self.connection
+
+
+def _database(connection: FakeConnection) -> PostgreSQLDatabase:
+    database = PostgreSQLDatabase(DatabaseConfig(connection_uri="postgresql://localhost/test"))
+    database._pool = FakePool(connection)
+    database._is_connected = True
+    return database
+
+
+class TestPostgreSQLDatabase:
+    """Test cases for the row counts reported by PostgreSQLDatabase."""
+
+    def test_batched_insert_uses_executemany(self):
+        """A statement carrying args_list is sent once with every row bound."""
+        connection = FakeConnection()
+        statement = StatementBuilder.insert_many("locks", [{"key": "a", "holder": "x"}, {"key": "b", "holder": "y"}])
+
+        inserted = asyncio.run(_database(connection).insert_many(statement))
+
+        assert_that(inserted).is_equal_to(2)
+        assert_that(connection.batched).is_equal_to(
+            [("INSERT INTO locks (key, holder) VALUES ($1, $2)", [("a", "x"), ("b", "y")])]
+        )
+        assert_that(connection.fetched).is_empty()
+
+    def test_delete_many_counts_returned_rows(self):
+        """Affected rows are counted from RETURNING instead of the command status."""
+        connection = FakeConnection(rows=3)
+        statement = StatementBuilder.delete("locks", where={"holder": "x"})
+
+        deleted = asyncio.run(_database(connection).delete_many(statement))
+
+        assert_that(deleted).is_equal_to(3)
+        assert_that(connection.fetched[0][0]).is_equal_to("DELETE FROM locks WHERE holder = $1 RETURNING 1")
+
+    def test_insert_one_reports_conflicts(self):
+        """An insert skipped by ON CONFLICT returns no row and is reported as not inserted."""
+        connection = FakeConnection(rows=0)
+        statement = StatementBuilder.insert_on_conflict_do_nothing("locks", {"key": "a", "holder": "x"}, "key")
+
+        inserted = asyncio.run(_database(connection).insert_one(statement))
+
+        assert_that(inserted).is_false()
+
+    def test_single_record_rejects_batched_arguments(self):
+        """Single-record operations refuse a statement carrying args_list."""
+        statement = Statement("DELETE FROM locks WHERE key = $1", args_list=[("a",), ("b",)])
+
+        database = _database(FakeConnection())
+
+        assert_that(asyncio.run).raises(ValueError).when_called_with(database.delete_one(statement))
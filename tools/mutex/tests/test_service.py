@@ -0,0 +1,52 @@
+import asyncio
+from typing import List
+
+from assertpy import assert_that
+
+from mutex.database.models import LockAcquisitionRequest
+from mutex.service import MutexService
+
+
+class FakeDatabase:
+    """Stand-in for a Database whose inserts succeed after a number of conflicts."""
+
+    def __init__(self, conflicts: int = 0):
+        self.conflicts = conflicts
+        self.listened: List[str] = []
+
+    async def listen(self, channel, callback) -> None:
+        self.listened.append(channel)
+
+    async def insert_one(self, statement) -> bool:
+        if self.conflicts:
+            self.conflicts -= 1
+            return False
+        return True
+
+    async def fetch_one(self, statement):
+        return {"holder": "other", "created_at": None}
+
+
+class TestMutexService:
+    """Test cases for MutexService acquisition."""
+
+    def test_uncontended_acquire_does_not_listen(self):
+        """The LISTEN connection is only opened once an insert conflicts."""
+        database = FakeDatabase()
+        service = MutexService(database)
+
+        result = asyncio.run(service.acquire(LockAcquisitionRequest("a", "holder")))
+
+        assert_that(result).is_true()
+        assert_that(database.listened).is_empty()
+
+    def test_contended_acquire_listens_once(self):
+        """A contended acquisition subscribes to releases a single time."""
+        database = FakeDatabase(conflicts=3)
+        service = MutexService(database)
+        service._listen_poll_interval = 0.001
+
+        result = asyncio.run(service.acquire(LockAcquisitionRequest("a", "holder")))
+
+        assert_that(result).is_true()
+        assert_that(database.listened).is_equal_to(["mutex_released"])
@@ -78,6 +78,7 @@ def __get_wheel_builder(
         wheel_directory=wheel_directory,
         metadata_directory=metadata_directory,
         config_settings=config_settings,
+        pyproject=pyproject,
     )
     if poexy.wheel.format is not None:
         wheel_format = list(poexy.wheel.format)
@@ -101,8 +102,11 @@ def __get_binary_builder(
     wheel_directory: str | None = None,
     metadata_directory: str | None = None,
     config_settings: dict[str, Any] | None = None,
+    pyproject: PyProjectTOML | None = None,
 ) -> BinaryBuilder:
-    pyproject = PyProjectTOML(path=Path.cwd())
+    # Reuse the caller's project when given, it already parsed the file and built Poetry
+    if pyproject is None:
+        pyproject = PyProjectTOML(path=Path.cwd())
     poexy = pyproject.poexy
     poetry = pyproject.poetry
     if metadata_directory is not None:
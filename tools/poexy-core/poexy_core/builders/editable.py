@@ -60,10 +60,9 @@ class EditableBuilder(WheelBuilder):
         source = self.poexy.package.source.resolve().as_posix()
         source_path = self._metadata.root_folder / f"{package_name}.pth"
         logger.info(f"Adding pth file: {source_path}")
-        with open(source_path, "w", encoding="utf-8") as f:
-            logger.info(f"With content: {source}")
-            f.write(source)
-        self._add_files_to_archive(source_path, source_path)
+        logger.info(f"With content: {source}")
+        # Written straight into the archive, the file is never needed on disk
+        self._add_bytes_to_archive((source + "\n").encode("utf-8"), source_path)
 
     @override
     @contextmanager
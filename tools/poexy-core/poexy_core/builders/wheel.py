@@ -190,6 +190,13 @@ class WheelBuilder(Builder):
         logger.info(f"Adding: {relative_path}")
         self.__archive.write(source, relative_path)
 
+    def _add_bytes_to_archive(self, data: bytes, destination: Path):
+        if self.__archive is None:
+            raise ValueError("Archive not created")
+        relative_path = destination.relative_to(self._metadata.root_folder)
+        logger.info(f"Adding: {relative_path}")
+        self.__archive.writestr(relative_path.as_posix(), data)
+
     def _add_dist_info_files_to_archive(self):
         if self.__archive is None:
             raise ValueError("Archive not created")
@@ -1,6 +1,9 @@
 import csv
 import hashlib
 import logging
+import mmap
+import os
+import stat
 from pathlib import Path
 from typing import Callable, List, Optional
 
@@ -96,6 +99,17 @@ class PackageInfoManifest(Manifest):
         super().__init__(path / "PKG-INFO")
 
 
+def _sha256_file(path: Path) -> str:
+    with open(path, "rb") as file:
+        if hasattr(hashlib, "file_digest"):
+            return hashlib.file_digest(file, "sha256").hexdigest()
+        digest = hashlib.sha256()
+        if os.fstat(file.fileno()).st_size > 0:
+            with mmap.mmap(file.fileno(), 0, access=mmap.ACCESS_READ) as mapped:
+                digest.update(mapped)
+        return digest.hexdigest()
+
+
 class Record:
     def __init__(self, path: Path, sha: Optional[str], size: Optional[int]):
         self.path = path
@@ -107,14 +121,17 @@ class Record:
 
     @staticmethod
     def from_path(path: Path) -> "Record":
-        if not path.is_file():
+        # A single stat answers both the existence and the size
+        try:
+            path_stat = os.stat(path)
+        except FileNotFoundError:
+            raise FileNotFoundError(f"{path} does not exist") from None
+        if not stat.S_ISREG(path_stat.st_mode):
             raise FileNotFoundError(f"{path} is not a file")
-        if not path.exists():
-            raise FileNotFoundError(f"{path} does not exist")
         return Record(
             path,
-            f"sha256={hashlib.sha256(path.read_bytes()).hexdigest()}",
-            path.stat().st_size,
+            f"sha256={_sha256_file(path)}",
+            path_stat.st_size,
         )
 
     @staticmethod
@@ -84,9 +84,7 @@ class PyinstallerBuilder:
 
     def __build(self, arguments: PyInstallerArgumentBuilder) -> None:
         command = ["pyinstaller", *arguments.build()]
-        exit_code = subprocess_rt.run(
-            command, printer=logger.info, cwd=self.__project_path
-        )
+        exit_code = subprocess_rt.run_logged(command, logger, cwd=self.__project_path)
         if exit_code != 0:
             raise PyinstallerBuilderError("Failed to build executable")
 
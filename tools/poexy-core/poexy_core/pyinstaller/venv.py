@@ -3,18 +3,15 @@ import os
 import site
 from contextlib import contextmanager
 from pathlib import Path
-from typing import Generator, List
-
-from poetry.core.packages.dependency import Dependency
-from poetry.core.packages.directory_dependency import DirectoryDependency
-from poetry.core.packages.file_dependency import FileDependency
-from poetry.core.packages.url_dependency import URLDependency
-from poetry.core.packages.vcs_dependency import VCSDependency
+from typing import TYPE_CHECKING, Generator, List
 
 from poexy_core.pyproject.toml import DependencyMap
-from poexy_core.utils.pip import UvInstallOptions
+from poexy_core.utils.pip import DEFAULT_UV_CACHE, UvInstallOptions
 from poexy_core.utils.venv import VirtualEnvironment, VirtualEnvironmentError
 
+if TYPE_CHECKING:
+    from poetry.core.packages.directory_dependency import DirectoryDependency
+
 logger = logging.getLogger(__name__)
 
 
@@ -56,7 +53,13 @@ class PyinstallerVirtualEnvironment(VirtualEnvironment):
 
     def install_dependencies(
         self, dependencies: DependencyMap
-    ) -> List[DirectoryDependency]:
+    ) -> List["DirectoryDependency"]:
+        from poetry.core.packages.dependency import Dependency
+        from poetry.core.packages.directory_dependency import DirectoryDependency
+        from poetry.core.packages.file_dependency import FileDependency
+        from poetry.core.packages.url_dependency import URLDependency
+        from poetry.core.packages.vcs_dependency import VCSDependency
+
         if not self.pip_path.exists():
             raise VirtualEnvironmentError(f"Pip not found in venv: {self.pip_path}")
 
@@ -69,54 +72,33 @@ class PyinstallerVirtualEnvironment(VirtualEnvironment):
         requirements = []
         directory_dependencies = []
         for _, deps in dependencies.items():
-            dependency_types = [dependency.__class__.__name__ for dependency in deps]
-            if Dependency.__name__ in dependency_types:
-                dependency: Dependency = next(
-                    filter(
-                        lambda dependency: isinstance(dependency, Dependency),
-                        deps,
-                    )
-                )
+            # Alternatives of the same package keyed by exact type, first one wins
+            alternatives = {}
+            for dependency in deps:
+                alternatives.setdefault(type(dependency), dependency)
+
+            if Dependency in alternatives:
+                dependency: Dependency = alternatives[Dependency]
                 if dependency.source_type is not None:
                     raise VirtualEnvironmentError(
                         f"Expected a public dependency, got '{dependency.source_type}'"
                     )
                 requirements.append(dependency.to_pep_508())
-            elif URLDependency.__name__ in dependency_types:
-                dependency: URLDependency = next(
-                    filter(
-                        lambda dependency: isinstance(dependency, URLDependency),
-                        deps,
-                    )
-                )
+            elif URLDependency in alternatives:
+                dependency: URLDependency = alternatives[URLDependency]
                 if dependency.source_type != "url":
                     raise VirtualEnvironmentError("Expected an url dependency")
                 requirements.append(dependency.source_url)
-            elif VCSDependency.__name__ in dependency_types:
-                dependency: VCSDependency = next(
-                    filter(
-                        lambda dependency: isinstance(dependency, VCSDependency),
-                        deps,
-                    )
-                )
+            elif VCSDependency in alternatives:
+                dependency: VCSDependency = alternatives[VCSDependency]
                 requirements.append(dependency.to_pep_508())
-            elif FileDependency.__name__ in dependency_types:
-                dependency: FileDependency = next(
-                    filter(
-                        lambda dependency: isinstance(dependency, FileDependency),
-                        deps,
-                    )
-                )
+            elif FileDependency in alternatives:
+                dependency: FileDependency = alternatives[FileDependency]
                 if dependency.source_type != "file":
                     raise VirtualEnvironmentError("Expected a file dependency")
                 requirements.append(dependency.full_path.as_posix())
-            elif DirectoryDependency.__name__ in dependency_types:
-                dependency: DirectoryDependency = next(
-                    filter(
-                        lambda dependency: isinstance(dependency, DirectoryDependency),
-                        deps,
-                    )
-                )
+            elif DirectoryDependency in alternatives:
+                dependency: DirectoryDependency = alternatives[DirectoryDependency]
                 if dependency.source_type != "directory":
                     raise VirtualEnvironmentError(
                         "Expected a directory dependency pointing to a directory"
@@ -131,6 +113,7 @@ class PyinstallerVirtualEnvironment(VirtualEnvironment):
         install_options.reinstall(True)
         install_options.verbose(True)
         install_options.no_config(True)
+        install_options.cache_dir(DEFAULT_UV_CACHE)
 
         exit_code = self._pip.install(requirements, install_options)
 
@@ -1,14 +1,11 @@
+from __future__ import annotations
+
+from collections import defaultdict
+from functools import cached_property
 from pathlib import Path
-from typing import Any, Dict, List, Optional, override
+from typing import TYPE_CHECKING, Any, Dict, List
 
-from poetry.core.factory import Factory
-from poetry.core.packages.dependency import Dependency
-from poetry.core.packages.directory_dependency import DirectoryDependency
-from poetry.core.packages.file_dependency import FileDependency
-from poetry.core.poetry import Poetry
-from poetry.core.pyproject.tables import BuildSystem
-from poetry.core.pyproject.toml import PyProjectTOML as PoetryPyProjectTOML
-from pydantic import BaseModel, Field, field_validator
+from pydantic import BaseModel, ConfigDict, Field, field_validator
 
 from poexy_core.pyproject.exceptions import PyProjectError
 from poexy_core.pyproject.tables.license import License
@@ -16,21 +13,18 @@ from poexy_core.pyproject.tables.package import BinaryPackage, ModulePackage
 from poexy_core.pyproject.tables.poexy import Poexy
 from poexy_core.pyproject.tables.readme import Readme
 
-# pylint: disable=attribute-defined-outside-init
+if TYPE_CHECKING:
+    from poetry.core.packages.dependency import Dependency
+    from poetry.core.poetry import Poetry
+    from poetry.core.pyproject.tables import BuildSystem
 
-DependencyMap = Dict[str, List[Dependency]]
+DependencyMap = Dict[str, List["Dependency"]]
 
 
 class PyProjectTOML(BaseModel):
-    path: Path = Field(description="Path to the pyproject.toml file")
+    model_config = ConfigDict(ignored_types=(cached_property,))
 
-    @override
-    def model_post_init(self, __context: Any, /) -> None:
-        self.__data: Dict[str, Any] = PoetryPyProjectTOML(self.path).data
-        self.__build_system: Optional[BuildSystem] = None
-        self.__poetry: Optional[Poetry] = None
-        self.__poexy: Optional[Poexy] = None
-        self.__dependencies: Optional[Dict[str, List[Dependency]]] = None
+    path: Path = Field(description="Path to the pyproject.toml file")
 
     @field_validator("path")
     @classmethod
@@ -43,6 +37,9 @@ class PyProjectTOML(BaseModel):
         return path
 
     def validate_dependencies(self) -> None:
+        from poetry.core.packages.directory_dependency import DirectoryDependency
+        from poetry.core.packages.file_dependency import FileDependency
+
         dependencies = self.dependencies
         for key, values in dependencies.items():
             dependency_types = [dependency.__class__.__name__ for dependency in values]
@@ -73,76 +70,74 @@ class PyProjectTOML(BaseModel):
 
     @staticmethod
     def dependencies_from_poetry(poetry: Poetry) -> DependencyMap:
-        dependencies = poetry.package.requires
-        dependencies_map: DependencyMap = {}
-        for dependency in dependencies:
-            if dependency.name in dependencies_map:
-                dependencies_map[dependency.name].append(dependency)
-            else:
-                dependencies_map[dependency.name] = [dependency]
-        return dependencies_map
-
-    @property
+        dependencies_map: DependencyMap = defaultdict(list)
+        for dependency in poetry.package.requires:
+            dependencies_map[dependency.name].append(dependency)
+        return dict(dependencies_map)
+
+    @cached_property
+    def _data(self) -> Dict[str, Any]:
+        # poetry.core is imported on first use, most commands never parse the project
+        from poetry.core.pyproject.toml import PyProjectTOML as PoetryPyProjectTOML
+
+        return PoetryPyProjectTOML(self.path).data
+
+    @cached_property
     def dependencies(self) -> DependencyMap:
-        if self.__dependencies is None:
-            self.__dependencies = self.dependencies_from_poetry(self.poetry)
-        return self.__dependencies
+        return self.dependencies_from_poetry(self.poetry)
 
-    @property
+    @cached_property
     def build_system(self) -> BuildSystem:
-        if self.__build_system is None:
-            poetry = self.poetry
-            pyproject = poetry.pyproject
-            package = poetry.package
-            # TODO better way to retrieve package name?
-            if package.name == "poexy-core":
-                dependencies = package.requires
-            else:
-                dependencies = poetry.build_system_dependencies
-            container = pyproject.build_system
-            self.__build_system = BuildSystem(
-                build_backend=container.build_backend,
-                requires=[dependency.to_pep_508() for dependency in dependencies],
-            )
-
-        return self.__build_system
-
-    @property
+        from poetry.core.pyproject.tables import BuildSystem
+
+        poetry = self.poetry
+        pyproject = poetry.pyproject
+        package = poetry.package
+        # TODO better way to retrieve package name?
+        if package.name == "poexy-core":
+            dependencies = package.requires
+        else:
+            dependencies = poetry.build_system_dependencies
+        container = pyproject.build_system
+        return BuildSystem(
+            build_backend=container.build_backend,
+            requires=[dependency.to_pep_508() for dependency in dependencies],
+        )
+
+    @cached_property
     def poetry(self) -> Poetry:
-        if self.__poetry is None:
-            self.__poetry = Factory().create_poetry(self.path)
-        return self.__poetry
+        from poetry.core.factory import Factory
+
+        return Factory().create_poetry(self.path)
 
-    @property
+    @cached_property
     def poexy(self) -> Poexy:
-        if self.__poexy is None:
-            tool = self.__data.get("tool", None)
-            if tool is None:
-                tool = {}
+        tool = self._data.get("tool", None)
+        if tool is None:
+            tool = {}
 
-            assert isinstance(tool, dict)
+        assert isinstance(tool, dict)
 
-            poexy_config = tool.get("poexy", None)
+        poexy_config = tool.get("poexy", None)
 
-            if poexy_config is None:
-                poexy_config = {}
+        if poexy_config is None:
+            poexy_config = {}
 
-            package_config = poexy_config.get("package", None)
+        package_config = poexy_config.get("package", None)
 
-            if package_config is None:
-                poexy_config.update(ModulePackage.from_project_config(self.__data))
-            else:
-                poexy_config.update(ModulePackage.from_poexy_config(poexy_config))
+        if package_config is None:
+            poexy_config.update(ModulePackage.from_project_config(self._data))
+        else:
+            poexy_config.update(ModulePackage.from_poexy_config(poexy_config))
 
-            binary_config = poexy_config.get("binary", None)
+        binary_config = poexy_config.get("binary", None)
 
-            if binary_config is None:
-                poexy_config.update(BinaryPackage.from_project_config(self.__data))
-            else:
-                poexy_config.update(BinaryPackage.from_poexy_config(poexy_config))
+        if binary_config is None:
+            poexy_config.update(BinaryPackage.from_project_config(self._data))
+        else:
+            poexy_config.update(BinaryPackage.from_poexy_config(poexy_config))
 
-            readme = Readme.from_project_config(self.__data)
-            _license = License.from_project_config(self.__data)
+        readme = Readme.from_project_config(self._data)
+        _license = License.from_project_config(self._data)
 
-            self.__poexy = Poexy(license=_license, readme=readme, **poexy_config)
-        return self.__poexy
+        return Poexy(license=_license, readme=readme, **poexy_config)
@@ -1,28 +1,47 @@
+import hashlib
 import logging
+import os
+import shutil
+import tempfile
 from pathlib import Path
-from typing import List, Union
+from typing import List, Optional, Self, Union
 
 from poexy_core.utils import subprocess_rt
-from poexy_core.utils.pip import UvOptions
+from poexy_core.utils.pip import (
+    NoBuildIsolationOption,
+    PythonInterpreterOption,
+    UvOptions,
+    cached_defaults,
+)
 
 logger = logging.getLogger(__name__)
 
+# Artifacts are cached by source tree content only when this is set, the build
+# backend itself is not part of the key
+BUILD_CACHE_PATH = os.environ.get("POEXY_BUILD_CACHE", None)
+
+# Folders that never hold build inputs
+_IGNORED_FOLDERS = {".git", ".venv", "__pycache__", "build", "dist"}
+
 
 class BuildError(Exception):
     pass
 
 
-class BuildOptions(UvOptions):
-    def __init__(self):
-        super().__init__()
-        self.__python_interpreter = None
-        self.__sdist = None
-        self.__wheel = None
-        self.__output_path = None
-        self.__force_pep517 = None
-        self.__no_build_isolation = None
+class BuildOptions(UvOptions, PythonInterpreterOption, NoBuildIsolationOption):
+    _FLAGS = UvOptions._FLAGS + (
+        ("python_interpreter", "--python"),
+        ("sdist", "--sdist"),
+        ("wheel", "--wheel"),
+        ("output_path", "--out-dir"),
+        ("force_pep517", "--force-pep517"),
+        ("no_build_isolation", "--no-build-isolation"),
+    )
+
+    __slots__ = ()
 
     @staticmethod
+    @cached_defaults
     def defaults() -> List[str]:
         default_options = UvOptions.defaults()
         options = BuildOptions()
@@ -32,63 +51,167 @@ class BuildOptions(UvOptions):
         options.no_build_isolation(True)
         return default_options + options.build()
 
-    def python_interpreter(self, python_interpreter: Path) -> "BuildOptions":
-        self.__python_interpreter = python_interpreter
-        return self
-
-    def sdist(self, sdist: bool) -> "BuildOptions":
-        self.__sdist = sdist
-        return self
-
-    def wheel(self, wheel: bool) -> "BuildOptions":
-        self.__wheel = wheel
-        return self
-
-    def output_path(self, output_path: Path) -> "BuildOptions":
-        self.__output_path = output_path
-        return self
-
-    def force_pep517(self, force_pep517: bool) -> "BuildOptions":
-        self.__force_pep517 = force_pep517
-        return self
-
-    def no_build_isolation(self, no_build_isolation: bool) -> "BuildOptions":
-        self.__no_build_isolation = no_build_isolation
-        return self
-
-    def build(self) -> List[str]:
-        options = super().build()
-        if self.__python_interpreter is not None:
-            options.append("--python")
-            options.append(str(self.__python_interpreter))
-        if self.__sdist is not None and self.__sdist:
-            options.append("--sdist")
-        if self.__wheel is not None and self.__wheel:
-            options.append("--wheel")
-        if self.__output_path is not None:
-            options.append("--out-dir")
-            options.append(str(self.__output_path))
-        if self.__force_pep517 is not None and self.__force_pep517:
-            options.append("--force-pep517")
-        if self.__no_build_isolation is not None and self.__no_build_isolation:
-            options.append("--no-build-isolation")
-        return options
+    def sdist(self, sdist: bool) -> Self:
+        return self._set("sdist", sdist)
+
+    def wheel(self, wheel: bool) -> Self:
+        return self._set("wheel", wheel)
+
+    def output_path(self, output_path: Path) -> Self:
+        return self._set("output_path", str(output_path))
+
+    def force_pep517(self, force_pep517: bool) -> Self:
+        return self._set("force_pep517", force_pep517)
+
+    def get_output_path(self) -> Optional[Path]:
+        output_path = self._options.get("output_path")
+        return None if output_path is None else Path(output_path)
+
+    def get_python_interpreter(self) -> Optional[Path]:
+        python_interpreter = self._options.get("python_interpreter")
+        return None if python_interpreter is None else Path(python_interpreter)
+
+
+def _interpreter_identity(python_path: Path) -> str:
+    # Build venvs live in fresh temporary folders, their path would never hit the
+    # cache. The base interpreter recorded in pyvenv.cfg is stable across them.
+    config_path = python_path.parent.parent / "pyvenv.cfg"
+    try:
+        lines = config_path.read_text(encoding="utf-8").splitlines()
+    except OSError:
+        return os.path.realpath(python_path)
+    fields = {}
+    for line in lines:
+        name, separator, value = line.partition("=")
+        if separator:
+            fields[name.strip()] = value.strip()
+    if "home" not in fields:
+        return os.path.realpath(python_path)
+    return "\0".join(
+        fields.get(name, "")
+        for name in ("implementation", "version_info", "version", "home")
+    )
+
+
+class BuildCache:
+    def __init__(self, path: Path):
+        self.__path = path
+
+    @staticmethod
+    def key(source_path: Path, arguments: List[str]) -> str:
+        digest = hashlib.sha256()
+        for argument in arguments:
+            digest.update(argument.encode("utf-8"))
+            digest.update(b"\0")
+        for root, folders, files in os.walk(source_path):
+            folders[:] = sorted(f for f in folders if f not in _IGNORED_FOLDERS)
+            for file in sorted(files):
+                path = Path(root) / file
+                stat = path.stat()
+                relative_path = path.relative_to(source_path).as_posix()
+                digest.update(
+                    f"{relative_path}\0{stat.st_mtime_ns}\0{stat.st_size}\0".encode(
+                        "utf-8"
+                    )
+                )
+        return digest.hexdigest()
+
+    @staticmethod
+    def __link(source: Path, destination: Path) -> None:
+        destination.unlink(missing_ok=True)
+        try:
+            os.link(source, destination)
+        except OSError:
+            shutil.copy2(source, destination)
+
+    def restore(self, key: str, output_path: Path) -> bool:
+        entry_path = self.__path / key
+        if not entry_path.is_dir():
+            return False
+        output_path.mkdir(parents=True, exist_ok=True)
+        for artifact in entry_path.iterdir():
+            logger.info(f"Restoring cached artifact: {artifact.name}")
+            self.__link(artifact, output_path / artifact.name)
+        return True
+
+    def store(self, key: str, artifacts: List[Path]) -> None:
+        entry_path = self.__path / key
+        if entry_path.exists() or len(artifacts) == 0:
+            return
+        self.__path.mkdir(parents=True, exist_ok=True)
+        # Populated aside then renamed, a concurrent build never sees a partial entry
+        staging_path = Path(tempfile.mkdtemp(dir=self.__path))
+        for artifact in artifacts:
+            self.__link(artifact, staging_path / artifact.name)
+        try:
+            staging_path.rename(entry_path)
+        except OSError:
+            shutil.rmtree(staging_path, ignore_errors=True)
 
 
 class UvBuild:
-    def __init__(self, binary_path: Path):
+    def __init__(self, binary_path: Path, cache_path: Optional[Path] = None):
         self.__base_command = [str(binary_path), "build"]
+        if cache_path is None and BUILD_CACHE_PATH is not None:
+            cache_path = Path(BUILD_CACHE_PATH)
+        self.__cache = None if cache_path is None else BuildCache(cache_path)
 
-    def build(self, source_path: Path, options: Union[BuildOptions, List[str]]) -> int:
+    @staticmethod
+    def __arguments(options: Union[BuildOptions, List[str]]) -> List[str]:
         if isinstance(options, BuildOptions):
-            options = options.build()
-        elif not isinstance(options, list):
+            return options.build()
+        if not isinstance(options, list):
             raise BuildError(
                 f"Invalid arguments type: {type(options)}. "
                 f"Expected: {type(BuildOptions)} or {type(List[str])}"
             )
-        cmd = [*self.__base_command, *options, str(source_path)]
-        exit_code = subprocess_rt.run(cmd, printer=logger.info)
+        return options
+
+    @staticmethod
+    def __key_arguments(cmd: List[str], options: BuildOptions) -> List[str]:
+        # The uv binary and output folder do not change the artifacts, and the
+        # interpreter is keyed on what it is rather than where its venv lives
+        output_path = str(options.get_output_path())
+        python_interpreter = options.get_python_interpreter()
+        key_arguments = []
+        for argument in cmd[1:]:
+            if argument == output_path:
+                continue
+            if python_interpreter is not None and argument == str(python_interpreter):
+                argument = _interpreter_identity(python_interpreter)
+            key_arguments.append(argument)
+        return key_arguments
+
+    def build(self, source_path: Path, options: Union[BuildOptions, List[str]]) -> int:
+        arguments = self.__arguments(options)
+        cmd = [*self.__base_command, *arguments, str(source_path)]
+
+        # Only builds with a known output folder can be served from the cache
+        output_path = None
+        if self.__cache is not None and isinstance(options, BuildOptions):
+            output_path = options.get_output_path()
+
+        if output_path is None:
+            exit_code = subprocess_rt.run_logged(cmd, logger)
+            if exit_code != 0:
+                raise BuildError(f"Failed to build: {cmd}")
+            return exit_code
+
+        assert self.__cache is not None
+        key = self.__cache.key(source_path, self.__key_arguments(cmd, options))
+        if self.__cache.restore(key, output_path):
+            return 0
+
+        existing_artifacts = (
+            set(output_path.iterdir()) if output_path.exists() else set()
+        )
+        exit_code = subprocess_rt.run_logged(cmd, logger)
         if exit_code != 0:
             raise BuildError(f"Failed to build: {cmd}")
+        artifacts = [
+            artifact
+            for artifact in output_path.iterdir()
+            if artifact.is_file() and artifact not in existing_artifacts
+        ]
+        self.__cache.store(key, artifacts)
         return exit_code
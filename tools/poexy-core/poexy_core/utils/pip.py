@@ -1,9 +1,36 @@
+import logging
+import os
+import sys
 from enum import Enum
+from functools import cache, wraps
 from pathlib import Path
-from typing import List, Union, override
+from typing import Any, Callable, Dict, List, Self, Tuple, Union, override
 
 from poexy_core.utils import subprocess_rt
 
+logger = logging.getLogger(__name__)
+
+# One cache shared by every uv invocation, so repeated builds start warm
+DEFAULT_UV_CACHE = Path(
+    os.environ.get("POEXY_UV_CACHE", Path.home() / ".cache" / "poexy" / "uv")
+)
+
+# Same for the pip fallback, --isolated makes pip ignore PIP_CACHE_DIR
+DEFAULT_PIP_CACHE = Path(
+    os.environ.get("POEXY_PIP_CACHE", Path.home() / ".cache" / "poexy" / "pip")
+)
+
+
+def cached_defaults(defaults: Callable[[], List[str]]) -> Callable[[], List[str]]:
+    """Build default options once, each caller gets its own copy to extend"""
+    frozen = cache(lambda: tuple(defaults()))
+
+    @wraps(defaults)
+    def wrapper() -> List[str]:
+        return list(frozen())
+
+    return wrapper
+
 
 class UvLinkMode(Enum):
     Clone = "clone"
@@ -17,196 +44,201 @@ class PipError(Exception):
 
 
 class PackageInstallerProgramOptions:
+    # Option names and their command line flags, in the order they are emitted.
+    # True emits the flag alone, any other value is passed after the flag.
+    # Path setters store the string form once, build() then reuses it as is.
+    _FLAGS: Tuple[Tuple[str, str], ...] = ()
+
+    __slots__ = ("_options",)
+
+    def __init__(self):
+        self._options: Dict[str, Any] = {}
+
     @staticmethod
     def defaults() -> List[str]:
         raise NotImplementedError
 
+    def _set(self, name: str, value: Any) -> Self:
+        self._options[name] = value
+        return self
+
     def build(self) -> List[str]:
-        raise NotImplementedError
+        # One comprehension over the table, no per-flag append calls
+        get = self._options.get
+        return [
+            part
+            for name, flag in self._FLAGS
+            if (value := get(name)) is not None and value is not False
+            for part in ((flag,) if value is True else (flag, str(value)))
+        ]
 
 
-class UvOptions(PackageInstallerProgramOptions):
-    def __init__(self):
-        self.__verbose = None
-        self.__offline = None
-        self.__no_config = None
-        self.__cache_dir = None
+# Setters shared by several option classes, each class lists the flags in _FLAGS
+
+
+class VerboseOption(PackageInstallerProgramOptions):
+    __slots__ = ()
+
+    def verbose(self, verbose: bool) -> Self:
+        return self._set("verbose", verbose)
+
+
+class CacheDirOption(PackageInstallerProgramOptions):
+    __slots__ = ()
+
+    def cache_dir(self, cache_dir: Path) -> Self:
+        return self._set("cache_dir", str(cache_dir))
+
+
+class PythonInterpreterOption(PackageInstallerProgramOptions):
+    __slots__ = ()
+
+    def python_interpreter(self, python_interpreter: Path) -> Self:
+        return self._set("python_interpreter", str(python_interpreter))
+
+
+class PrefixOption(PackageInstallerProgramOptions):
+    __slots__ = ()
+
+    def prefix(self, prefix: Path) -> Self:
+        return self._set("prefix", str(prefix))
+
+
+class NoBuildIsolationOption(PackageInstallerProgramOptions):
+    __slots__ = ()
+
+    def no_build_isolation(self, no_build_isolation: bool) -> Self:
+        return self._set("no_build_isolation", no_build_isolation)
+
+
+class PipBuildOption(PackageInstallerProgramOptions):
+    __slots__ = ()
+
+    def check_build_dependencies(self, check_build_dependencies: bool) -> Self:
+        return self._set("check_build_dependencies", check_build_dependencies)
+
+    def no_clean(self, no_clean: bool) -> Self:
+        return self._set("no_clean", no_clean)
+
+
+class UvOptions(VerboseOption, CacheDirOption):
+    _FLAGS = (
+        ("verbose", "--verbose"),
+        ("offline", "--offline"),
+        ("no_config", "--no-config"),
+        ("cache_dir", "--cache-dir"),
+    )
+
+    __slots__ = ()
 
     @staticmethod
     @override
+    @cached_defaults
     def defaults() -> List[str]:
         options = UvOptions()
         options.verbose(True)
         options.no_config(True)
+        options.cache_dir(DEFAULT_UV_CACHE)
         return options.build()
 
-    def verbose(self, verbose: bool) -> "UvOptions":
-        self.__verbose = verbose
-        return self
+    def offline(self, offline: bool) -> Self:
+        return self._set("offline", offline)
 
-    def offline(self, offline: bool) -> "UvOptions":
-        self.__offline = offline
-        return self
+    def no_config(self, no_config: bool) -> Self:
+        return self._set("no_config", no_config)
 
-    def no_config(self, no_config: bool) -> "UvOptions":
-        self.__no_config = no_config
-        return self
 
-    def cache_dir(self, cache_dir: Path) -> "UvOptions":
-        self.__cache_dir = cache_dir
-        return self
+class UvInstallOptions(
+    UvOptions, PythonInterpreterOption, PrefixOption, NoBuildIsolationOption
+):
+    _FLAGS = UvOptions._FLAGS + (
+        ("python_interpreter", "--python"),
+        ("prefix", "--prefix"),
+        ("strict", "--strict"),
+        ("dry_run", "--dry-run"),
+        ("link_mode", "--link-mode"),
+        ("reinstall", "--reinstall"),
+        ("no_build_isolation", "--no-build-isolation"),
+    )
 
-    @override
-    def build(self) -> List[str]:
-        options = []
-        if self.__verbose is not None and self.__verbose:
-            options.append("--verbose")
-        if self.__offline is not None and self.__offline:
-            options.append("--offline")
-        if self.__no_config is not None and self.__no_config:
-            options.append("--no-config")
-        if self.__cache_dir is not None:
-            options.append("--cache-dir")
-            options.append(str(self.__cache_dir))
-        return options
-
-
-class UvInstallOptions(UvOptions):
-    def __init__(self):
-        super().__init__()
-        self.__python_interpreter = None
-        self.__prefix = None
-        self.__strict = None
-        self.__dry_run = None
-        self.__link_mode = None
-        self.__reinstall = None
-        self.__no_build_isolation = None
+    __slots__ = ()
 
     @staticmethod
     @override
+    @cached_defaults
     def defaults() -> List[str]:
         options = UvInstallOptions()
-        options.link_mode(UvLinkMode.Symlink)
-        options.reinstall(True)
+        # Copy-on-write where reflinks are common, hardlinks elsewhere, both reuse
+        # the cached wheel bytes without leaving symlinks into the cache
+        if sys.platform == "linux":
+            options.link_mode(UvLinkMode.Clone)
+        else:
+            options.link_mode(UvLinkMode.Hardlink)
+        # Reinstalling is left to callers, forcing it would bypass the uv cache
         return UvOptions.defaults() + options.build()
 
-    def python_interpreter(self, python_interpreter: Path) -> "UvInstallOptions":
-        self.__python_interpreter = python_interpreter
-        return self
+    def strict(self, strict: bool) -> Self:
+        return self._set("strict", strict)
 
-    def prefix(self, prefix: Path) -> "UvInstallOptions":
-        self.__prefix = prefix
-        return self
+    def dry_run(self, dry_run: bool) -> Self:
+        return self._set("dry_run", dry_run)
 
-    def strict(self, strict: bool) -> "UvInstallOptions":
-        self.__strict = strict
-        return self
+    def link_mode(self, link_mode: UvLinkMode) -> Self:
+        return self._set("link_mode", link_mode.value)
 
-    def dry_run(self, dry_run: bool) -> "UvInstallOptions":
-        self.__dry_run = dry_run
-        return self
+    def reinstall(self, reinstall: bool) -> Self:
+        return self._set("reinstall", reinstall)
 
-    def link_mode(self, link_mode: UvLinkMode) -> "UvInstallOptions":
-        self.__link_mode = link_mode
-        return self
 
-    def reinstall(self, reinstall: bool) -> "UvInstallOptions":
-        self.__reinstall = reinstall
-        return self
-
-    def no_build_isolation(self, no_build_isolation: bool) -> "UvInstallOptions":
-        self.__no_build_isolation = no_build_isolation
-        return self
+class PipOptions(VerboseOption, CacheDirOption):
+    _FLAGS = (
+        ("verbose", "--verbose"),
+        ("debug", "--debug"),
+        ("require_virtualenv", "--require-virtualenv"),
+        ("isolated", "--isolated"),
+        ("cache_dir", "--cache-dir"),
+    )
 
-    @override
-    def build(self) -> List[str]:
-        options = super().build()
-        if self.__python_interpreter is not None:
-            options.append("--python")
-            options.append(str(self.__python_interpreter))
-        if self.__prefix is not None:
-            options.append("--prefix")
-            options.append(str(self.__prefix))
-        if self.__strict is not None and self.__strict:
-            options.append("--strict")
-        if self.__dry_run is not None and self.__dry_run:
-            options.append("--dry-run")
-        if self.__link_mode is not None:
-            options.append("--link-mode")
-            options.append(self.__link_mode.value)
-        if self.__reinstall is not None and self.__reinstall:
-            options.append("--reinstall")
-        if self.__no_build_isolation is not None and self.__no_build_isolation:
-            options.append("--no-build-isolation")
-        return options
-
-
-class PipOptions(PackageInstallerProgramOptions):
-    def __init__(self):
-        self.__verbose = None
-        self.__debug = None
-        self.__require_virtualenv = None
-        self.__isolated = None
-        self.__cache_dir = None
+    __slots__ = ()
 
     @staticmethod
     @override
+    @cached_defaults
     def defaults() -> List[str]:
         options = PipOptions()
         options.verbose(True)
         options.require_virtualenv(True)
         options.isolated(True)
+        options.cache_dir(DEFAULT_PIP_CACHE)
         return options.build()
 
-    def verbose(self, verbose: bool) -> "PipOptions":
-        self.__verbose = verbose
-        return self
+    def debug(self, debug: bool) -> Self:
+        return self._set("debug", debug)
 
-    def debug(self, debug: bool) -> "PipOptions":
-        self.__debug = debug
-        return self
+    def require_virtualenv(self, require_virtualenv: bool) -> Self:
+        return self._set("require_virtualenv", require_virtualenv)
 
-    def require_virtualenv(self, require_virtualenv: bool) -> "PipOptions":
-        self.__require_virtualenv = require_virtualenv
-        return self
+    def isolated(self, isolated: bool) -> Self:
+        return self._set("isolated", isolated)
 
-    def isolated(self, isolated: bool) -> "PipOptions":
-        self.__isolated = isolated
-        return self
 
-    def cache_dir(self, cache_dir: Path) -> "PipOptions":
-        self.__cache_dir = cache_dir
-        return self
+class PipInstallOptions(
+    PipOptions, PrefixOption, NoBuildIsolationOption, PipBuildOption
+):
+    _FLAGS = PipOptions._FLAGS + (
+        ("prefix", "--prefix"),
+        ("use_pep517", "--use-pep517"),
+        ("no_build_isolation", "--no-build-isolation"),
+        ("check_build_dependencies", "--check-build-dependencies"),
+        ("no_clean", "--no-clean"),
+        ("force_reinstall", "--force-reinstall"),
+    )
 
-    @override
-    def build(self) -> List[str]:
-        options = []
-        if self.__verbose is not None and self.__verbose:
-            options.append("--verbose")
-        if self.__debug is not None and self.__debug:
-            options.append("--debug")
-        if self.__require_virtualenv is not None and self.__require_virtualenv:
-            options.append("--require-virtualenv")
-        if self.__isolated is not None and self.__isolated:
-            options.append("--isolated")
-        if self.__cache_dir is not None:
-            options.append("--cache-dir")
-            options.append(str(self.__cache_dir))
-        return options
-
-
-class PipInstallOptions(PipOptions):
-    def __init__(self):
-        super().__init__()
-        self.__prefix = None
-        self.__use_pep517 = None
-        self.__no_build_isolation = None
-        self.__check_build_dependencies = None
-        self.__no_clean = None
-        self.__force_reinstall = None
+    __slots__ = ()
 
     @staticmethod
     @override
+    @cached_defaults
     def defaults() -> List[str]:
         options = PipInstallOptions()
         options.use_pep517(True)
@@ -214,96 +246,25 @@ class PipInstallOptions(PipOptions):
         options.check_build_dependencies(True)
         return PipOptions.defaults() + options.build()
 
-    def prefix(self, prefix: Path) -> "PipInstallOptions":
-        self.__prefix = prefix
-        return self
+    def use_pep517(self, use_pep517: bool) -> Self:
+        return self._set("use_pep517", use_pep517)
 
-    def use_pep517(self, use_pep517: bool) -> "PipInstallOptions":
-        self.__use_pep517 = use_pep517
-        return self
+    def force_reinstall(self, force_reinstall: bool) -> Self:
+        return self._set("force_reinstall", force_reinstall)
 
-    def no_build_isolation(self, no_build_isolation: bool) -> "PipInstallOptions":
-        self.__no_build_isolation = no_build_isolation
-        return self
 
-    def check_build_dependencies(
-        self, check_build_dependencies: bool
-    ) -> "PipInstallOptions":
-        self.__check_build_dependencies = check_build_dependencies
-        return self
+class PipWheelOptions(PipOptions, NoBuildIsolationOption, PipBuildOption):
+    _FLAGS = PipOptions._FLAGS + (
+        ("wheel_dir", "--wheel-dir"),
+        ("no_build_isolation", "--no-build-isolation"),
+        ("check_build_dependencies", "--check-build-dependencies"),
+        ("no_clean", "--no-clean"),
+    )
 
-    def no_clean(self, no_clean: bool) -> "PipInstallOptions":
-        self.__no_clean = no_clean
-        return self
+    __slots__ = ()
 
-    def force_reinstall(self, force_reinstall: bool) -> "PipInstallOptions":
-        self.__force_reinstall = force_reinstall
-        return self
-
-    @override
-    def build(self) -> List[str]:
-        options = super().build()
-        if self.__prefix is not None:
-            options.append("--prefix")
-            options.append(str(self.__prefix))
-        if self.__use_pep517 is not None and self.__use_pep517:
-            options.append("--use-pep517")
-        if self.__no_build_isolation is not None and self.__no_build_isolation:
-            options.append("--no-build-isolation")
-        if (
-            self.__check_build_dependencies is not None
-            and self.__check_build_dependencies
-        ):
-            options.append("--check-build-dependencies")
-        if self.__no_clean is not None and self.__no_clean:
-            options.append("--no-clean")
-        if self.__force_reinstall is not None and self.__force_reinstall:
-            options.append("--force-reinstall")
-        return options
-
-
-class PipWheelOptions(PipOptions):
-    def __init__(self):
-        super().__init__()
-        self.__wheel_dir = None
-        self.__no_build_isolation = None
-        self.__check_build_dependencies = None
-        self.__no_clean = None
-
-    def wheel_dir(self, wheel_dir: Path) -> "PipWheelOptions":
-        self.__wheel_dir = wheel_dir
-        return self
-
-    def no_build_isolation(self, no_build_isolation: bool) -> "PipWheelOptions":
-        self.__no_build_isolation = no_build_isolation
-        return self
-
-    def check_build_dependencies(
-        self, check_build_dependencies: bool
-    ) -> "PipWheelOptions":
-        self.__check_build_dependencies = check_build_dependencies
-        return self
-
-    def no_clean(self, no_clean: bool) -> "PipWheelOptions":
-        self.__no_clean = no_clean
-        return self
-
-    @override
-    def build(self) -> List[str]:
-        options = super().build()
-        if self.__wheel_dir is not None:
-            options.append("--wheel-dir")
-            options.append(str(self.__wheel_dir))
-        if self.__no_build_isolation is not None and self.__no_build_isolation:
-            options.append("--no-build-isolation")
-        if (
-            self.__check_build_dependencies is not None
-            and self.__check_build_dependencies
-        ):
-            options.append("--check-build-dependencies")
-        if self.__no_clean is not None and self.__no_clean:
-            options.append("--no-clean")
-        return options
+    def wheel_dir(self, wheel_dir: Path) -> Self:
+        return self._set("wheel_dir", str(wheel_dir))
 
 
 class PackageInstallerProgram:
@@ -312,7 +273,7 @@ class PackageInstallerProgram:
 
     def _execute_command(self, arguments: List[str]) -> int:
         cmd = [str(self._binary_path), *arguments]
-        exit_code = subprocess_rt.run(cmd, printer=print)
+        exit_code = subprocess_rt.run_logged(cmd, logger)
         if exit_code != 0:
             raise PipError(f"Failed to execute {self._binary_path.name} command: {cmd}")
         return exit_code
@@ -399,6 +360,8 @@ class Uv(PackageInstallerProgram):
         packages: List[str],
         arguments: Union[PackageInstallerProgramOptions, List[str]],
     ) -> int:
+        if len(packages) == 0:
+            return 0
         if isinstance(arguments, UvInstallOptions):
             arguments.python_interpreter(self.__python_path)
             arguments = arguments.build()
@@ -411,18 +374,24 @@ class Uv(PackageInstallerProgram):
                 f"Invalid arguments type: {type(arguments)}. "
                 f"Expected: {type(UvInstallOptions)} or {type(List[str])}"
             )
+        # uv does not support the git:// protocol, those packages go to the fallback
+        git_protocol = "@ git+git://"
+        packages_to_install = []
         packages_to_install_with_fallback = []
-        for index, package in enumerate(reversed(packages)):
-            if "@ git+git://" in package:
+        for package in packages:
+            if git_protocol in package:
                 packages_to_install_with_fallback.append(package)
-                packages.pop(index)
+            else:
+                packages_to_install.append(package)
         if len(packages_to_install_with_fallback) > 0:
             self.__fallback.install(
                 packages_to_install_with_fallback, PipInstallOptions.defaults()
             )
-        if len(packages) == 0:
+        if len(packages_to_install) == 0:
             return 0
-        return self._execute_command(["pip", "install", *arguments, *packages])
+        return self._execute_command(
+            ["pip", "install", *arguments, *packages_to_install]
+        )
 
     @override
     def wheel(
@@ -1,21 +1,46 @@
+import logging
+import os
+import shutil
 import subprocess
-from typing import Callable, List
+from functools import lru_cache
+from typing import Callable, List, Optional, Tuple
 
 Printer = Callable[[str], None]
 
+# CPython spawns children with posix_spawn instead of fork and exec only when the
+# executable path has a folder, close_fds is off and there is no cwd, preexec_fn,
+# pass_fds, user or group change. Keep these arguments out of the default calls,
+# descriptors opened by Python are not inheritable anyway (PEP 446).
+SPAWN_ARGUMENTS = {"shell": False, "close_fds": False}
+
+
+@lru_cache(maxsize=64)
+def _which(name: str, search_path: Optional[str]) -> Optional[str]:
+    # Keyed by PATH too, a changed PATH resolves the executable again
+    return shutil.which(name, path=search_path)
+
+
+def _spawnable(cmd: List[str]) -> List[str]:
+    if os.path.dirname(cmd[0]):
+        return cmd
+    executable = _which(cmd[0], os.environ.get("PATH"))
+    if executable is None:
+        return cmd
+    return [executable, *cmd[1:]]
+
 
 def run(cmd: List[str], printer: Printer, **kwargs) -> int:
     arguments = {
+        **SPAWN_ARGUMENTS,
         "stdout": subprocess.PIPE,
         "stderr": subprocess.STDOUT,
-        "shell": False,
         "text": True,
         "encoding": "utf-8",
     }
 
     arguments.update(kwargs)
 
-    process = subprocess.Popen(cmd, **arguments)
+    process = subprocess.Popen(_spawnable(cmd), **arguments)
 
     while True:
         if process.stdout is None:
@@ -33,3 +58,37 @@ def run(cmd: List[str], printer: Printer, **kwargs) -> int:
         raise RuntimeError("Process terminated unexpectedly")
 
     return exit_code
+
+
+def run_discarded(cmd: List[str], **kwargs) -> int:
+    # Nobody reads the output, the child writes straight to /dev/null
+    completed = subprocess.run(
+        _spawnable(cmd),
+        **{
+            **SPAWN_ARGUMENTS,
+            "stdout": subprocess.DEVNULL,
+            "stderr": subprocess.STDOUT,
+            **kwargs,
+        },
+    )
+    return completed.returncode
+
+
+def run_quiet(cmd: List[str], **kwargs) -> Tuple[int, bytes]:
+    # Output is collected whole, callers only look at it when the command failed
+    completed = subprocess.run(
+        _spawnable(cmd),
+        **{
+            **SPAWN_ARGUMENTS,
+            "stdout": subprocess.PIPE,
+            "stderr": subprocess.STDOUT,
+            **kwargs,
+        },
+    )
+    return completed.returncode, completed.stdout
+
+
+def run_logged(cmd: List[str], logger: logging.Logger, **kwargs) -> int:
+    if logger.isEnabledFor(logging.INFO):
+        return run(cmd, printer=logger.info, **kwargs)
+    return run_discarded(cmd, **kwargs)
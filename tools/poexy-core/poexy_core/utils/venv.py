@@ -1,60 +1,184 @@
+import atexit
 import logging
+import os
 import shutil
+import subprocess
+import sys
 import tempfile
+import threading
 from contextlib import contextmanager
+from functools import cache
 from pathlib import Path
-from typing import Generator, List
+from typing import Generator, List, Optional, Tuple
 
+from packaging.version import InvalidVersion, Version
 from virtualenv import cli_run
 
+from poexy_core.utils import subprocess_rt
 from poexy_core.utils.build import BuildOptions, UvBuild
-from poexy_core.utils.pip import PackageInstallerProgram, Pip, Uv
+from poexy_core.utils.pip import DEFAULT_UV_CACHE, PackageInstallerProgram, Pip, Uv
 
 logger = logging.getLogger(__name__)
 
+# Same floor as the uv dependency, older releases lack options the builder passes
+MINIMUM_UV_VERSION = Version("0.8.5")
+
+
+def _parse_uv_version(output: str) -> Optional[Version]:
+    # "uv 0.8.5 (abcdef 2025-08-05)", only the second field is the version
+    fields = output.split()
+    if len(fields) < 2 or fields[0] != "uv":
+        return None
+    try:
+        return Version(fields[1])
+    except InvalidVersion:
+        return None
+
+
+@cache
+def system_uv_path() -> Optional[Path]:
+    # Probed once, a uv already on PATH spares installing it with pip in every venv.
+    # Version managers put shims on PATH that may not resolve to a real uv.
+    uv_path = shutil.which("uv")
+    if uv_path is None:
+        return None
+    try:
+        completed = subprocess.run(
+            [uv_path, "--version"],
+            stdout=subprocess.PIPE,
+            stderr=subprocess.DEVNULL,
+            text=True,
+            check=False,
+        )
+    except OSError:
+        return None
+    if completed.returncode != 0:
+        return None
+    version = _parse_uv_version(completed.stdout)
+    if version is None or version < MINIMUM_UV_VERSION:
+        logger.debug(
+            "Ignoring uv on PATH (%s), version %s is below %s",
+            uv_path,
+            version,
+            MINIMUM_UV_VERSION,
+        )
+        return None
+    return Path(uv_path)
+
+
+_pending_removals: List[Tuple[threading.Thread, Path]] = []
+
+
+def _remove_in_background(path: Path) -> None:
+    # The temporary venv is private to its caller, nobody waits for it to be gone
+    thread = threading.Thread(
+        target=shutil.rmtree, args=(path,), kwargs={"ignore_errors": True}, daemon=True
+    )
+    thread.start()
+    _pending_removals.append((thread, path))
+
+
+@atexit.register
+def _join_pending_removals() -> None:
+    for thread, path in _pending_removals:
+        thread.join(timeout=5)
+        if thread.is_alive():
+            # Daemon threads die with the interpreter, finish the removal here
+            logger.warning(
+                f"Background removal of {path} still running, removing it now"
+            )
+            shutil.rmtree(path, ignore_errors=True)
+
 
 class VirtualEnvironmentError(Exception):
     pass
 
 
+def _find_one_wheel(output_path: Path) -> Path:
+    # Plain suffix check on the dirents, no glob pattern nor Path per entry
+    with os.scandir(output_path) as entries:
+        wheel_files = [
+            entry.path
+            for entry in entries
+            if entry.name.endswith(".whl") and entry.is_file()
+        ]
+    if len(wheel_files) == 0:
+        raise VirtualEnvironmentError(f"No wheel files found in {output_path}")
+    if len(wheel_files) > 1:
+        raise VirtualEnvironmentError(f"Multiple wheel files found in {output_path}")
+    return Path(wheel_files[0])
+
+
 class VirtualEnvironment:
     def __init__(self, venv_path: Path) -> None:
         self.__venv_path = venv_path
         self.__python_path = venv_path / "bin" / "python"
         self.__pip_path = venv_path / "bin" / "pip"
-        self.__uv_path = venv_path / "bin" / "uv"
+        self.__uv_path = system_uv_path() or venv_path / "bin" / "uv"
         self.__site_packages_paths = None
         self._pip: PackageInstallerProgram = Uv(
             self.__python_path, self.__uv_path, Pip(self.__pip_path)
         )
         self.__builder = UvBuild(self.__uv_path)
 
-        if not self.__venv_path.exists():
-            raise VirtualEnvironmentError(f"venv not found in {self.__venv_path}")
-
-        if not self.__python_path.exists():
-            raise VirtualEnvironmentError(f"python not found in {self.__python_path}")
-
-        if not self.__pip_path.exists():
-            raise VirtualEnvironmentError(f"pip not found in {self.__pip_path}")
+        # One directory scan instead of a stat per expected executable
+        try:
+            with os.scandir(venv_path / "bin") as entries:
+                names = {entry.name for entry in entries}
+        except FileNotFoundError as e:
+            raise VirtualEnvironmentError(
+                f"venv not found in {self.__venv_path}"
+            ) from e
+
+        for name, path in (
+            ("python", self.__python_path),
+            ("pip", self.__pip_path),
+            ("uv", self.__uv_path),
+        ):
+            # uv may come from PATH, only executables of the venv are in the scan
+            found = (
+                path.name in names
+                if path.parent == venv_path / "bin"
+                else path.exists()
+            )
+            if not found:
+                raise VirtualEnvironmentError(f"{name} not found in {path}")
 
-        if not self.__uv_path.exists():
-            raise VirtualEnvironmentError(f"uv not found in {self.__uv_path}")
+    @staticmethod
+    def _create_venv(venv_path: Path) -> None:
+        uv_path = system_uv_path()
+        if uv_path is None:
+            cli_run([str(venv_path)])
+            return
+        # Seeded so the venv still ships the pip used as installer fallback
+        cmd = [
+            str(uv_path),
+            "venv",
+            str(venv_path),
+            "--seed",
+            "--python",
+            sys.executable,
+        ]
+        exit_code = subprocess_rt.run_logged(cmd, logger)
+        if exit_code != 0:
+            raise VirtualEnvironmentError(f"Failed to create venv: {venv_path}")
 
     @contextmanager
     @staticmethod
     def create() -> Generator["VirtualEnvironment", None, None]:
-        venv_dir = tempfile.TemporaryDirectory()
-        venv_path = venv_dir.name
-
-        cli_run([venv_path])
-
-        venv_path = Path(venv_path)
-        venv = VirtualEnvironment(venv_path)
+        venv_path = Path(tempfile.mkdtemp())
 
-        yield venv
+        try:
+            VirtualEnvironment._create_venv(venv_path)
+            venv = VirtualEnvironment(venv_path)
+        except BaseException:
+            shutil.rmtree(venv_path, ignore_errors=True)
+            raise
 
-        venv_dir.cleanup()
+        try:
+            yield venv
+        finally:
+            _remove_in_background(venv_path)
 
     def _build(self, source_path: Path) -> Path:
         output_path = self.__venv_path / "build"
@@ -63,20 +187,13 @@ class VirtualEnvironment:
         build_options = BuildOptions()
         build_options.verbose(True)
         build_options.no_config(True)
+        build_options.cache_dir(DEFAULT_UV_CACHE)
         build_options.python_interpreter(self.__python_path)
         build_options.wheel(True)
         build_options.output_path(output_path)
         build_options.force_pep517(True)
         self.__builder.build(source_path, build_options)
-        wheel_files = list(output_path.glob("*.whl"))
-        if len(wheel_files) == 0:
-            raise VirtualEnvironmentError(f"No wheel files found in {output_path}")
-        if len(wheel_files) > 1:
-            raise VirtualEnvironmentError(
-                f"Multiple wheel files found in {output_path}"
-            )
-        wheel_file = wheel_files[0]
-        return wheel_file
+        return _find_one_wheel(output_path)
 
     @property
     def path(self) -> Path:
@@ -90,9 +207,19 @@ class VirtualEnvironment:
     def site_packages_paths(self) -> List[Path]:
         if self.__site_packages_paths is None:
             self.__site_packages_paths = []
-            for file in self.__venv_path.glob("**/python*/site-packages"):
-                if file.is_dir() and file.name == "site-packages":
-                    self.__site_packages_paths.append(file)
+            # site-packages always sits in lib/pythonX.Y, no need to walk the venv
+            for lib_folder in ("lib", "lib64"):
+                lib_path = self.__venv_path / lib_folder
+                # lib64 is usually a symlink to lib, whose entries are already listed
+                if lib_path.is_symlink() or not lib_path.is_dir():
+                    continue
+                with os.scandir(lib_path) as entries:
+                    for entry in entries:
+                        if not entry.name.startswith("python") or not entry.is_dir():
+                            continue
+                        site_packages_path = Path(entry.path) / "site-packages"
+                        if site_packages_path.is_dir():
+                            self.__site_packages_paths.append(site_packages_path)
             if len(self.__site_packages_paths) == 0:
                 raise VirtualEnvironmentError(
                     f"No site-packages found in venv: {self.__venv_path}"
@@ -3,6 +3,7 @@ import shutil
 import tempfile
 import uuid
 from pathlib import Path
+from typing import Tuple
 
 import pytest
 from filelock import FileLock
@@ -17,16 +18,10 @@ def samples_path():
     return Path(__file__).parent.parent / "samples"
 
 
-@pytest.fixture(scope="session")
-def self_project_dist_path(tmpdir_factory) -> Path:
-    tmpdir = tmpdir_factory.mktemp("dist")
-    return Path(tmpdir)
-
-
 @pytest.fixture(scope="function")
-def tmp_root(tmpdir_factory):
-    path = tmpdir_factory.mktemp(f"test_{uuid.uuid4().hex[:8]}")
-    return Path(path)
+def tmp_root(tmp_path_factory) -> Path:
+    # tmp_path_factory hands out a Path, no py.path.local to convert per test
+    return tmp_path_factory.mktemp(f"test_{uuid.uuid4().hex[:8]}")
 
 
 @pytest.fixture(scope="function")
@@ -44,6 +39,25 @@ def build_path(tmp_root):
     return tmp_root / "build"
 
 
+_GLOBAL_TMP_FOLDERS = (
+    "venv",
+    "venv-archive",
+    "venv-lock",
+    "http-server",
+    "git-server",
+    "server-lock",
+)
+
+
+def _ensure_tree(root: Path, folders: Tuple[str, ...]) -> None:
+    # One listing of the root, only the missing folders cost a mkdir
+    with os.scandir(root) as entries:
+        existing = {entry.name for entry in entries}
+    for folder in folders:
+        if folder not in existing:
+            os.mkdir(root / folder)
+
+
 @pytest.fixture(scope="session")
 def global_tmp_root(testrun_uid, log_info_section) -> Path:
     base_tmp = Path(tempfile.gettempdir())
@@ -61,7 +75,7 @@ def global_tmp_root(testrun_uid, log_info_section) -> Path:
 
         if path.exists() and init_marker.exists():
             marker_data = init_marker.read()
-            if marker_data["testrun_uid"] != testrun_uid:
+            if marker_data.get("testrun_uid") != testrun_uid:
                 remove_global_tmp_root()
         elif path.exists() and not init_marker.exists():
             remove_global_tmp_root()
@@ -69,6 +83,8 @@ def global_tmp_root(testrun_uid, log_info_section) -> Path:
         if not path.exists():
             path.mkdir(parents=True, exist_ok=True)
 
+        _ensure_tree(path, _GLOBAL_TMP_FOLDERS)
+
         init_marker.touch()
 
     try:
@@ -80,44 +96,45 @@ def global_tmp_root(testrun_uid, log_info_section) -> Path:
 
 @pytest.fixture(scope="session")
 def global_virtualenv_path(global_tmp_root: Path) -> Path:
-    path = global_tmp_root / "venv"
-    path.mkdir(parents=True, exist_ok=True)
-    return path
+    return global_tmp_root / "venv"
 
 
 @pytest.fixture(scope="session")
 def global_virtualenv_archive_path(global_tmp_root: Path) -> Path:
-    path = global_tmp_root / "venv-archive"
+    return global_tmp_root / "venv-archive"
+
+
+@pytest.fixture(scope="session")
+def venv_archive_cache_path() -> Path:
+    # Outside the global tmp root, archives survive across test sessions
+    path = Path.home() / ".cache" / "poexy-core" / "venv-archives"
     path.mkdir(parents=True, exist_ok=True)
     return path
 
 
+@pytest.fixture(scope="session")
+def global_virtualenv_template_path(global_tmp_root: Path) -> Path:
+    return global_tmp_root / "venv-template"
+
+
 @pytest.fixture(scope="session")
 def global_virtualenv_lock_path(global_tmp_root: Path) -> Path:
-    path = global_tmp_root / "venv-lock"
-    path.mkdir(parents=True, exist_ok=True)
-    return path
+    return global_tmp_root / "venv-lock"
 
 
 @pytest.fixture(scope="session")
 def http_server_path(global_tmp_root: Path) -> Path:
-    path = global_tmp_root / "http-server"
-    path.mkdir(parents=True, exist_ok=True)
-    return path
+    return global_tmp_root / "http-server"
 
 
 @pytest.fixture(scope="session")
 def git_server_path(global_tmp_root: Path) -> Path:
-    path = global_tmp_root / "git-server"
-    path.mkdir(parents=True, exist_ok=True)
-    return path
+    return global_tmp_root / "git-server"
 
 
 @pytest.fixture(scope="session")
 def server_lock_path(global_tmp_root: Path) -> Path:
-    path = global_tmp_root / "server-lock"
-    path.mkdir(parents=True, exist_ok=True)
-    return path
+    return global_tmp_root / "server-lock"
 
 
 @pytest.fixture(scope="function")
@@ -127,5 +144,4 @@ def virtualenv_path(tmp_root):
 
 @pytest.fixture(scope="function", autouse=True)
 def pyinstaller_path(tmp_root):
-    path = tmp_root / "pyinstaller"
-    os.environ["PYINSTALLER_CONFIG_DIR"] = str(path)
+    os.environ["PYINSTALLER_CONFIG_DIR"] = os.path.join(tmp_root, "pyinstaller")
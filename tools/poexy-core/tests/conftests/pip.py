@@ -1,6 +1,12 @@
+import hashlib
+import os
 import shutil
+import subprocess
+import sys
+import time
+from importlib import metadata
 from pathlib import Path
-from typing import Callable
+from typing import Callable, Iterable
 
 import pytest
 from assertpy import assert_that
@@ -12,20 +18,38 @@ from poexy_core.utils.pip import (
     UvInstallOptions,
     UvOptions,
 )
+from poexy_core.utils.venv import system_uv_path
 from tests.utils.markers import MarkerFile
 from tests.utils.venv import TestVirtualEnvironment
 
 # pylint: disable=redefined-outer-name
 
+# The caches live in $HOME and are shared by every checkout on the host, entries
+# are only evicted once nobody used them for this long
+CACHE_MAX_AGE = 7 * 24 * 60 * 60  # seconds
+
+
+def prune_stale_cache_entries(entries: Iterable[Path], keep: Path) -> None:
+    # Used entries have their mtime refreshed, an old one belongs to no live session
+    deadline = time.time() - CACHE_MAX_AGE
+    for entry in entries:
+        if entry == keep:
+            continue
+        try:
+            if entry.stat().st_mtime >= deadline:
+                continue
+        except FileNotFoundError:
+            continue
+        if entry.is_dir():
+            shutil.rmtree(entry, ignore_errors=True)
+        else:
+            entry.unlink(missing_ok=True)
+
 
 @pytest.fixture()
-def venv(
-    virtualenv_path, create_venv_archive, log_info_section
-) -> TestVirtualEnvironment:
-    log_info_section("Extracting virtualenv archive")
-    venv = TestVirtualEnvironment.create_from_archive(
-        create_venv_archive, virtualenv_path
-    )
+def venv(virtualenv_path, venv_template, log_info_section) -> TestVirtualEnvironment:
+    log_info_section("Cloning virtualenv template")
+    venv = TestVirtualEnvironment.create_from_template(venv_template, virtualenv_path)
     yield venv
     log_info_section("Removing virtualenv")
     shutil.rmtree(venv.path)
@@ -39,25 +63,75 @@ def pip(venv, log_info_section) -> PackageInstallerProgram:
     return pip
 
 
+def uv_version() -> str:
+    # The uv on PATH when it is used, otherwise the one installed with poexy-core
+    uv_path = system_uv_path()
+    if uv_path is not None:
+        completed = subprocess.run(
+            [str(uv_path), "--version"],
+            stdout=subprocess.PIPE,
+            stderr=subprocess.DEVNULL,
+            text=True,
+            check=False,
+        )
+        return completed.stdout.strip()
+    try:
+        return metadata.version("uv")
+    except metadata.PackageNotFoundError:
+        return "unknown"
+
+
+def self_project_key(self_project: Path) -> str:
+    key = hashlib.blake2b(digest_size=8)
+    # The wheel and venv archive also depend on the interpreter and uv building them
+    key.update(f"{sys.version}:{sys.executable}:{uv_version()};".encode())
+    paths = [self_project / "pyproject.toml"]
+    for root, folders, files in os.walk(self_project / "poexy_core"):
+        folders[:] = sorted(folder for folder in folders if folder != "__pycache__")
+        paths.extend(Path(root) / file for file in sorted(files))
+    for path in paths:
+        stat = os.stat(path)
+        relative_path = path.relative_to(self_project).as_posix()
+        key.update(f"{relative_path}:{stat.st_mtime_ns}:{stat.st_size};".encode())
+    return key.hexdigest()
+
+
+@pytest.fixture(scope="session")
+def self_project_dist_path(self_project) -> Path:
+    # Keyed by the poexy-core sources, an unchanged tree reuses the last wheel
+    dist_cache_path = Path.home() / ".cache" / "poexy-core" / "dist"
+    path = dist_cache_path / self_project_key(self_project)
+    path.mkdir(parents=True, exist_ok=True)
+    # Marks the entry as in use, other sessions only prune entries left unused
+    os.utime(path)
+    return path
+
+
 @pytest.fixture(scope="session")
 def create_venv_archive(
     global_virtualenv_path,
     global_virtualenv_archive_path,
     global_virtualenv_lock_path,
+    venv_archive_cache_path,
     self_project,
+    self_project_dist_path,
     log_info_section,
 ) -> Path:
     lock_path = global_virtualenv_lock_path / ".lock"
     lock = FileLock(lock_path)
 
-    archive_path = (
-        global_virtualenv_archive_path / TestVirtualEnvironment.archive_name()
-    )
+    # Keyed by the poexy-core sources, an unchanged tree reuses the last archive
+    key = self_project_key(self_project)
+    archive_path = venv_archive_cache_path / TestVirtualEnvironment.archive_name(key)
 
     with lock:
         marker_file = MarkerFile(global_virtualenv_archive_path / ".archive_created")
 
-        if not marker_file.exists():
+        if not marker_file.exists() and archive_path.exists():
+            log_info_section("Reusing cached virtualenv archive")
+            # Marks the archive as in use, other sessions only prune unused ones
+            os.utime(archive_path)
+        elif not marker_file.exists():
             log_info_section("Removing global virtualenv folder and archive")
             shutil.rmtree(global_virtualenv_path, ignore_errors=True)
             shutil.rmtree(global_virtualenv_archive_path, ignore_errors=True)
@@ -69,8 +143,23 @@ def create_venv_archive(
             log_info_section("Creating global virtualenv")
             venv = TestVirtualEnvironment.create_from_path(global_virtualenv_path)
 
-            log_info_section("Building poexy-core")
-            self_archive_path = venv.build(self_project)
+            cached_wheels = list(self_project_dist_path.glob("*.whl"))
+            if cached_wheels:
+                log_info_section("Reusing cached poexy-core wheel")
+                self_archive_path = cached_wheels[0]
+            else:
+                log_info_section("Building poexy-core")
+                built_wheel_path = venv.build(self_project)
+                self_archive_path = self_project_dist_path / built_wheel_path.name
+                # Copied then renamed, an interrupted copy never looks like a wheel
+                partial_path = self_archive_path.with_suffix(".partial")
+                shutil.copy2(built_wheel_path, partial_path)
+                os.replace(partial_path, self_archive_path)
+
+                log_info_section("Removing stale poexy-core wheels")
+                prune_stale_cache_entries(
+                    self_project_dist_path.parent.iterdir(), self_project_dist_path
+                )
 
             log_info_section("Installing poexy-core")
             default_install_options = UvInstallOptions.defaults()
@@ -79,8 +168,13 @@ def create_venv_archive(
             install_options = default_install_options + install_options.build()
             venv.pip.install([str(self_archive_path)], install_options)
 
+            log_info_section("Removing stale virtualenv archives")
+            prune_stale_cache_entries(
+                venv_archive_cache_path.glob("venv-*"), archive_path
+            )
+
             log_info_section("Creating virtualenv archive")
-            archive_path = venv.create_archive(global_virtualenv_archive_path)
+            archive_path = venv.create_archive(venv_archive_cache_path, key)
 
             assert_that(str(archive_path)).is_file()
 
@@ -95,6 +189,38 @@ def create_venv_archive(
             shutil.rmtree(global_virtualenv_path, ignore_errors=True)
 
 
+@pytest.fixture(scope="session")
+def venv_template(
+    create_venv_archive,
+    global_virtualenv_template_path,
+    global_virtualenv_lock_path,
+    log_info_section,
+) -> Path:
+    lock_path = global_virtualenv_lock_path / ".template.lock"
+    lock = FileLock(lock_path)
+
+    # Extracted once per session, each test then hardlinks it instead of untarring
+    with lock:
+        marker_file = MarkerFile(
+            global_virtualenv_template_path.parent / ".template_extracted"
+        )
+
+        if not marker_file.exists():
+            log_info_section("Extracting virtualenv template")
+            TestVirtualEnvironment.create_from_archive(
+                create_venv_archive, global_virtualenv_template_path
+            )
+
+        marker_file.touch()
+
+    try:
+        yield global_virtualenv_template_path
+    finally:
+        if marker_file.untouch():
+            log_info_section("Removing virtualenv template")
+            shutil.rmtree(global_virtualenv_template_path, ignore_errors=True)
+
+
 @pytest.fixture()
 def assert_pip_wheel(
     build_path, pip: PackageInstallerProgram, dist_package_name, log_info_section
@@ -110,10 +236,12 @@ def assert_pip_wheel(
         options.wheel_dir(wheel_path)
         returncode = pip.wheel([str(archive_path)], options)
         assert_that(returncode).is_equal_to(0)
-        for file in wheel_path.iterdir():
-            if file.is_file() and file.name.startswith(dist_package_name()):
-                return file
-        raise AssertionError(f"Wheel file {dist_package_name()} not found")
+        prefix = dist_package_name()
+        with os.scandir(wheel_path) as entries:
+            for entry in entries:
+                if entry.is_file() and entry.name.startswith(prefix):
+                    return Path(entry.path)
+        raise AssertionError(f"Wheel file {prefix} not found")
 
     return _assert
 
@@ -1,4 +1,8 @@
+import functools
+import os
 import shutil
+from concurrent.futures import ThreadPoolExecutor
+from contextlib import contextmanager
 from pathlib import Path
 
 import pytest
@@ -9,10 +13,43 @@ from tests.utils.markers import MarkerFile
 from tests.utils.servers import GitServer, HttpServer
 
 
-@pytest.fixture(scope="session", autouse=True)
-def serve_library_archive(
+@functools.lru_cache(maxsize=None)
+def _sample(relative_path: str) -> str:
+    return os.fspath(Path(__file__).parent.parent / "samples" / relative_path)
+
+
+def link_or_copy(source: str, destination: str) -> str:
+    # Served files are never modified, a hardlink avoids copying their bytes
+    try:
+        os.link(source, destination)
+    except OSError:
+        shutil.copy2(source, destination)
+    return destination
+
+
+def _server_alive(marker_file: MarkerFile) -> bool:
+    pid = marker_file.read().get("pid")
+    if pid is None:
+        return False
+    try:
+        os.kill(pid, 0)
+    except PermissionError:
+        return True
+    except OSError:
+        return False
+    return True
+
+
+def _discard_stale_marker(marker_file: MarkerFile, log_info_section) -> None:
+    # A server whose process is gone left its marker behind, start a new one
+    if marker_file.exists() and not _server_alive(marker_file):
+        log_info_section("Discarding stale server marker")
+        marker_file.remove()
+
+
+@contextmanager
+def _serve_library_archive(
     http_server_path: Path,
-    samples_path: Path,
     server_lock_path: Path,
     log_info_section,
     log_info,
@@ -24,6 +61,7 @@ def serve_library_archive(
 
     with lock:
         marker_file = MarkerFile(http_server_path / ".server_running")
+        _discard_stale_marker(marker_file, log_info_section)
 
         if not marker_file.exists():
             log_info_section("Removing http server folder")
@@ -33,11 +71,17 @@ def serve_library_archive(
             http_server_path.mkdir(parents=True, exist_ok=True)
 
             log_info_section("Serving library archive")
-            library_path = samples_path / "library" / "library-1.0.0-py3-none-any.whl"
-            shutil.copy(library_path, http_server_path)
+            library_path = _sample("library/library-1.0.0-py3-none-any.whl")
+            link_or_copy(
+                library_path,
+                os.path.join(http_server_path, os.path.basename(library_path)),
+            )
             http_server = HttpServer(http_server_path, 8000, log_info)
             http_server.start()
             http_server.wait_for_connection(timeout=30)
+            marker_file = MarkerFile(
+                marker_file.path, {"pid": http_server.pid, "port": http_server.port}
+            )
 
         marker_file.touch()
 
@@ -53,10 +97,9 @@ def serve_library_archive(
             shutil.rmtree(http_server_path, ignore_errors=True)
 
 
-@pytest.fixture(scope="session", autouse=True)
-def serve_library_vcs(
+@contextmanager
+def _serve_library_vcs(
     git_server_path: Path,
-    samples_path: Path,
     server_lock_path: Path,
     log_info_section,
     log_info,
@@ -68,6 +111,7 @@ def serve_library_vcs(
 
     with lock:
         marker_file = MarkerFile(git_server_path / ".server_running")
+        _discard_stale_marker(marker_file, log_info_section)
 
         if not marker_file.exists():
             log_info_section("Removing git server folder")
@@ -84,49 +128,58 @@ def serve_library_vcs(
             bare_path = git_server_path / "library.git"
             bare_path.mkdir(parents=True, exist_ok=True)
 
-            library_path = samples_path / "library"
-            shutil.copytree(library_path, working_path, dirs_exist_ok=True)
-
-            subprocess_rt.run(["git", "init"], printer=log_info, cwd=working_path)
-            subprocess_rt.run(
-                ["git", "branch", "-m", "main"], printer=log_info, cwd=working_path
-            )
-            subprocess_rt.run(
-                ["git", "config", "user.email", "ci@example.com"],
-                printer=log_info,
-                cwd=working_path,
-            )
-            subprocess_rt.run(
-                ["git", "config", "user.name", "CI"], printer=log_info, cwd=working_path
-            )
-            subprocess_rt.run(["git", "add", "-A"], printer=log_info, cwd=working_path)
-            subprocess_rt.run(
-                ["git", "commit", "-m", "Initial commit"],
-                printer=log_info,
-                cwd=working_path,
+            library_path = _sample("library")
+            shutil.copytree(
+                library_path,
+                working_path,
+                dirs_exist_ok=True,
+                copy_function=link_or_copy,
             )
 
-            subprocess_rt.run(
-                ["git", "init", "--bare", str(bare_path)], printer=log_info
-            )
-            subprocess_rt.run(
-                ["git", "remote", "add", "origin", str(bare_path)],
-                printer=log_info,
-                cwd=working_path,
-            )
-            subprocess_rt.run(
-                ["git", "push", "origin", "main"], printer=log_info, cwd=working_path
-            )
-            subprocess_rt.run(
-                ["git", "symbolic-ref", "HEAD", "refs/heads/main"],
-                printer=log_info,
-                cwd=bare_path,
-            )
+            # Branch and identity go through -c, no separate config or rename calls.
+            # The bare repository HEAD already points to main, pushed to by path.
+            for cmd, cwd in (
+                (["git", "-c", "init.defaultBranch=main", "init"], working_path),
+                (["git", "add", "-A"], working_path),
+                (
+                    [
+                        "git",
+                        "-c",
+                        "user.email=ci@example.com",
+                        "-c",
+                        "user.name=CI",
+                        "commit",
+                        "-m",
+                        "Initial commit",
+                    ],
+                    working_path,
+                ),
+                (
+                    [
+                        "git",
+                        "-c",
+                        "init.defaultBranch=main",
+                        "init",
+                        "--bare",
+                        str(bare_path),
+                    ],
+                    None,
+                ),
+                (["git", "push", str(bare_path), "main"], working_path),
+            ):
+                # Output only matters when a step failed
+                exit_code, output = subprocess_rt.run_quiet(cmd, cwd=cwd)
+                if exit_code != 0:
+                    log_info(output.decode("utf-8", errors="replace"))
+
             (bare_path / "git-daemon-export-ok").touch()
 
             git_server = GitServer(bare_path.parent, 8001, log_info)
             git_server.start()
             git_server.wait_for_connection(timeout=30)
+            marker_file = MarkerFile(
+                marker_file.path, {"pid": git_server.pid, "port": git_server.port}
+            )
 
         marker_file.touch()
 
@@ -137,3 +190,46 @@ def serve_library_vcs(
             git_server.stop()
             log_info_section("Removing git server folder")
             shutil.rmtree(git_server_path, ignore_errors=True)
+
+
+@pytest.fixture(scope="session", autouse=True)
+def serve_library_fixtures(
+    http_server_path: Path,
+    git_server_path: Path,
+    server_lock_path: Path,
+    log_info_section,
+    log_info,
+) -> None:
+    servers = [
+        _serve_library_archive(
+            http_server_path, server_lock_path, log_info_section, log_info
+        ),
+        _serve_library_vcs(
+            git_server_path, server_lock_path, log_info_section, log_info
+        ),
+    ]
+
+    # The servers share nothing, each one takes its own lock and starts concurrently
+    with ThreadPoolExecutor(max_workers=len(servers)) as executor:
+        futures = [executor.submit(server.__enter__) for server in servers]
+        errors = [future.exception() for future in futures]
+
+    started = [server for server, error in zip(servers, errors) if error is None]
+
+    def stop_servers():
+        with ThreadPoolExecutor(max_workers=len(servers)) as executor:
+            futures = [
+                executor.submit(server.__exit__, None, None, None) for server in started
+            ]
+        for future in futures:
+            future.result()
+
+    for error in errors:
+        if error is not None:
+            stop_servers()
+            raise error
+
+    try:
+        yield
+    finally:
+        stop_servers()
@@ -1,67 +1,104 @@
+import fcntl
 import json
+import os
+import struct
 import time
+from contextlib import contextmanager
 from pathlib import Path
-from typing import Dict
+from typing import Dict, Generator
+
+# The usage counter is a single little-endian int64 at the start of the marker
+_COUNTER = struct.Struct("<q")
 
 
 class MarkerFile:
     def __init__(self, path: Path, extra: Dict[str, str] = None):
         self.path = path
+        # Extra data is written once, when the marker is created, beside the counter
+        self.__extra_path = path.with_name(path.name + ".json")
         self.__data = extra or {}
         self.__counter = 0
 
     def read(self) -> Dict[str, str]:
         if not self.exists():
             return {}
-        with open(self.path, "r", encoding="utf-8") as f:
-            self.__data = json.load(f)
-            self.__counter = self.__data.get("counter")
-            del self.__data["counter"]
+        try:
+            with open(self.__extra_path, "r", encoding="utf-8") as f:
+                self.__data = json.load(f)
+        except FileNotFoundError:
+            self.__data = {}
         return self.__data
 
-    def __write(self, counter: int):
-        with open(self.path, "w", encoding="utf-8") as f:
-            self.__data["counter"] = counter
-            json.dump(self.__data, f, indent=2)
+    @contextmanager
+    def __locked(self) -> Generator[int, None, None]:
+        while True:
+            fd = os.open(self.path, os.O_RDWR | os.O_CREAT, 0o644)
+            fcntl.flock(fd, fcntl.LOCK_EX)
+            # The last holder unlinks the marker under the lock, a waiter may then
+            # own a lock on a file no longer reachable by path and has to reopen it
+            try:
+                same_file = os.fstat(fd).st_ino == os.stat(self.path).st_ino
+            except FileNotFoundError:
+                same_file = False
+            if same_file:
+                break
+            os.close(fd)
+        try:
+            yield fd
+        finally:
+            os.close(fd)
 
-    def exists(self) -> bool:
-        return self.path.exists() and self.path.is_file()
+    @staticmethod
+    def __read_counter(fd: int) -> int:
+        data = os.pread(fd, _COUNTER.size, 0)
+        if len(data) != _COUNTER.size:
+            return 0
+        return _COUNTER.unpack(data)[0]
 
-    def touch(self):
-        if not self.exists():
-            self.path.touch()
-            self.__counter = 0
-        else:
-            self.read()
+    @staticmethod
+    def __write_counter(fd: int, counter: int):
+        os.pwrite(fd, _COUNTER.pack(counter), 0)
+
+    def __remove_files(self):
+        self.path.unlink(missing_ok=True)
+        self.__extra_path.unlink(missing_ok=True)
+
+    def exists(self) -> bool:
+        return self.path.is_file()
 
-        self.__counter += 1
+    def remove(self):
+        with self.__locked():
+            self.__remove_files()
 
-        self.__write(self.__counter)
+    def touch(self):
+        with self.__locked() as fd:
+            self.__counter = self.__read_counter(fd)
+            if self.__counter == 0:
+                with open(self.__extra_path, "w", encoding="utf-8") as f:
+                    json.dump(self.__data, f, indent=2)
+            self.__counter += 1
+            self.__write_counter(fd, self.__counter)
 
     def untouch(self, wait: bool = False, timeout: float = 10) -> bool:
         if not self.exists():
             return False
 
-        self.read()
-
-        self.__counter -= 1
-
-        if self.__counter == 0:
-            self.path.unlink()
-            return True
-
-        self.__write(self.__counter)
+        with self.__locked() as fd:
+            self.__counter = self.__read_counter(fd) - 1
+            if self.__counter <= 0:
+                self.__remove_files()
+                return True
+            self.__write_counter(fd, self.__counter)
 
         if wait:
+            # Whoever releases the last usage removes the marker
             start_time = time.time()
             while time.time() - start_time < timeout:
-                self.read()
-                if self.__counter == 0:
-                    self.path.unlink()
+                if not self.exists():
                     return True
                 time.sleep(0.1)
             if self.exists():
-                self.path.unlink()
+                self.remove()
             return True
 
         return False
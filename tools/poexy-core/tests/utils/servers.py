@@ -1,8 +1,10 @@
 import os
+import selectors
 import signal
 import socket
 import time
-from http.server import HTTPServer, SimpleHTTPRequestHandler
+from concurrent.futures import ThreadPoolExecutor
+from http.server import SimpleHTTPRequestHandler, ThreadingHTTPServer
 from pathlib import Path
 from threading import Thread
 from typing import Callable, Optional, override
@@ -20,6 +22,11 @@ class BaseServer:
     def _target(self) -> Callable[[], object]:
         raise NotImplementedError("Not implemented")
 
+    @property
+    def pid(self) -> int:
+        # Served from a thread of the current process unless overridden
+        return os.getpid()
+
     def start(self):
         if self._thread is not None:
             raise RuntimeError("Server is already running")
@@ -38,13 +45,25 @@ class BaseServer:
         self._thread = None
 
     def wait_for_connection(self, timeout=5.0):
-        start = time.time()
-        while time.time() - start < timeout:
-            try:
-                with socket.create_connection(("localhost", self.port), timeout=0.5):
-                    return True
-            except (OSError, ConnectionRefusedError):
-                time.sleep(0.1)
+        # Non-blocking connect, select wakes up as soon as the port accepts.
+        # Only a refused connection is retried, after a short growing backoff.
+        deadline = time.monotonic() + timeout
+        delay = 0.005
+        with selectors.DefaultSelector() as selector:
+            while (remaining := deadline - time.monotonic()) > 0:
+                with socket.socket(socket.AF_INET, socket.SOCK_STREAM) as sock:
+                    sock.setblocking(False)
+                    sock.connect_ex(("localhost", self.port))
+                    selector.register(sock, selectors.EVENT_WRITE)
+                    try:
+                        events = selector.select(remaining)
+                    finally:
+                        selector.unregister(sock)
+                    error = sock.getsockopt(socket.SOL_SOCKET, socket.SO_ERROR)
+                    if events and error == 0:
+                        return True
+                time.sleep(min(delay, max(deadline - time.monotonic(), 0)))
+                delay = min(delay * 2, 0.1)
         raise TimeoutError(
             f"Port {self.port} on localhost did not open in {timeout} seconds"
         )
@@ -53,7 +72,11 @@ class BaseServer:
 class HttpServer(BaseServer):
     def __init__(self, directory: Path, port: int, logger):
         super().__init__(directory, port, logger)
-        self.__httpd: Optional[HTTPServer] = None
+        self.__httpd: Optional[ThreadingHTTPServer] = None
+        # Requests overlap on a fixed pool instead of a thread per request
+        self.__executor = ThreadPoolExecutor(
+            max_workers=8, thread_name_prefix="http-server"
+        )
 
     @override
     def _target(self) -> Callable[[], object]:
@@ -64,8 +87,17 @@ class HttpServer(BaseServer):
                 super().__init__(directory=directory, *args, **kwargs)
 
         self.logger(f"Starting HTTP server at {self.directory}")
+        executor = self.__executor
+
+        class PooledHTTPServer(ThreadingHTTPServer):
+            daemon_threads = True
+
+            @override
+            def process_request(self, request, client_address):
+                executor.submit(self.process_request_thread, request, client_address)
+
         handler = HttpRequestHandler
-        self.__httpd = HTTPServer(("localhost", self.port), handler, False)
+        self.__httpd = PooledHTTPServer(("localhost", self.port), handler, False)
         self.__httpd.allow_reuse_address = True
         self.__httpd.allow_reuse_port = True
         self.__httpd.server_bind()
@@ -73,6 +105,15 @@ class HttpServer(BaseServer):
         self.logger(f"HTTP server started at {self.__httpd.server_address}")
         return self.__httpd.serve_forever
 
+    @override
+    def wait_for_connection(self, timeout=5.0):
+        # Bound and listening before start() returns, one connect confirms it
+        try:
+            with socket.create_connection(("localhost", self.port), timeout=timeout):
+                return True
+        except ConnectionRefusedError:
+            return super().wait_for_connection(timeout)
+
     @override
     def stop(self):
         if self.__httpd is None:
@@ -80,6 +121,7 @@ class HttpServer(BaseServer):
         self.logger("Stopping HTTP server")
         self.__httpd.shutdown()
         self.__httpd.server_close()
+        self.__executor.shutdown(wait=True)
         if self._thread.is_alive():
             super().stop()
         self.__httpd = None
@@ -96,6 +138,8 @@ class GitServer(BaseServer):
     def _target(self) -> Callable[[], object]:
         def target() -> None:
             self.logger(f"Starting GIT server at {self.directory}")
+            # A leftover pid file would be read before the daemon writes its own
+            self.__pid_file.unlink(missing_ok=True)
             exit_code = subprocess_rt.run(
                 [
                     "git",
@@ -115,24 +159,43 @@ class GitServer(BaseServer):
             if exit_code != 0:
                 raise RuntimeError(f"git daemon exited with code {exit_code}")
 
+            self.__pid = self.__read_pid_file()
+            self.logger(
+                f"GIT server started at localhost:{self.port} "
+                f"and with pid {self.__pid}"
+            )
+
+        return target
+
+    def __read_pid_file(self, timeout: float = 5.0) -> int:
+        # The detached child writes the pid file after the parent has exited,
+        # wait for it with a backoff starting at a millisecond
+        deadline = time.monotonic() + timeout
+        delay = 0.001
+        while True:
             try:
-                if self.__pid_file.exists():
-                    with open(self.__pid_file, "r", encoding="utf-8") as f:
-                        pid_content = f.read().strip()
-                        if pid_content:
-                            self.__pid = int(pid_content)
-                            self.logger(
-                                f"GIT server started at localhost:{self.port} "
-                                f"and with pid {self.__pid}"
-                            )
-                        else:
-                            raise RuntimeError("PID file is empty")
-                else:
-                    raise RuntimeError(f"PID file {self.__pid_file} was not created")
-            except (FileNotFoundError, ValueError, OSError) as e:
+                with open(self.__pid_file, "r", encoding="utf-8") as f:
+                    pid_content = f.read().strip()
+                if pid_content:
+                    return int(pid_content)
+            except FileNotFoundError:
+                pass
+            except (ValueError, OSError) as e:
                 raise RuntimeError(f"Failed to read PID file: {e}")
+            if time.monotonic() >= deadline:
+                raise RuntimeError(f"PID file {self.__pid_file} was not created")
+            time.sleep(delay)
+            delay = min(delay * 2, 0.05)
 
-        return target
+    @property
+    @override
+    def pid(self) -> int:
+        # The daemon detaches, the thread ends once its pid file has been read
+        if self._thread is not None:
+            self._thread.join(timeout=5)
+        if self.__pid is None:
+            raise RuntimeError("GIT server PID is undefined")
+        return self.__pid
 
     @override
     def stop(self):
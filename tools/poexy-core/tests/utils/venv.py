@@ -1,16 +1,40 @@
 import json
 import logging
+import mmap
+import os
+import shutil
+import tarfile
+from concurrent.futures import ThreadPoolExecutor
 from pathlib import Path
+from typing import Any, Dict
 
-from virtualenv import cli_run
+import zstandard
 
-from poexy_core.utils import subprocess_rt
 from poexy_core.utils.pip import PackageInstallerProgram
 from poexy_core.utils.venv import VirtualEnvironment, VirtualEnvironmentError
 
 logger = logging.getLogger(__name__)
 
 
+def write_json_atomic(path: Path, data: Dict[str, Any]) -> None:
+    # Readers see either the previous content or the new one, never a partial file
+    temporary_path = path.with_suffix(".json.tmp")
+    with open(temporary_path, "w", encoding="utf-8") as f:
+        json.dump(data, f)
+        f.flush()
+        os.fsync(f.fileno())
+    os.replace(temporary_path, path)
+    directory_fd = os.open(path.parent, os.O_DIRECTORY)
+    try:
+        os.fsync(directory_fd)
+    finally:
+        os.close(directory_fd)
+
+
+def _log_removal_error(function, path, error) -> None:
+    logger.info(f"Failed to remove {path}: {error}")
+
+
 class TestVirtualEnvironment(VirtualEnvironment):
     __test__ = False
 
@@ -20,7 +44,7 @@ class TestVirtualEnvironment(VirtualEnvironment):
 
     @staticmethod
     def create_from_path(venv_path: Path) -> "TestVirtualEnvironment":
-        cli_run([str(venv_path)])
+        VirtualEnvironment._create_venv(venv_path)
         return TestVirtualEnvironment(venv_path)
 
     @staticmethod
@@ -30,6 +54,38 @@ class TestVirtualEnvironment(VirtualEnvironment):
         TestVirtualEnvironment.__extract_archive(archive_path, venv_path)
         return TestVirtualEnvironment(venv_path)
 
+    @staticmethod
+    def create_from_template(
+        template_path: Path, venv_path: Path
+    ) -> "TestVirtualEnvironment":
+        shutil.rmtree(venv_path, ignore_errors=True)
+        TestVirtualEnvironment.__clone_tree(template_path, venv_path)
+        TestVirtualEnvironment.__upgrade_scripts_shebang(venv_path)
+        return TestVirtualEnvironment(venv_path)
+
+    @staticmethod
+    def __clone_tree(source_path: Path, destination_path: Path) -> None:
+        # Files are hardlinked, anything rewritten later must be unlinked first
+        for root, folders, files in os.walk(source_path):
+            destination_root = destination_path / Path(root).relative_to(source_path)
+            destination_root.mkdir(parents=True, exist_ok=True)
+            for name in [*folders, *files]:
+                source = os.path.join(root, name)
+                destination = destination_root / name
+                if os.path.islink(source):
+                    os.symlink(os.readlink(source), destination)
+                elif name in files:
+                    try:
+                        os.link(source, destination)
+                    except OSError:
+                        shutil.copy2(source, destination)
+            # Symlinked folders are recreated as links above, not walked
+            folders[:] = [
+                folder
+                for folder in folders
+                if not os.path.islink(os.path.join(root, folder))
+            ]
+
     @property
     def pip(self) -> PackageInstallerProgram:
         return self._pip
@@ -37,104 +93,166 @@ class TestVirtualEnvironment(VirtualEnvironment):
     @property
     def site_package(self) -> Path:
         if self.__site_package_path is None:
-            for file in self.path.glob("lib/python*/site-packages"):
-                if file.is_dir() and file.name == "site-packages":
-                    self.__site_package_path = file
-                    return file
-            raise VirtualEnvironmentError(
-                f"No site-packages found in venv: {self.__venv_path}"
+            self.__site_package_path = (
+                self.__recorded_site_package()
+                or self.__configured_site_package()
+                or self.__find_site_package()
             )
         return self.__site_package_path
 
+    def __recorded_site_package(self) -> Path | None:
+        # Archives record the location, a clone then needs no lib/ scan
+        try:
+            with open(self.path / "venv.json", "r", encoding="utf-8") as f:
+                venv_config = json.load(f)
+        except FileNotFoundError:
+            return None
+        site_packages = venv_config.get("site_packages")
+        if site_packages is None:
+            return None
+        return self.path / site_packages
+
+    def __configured_site_package(self) -> Path | None:
+        # pyvenv.cfg names the interpreter version, lib/pythonX.Y follows from it
+        try:
+            with open(self.path / "pyvenv.cfg", "r", encoding="utf-8") as f:
+                lines = f.readlines()
+        except FileNotFoundError:
+            return None
+        for line in lines:
+            key, separator, value = line.partition("=")
+            if not separator or key.strip() not in ("version", "version_info"):
+                continue
+            version = value.strip().split(".")
+            if len(version) < 2:
+                return None
+            site_package = (
+                self.path / f"lib/python{version[0]}.{version[1]}" / "site-packages"
+            )
+            return site_package if site_package.is_dir() else None
+        return None
+
+    def __find_site_package(self) -> Path:
+        try:
+            with os.scandir(self.path / "lib") as entries:
+                for entry in entries:
+                    if entry.name.startswith("python") and entry.is_dir(
+                        follow_symlinks=False
+                    ):
+                        site_package = Path(entry.path) / "site-packages"
+                        if site_package.is_dir():
+                            return site_package
+        except FileNotFoundError:
+            pass
+        raise VirtualEnvironmentError(f"No site-packages found in venv: {self.path}")
+
     @property
     def bin_path(self) -> Path:
         return self.path / "bin"
 
     @staticmethod
-    def archive_name() -> str:
-        return "venv.tar.zst"
+    def archive_name(key: str | None = None) -> str:
+        if key is None:
+            return "venv.tar.zst"
+        return f"venv-{key}.tar.zst"
 
     def build(self, source_path: Path) -> Path:
         return self._build(source_path)
 
-    def create_archive(self, archive_path: Path) -> Path:
+    def create_archive(self, archive_path: Path, key: str | None = None) -> Path:
         venv_config = {
             "base_path": str(self.path),
             "created_at": str(Path().stat().st_mtime),
+            "site_packages": str(self.site_package.relative_to(self.path)),
         }
-        with open(self.path / "venv.json", "w", encoding="utf-8") as f:
-            json.dump(venv_config, f)
-
-        cmd = [
-            "tar",
-            "--use-compress-program",
-            "zstd",
-            "--create",
-            "--file",
-            str(archive_path / TestVirtualEnvironment.archive_name()),
-            "--directory",
-            str(self.path),
-            ".",
-        ]
-        exit_code = subprocess_rt.run(cmd, printer=logger.info)
-        if exit_code != 0:
-            raise VirtualEnvironmentError(f"Failed to create venv archive: {exit_code}")
-        return archive_path / TestVirtualEnvironment.archive_name()
+        write_json_atomic(self.path / "venv.json", venv_config)
+
+        # Streamed through zstandard in process, no tar nor zstd to spawn
+        archive_file_path = archive_path / TestVirtualEnvironment.archive_name(key)
+        try:
+            with (
+                open(archive_file_path, "wb") as raw,
+                zstandard.ZstdCompressor(level=3, threads=-1).stream_writer(
+                    raw
+                ) as compressed,
+                tarfile.open(fileobj=compressed, mode="w|") as archive,
+            ):
+                archive.add(str(self.path), arcname=".")
+        except (OSError, tarfile.TarError, zstandard.ZstdError) as e:
+            raise VirtualEnvironmentError(f"Failed to create venv archive: {e}") from e
+        return archive_file_path
 
     @staticmethod
     def __extract_archive(archive_path: Path, venv_path: Path) -> None:
-        cmd = [
-            "rm",
-            "-rf",
-            str(venv_path),
-        ]
-        exit_code = subprocess_rt.run(cmd, printer=logger.info)
-        if exit_code != 0:
-            raise VirtualEnvironmentError(f"Failed to remove venv: {exit_code}")
+        if venv_path.exists():
+            # Failures stay visible in the logs, as they were with rm -rf
+            shutil.rmtree(venv_path, onexc=_log_removal_error)
         venv_path.mkdir(parents=True, exist_ok=True)
-        cmd = [
-            "tar",
-            "--use-compress-program",
-            "zstd",
-            "--extract",
-            "--file",
-            str(archive_path),
-            "--directory",
-            str(venv_path),
-        ]
         logger.info(f"Extracting venv archive: {archive_path}")
-        exit_code = subprocess_rt.run(cmd, printer=logger.info)
-
-        if exit_code != 0:
-            raise VirtualEnvironmentError(
-                f"Failed to extract venv archive: {exit_code}"
-            )
+        try:
+            with (
+                open(archive_path, "rb") as raw,
+                zstandard.ZstdDecompressor().stream_reader(raw) as decompressed,
+                tarfile.open(fileobj=decompressed, mode="r|") as archive,
+            ):
+                # Our own archive, its absolute interpreter symlinks are expected
+                archive.extractall(venv_path, filter="fully_trusted")
+        except (OSError, tarfile.TarError, zstandard.ZstdError) as e:
+            raise VirtualEnvironmentError(f"Failed to extract venv archive: {e}") from e
 
         TestVirtualEnvironment.__upgrade_scripts_shebang(venv_path)
 
+    @staticmethod
+    def __contains(file: Path, data: bytes) -> bool:
+        # Mapped whole, a script may mention the path past its first page
+        with open(file, "rb") as f:
+            if os.fstat(f.fileno()).st_size == 0:
+                return False
+            with mmap.mmap(f.fileno(), 0, access=mmap.ACCESS_READ) as mapped:
+                return mapped.find(data) != -1
+
     @staticmethod
     def __upgrade_scripts_shebang(venv_path: Path) -> None:
         with open(venv_path / "venv.json", "r", encoding="utf-8") as f:
             venv_config = json.load(f)
 
         bin_path = venv_path / "bin"
-        if not bin_path.exists():
+        try:
+            # Dirents carry the type, only regular files cost one lstat for the mode
+            with os.scandir(bin_path) as entries:
+                binary_files = [
+                    Path(entry.path)
+                    for entry in entries
+                    if entry.is_file(follow_symlinks=False)
+                    and entry.stat(follow_symlinks=False).st_mode & 0o111
+                ]
+        except FileNotFoundError:
             return
 
-        binary_files = []
-
-        for file in bin_path.iterdir():
-            if file.is_file() and not file.is_symlink() and file.stat().st_mode & 0o111:
-                binary_files.append(file)
+        base_path = venv_config["base_path"]
+        base_path_bytes = base_path.encode("utf-8")
+        new_base_path = str(venv_path)
 
-        for file in binary_files:
+        def upgrade_script(file: Path) -> None:
+            # Searched as bytes first, only scripts holding the path are decoded
+            if not TestVirtualEnvironment.__contains(file, base_path_bytes):
+                return
             try:
                 content = file.read_text(encoding="utf-8")
             except UnicodeDecodeError:
-                continue
+                return
             logger.info(f"Upgrading shebang for script: {file}")
-            if venv_config["base_path"] in content:
-                file.write_text(
-                    content.replace(venv_config["base_path"], str(venv_path)),
-                    encoding="utf-8",
-                )
+            # The script may be hardlinked to a template, replace it
+            mode = file.stat().st_mode
+            file.unlink()
+            file.write_text(content.replace(base_path, new_base_path), encoding="utf-8")
+            file.chmod(mode)
+
+        # Scripts are independent, their syscalls overlap on a few threads
+        with ThreadPoolExecutor(max_workers=min(8, len(binary_files) or 1)) as executor:
+            list(executor.map(upgrade_script, binary_files))
+
+        # Later clones of this venv must look for its own path in the scripts
+        venv_config["base_path"] = str(venv_path)
+        # Renamed over the hardlinked template file, which stays untouched
+        write_json_atomic(venv_path / "venv.json", venv_config)
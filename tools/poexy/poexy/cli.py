@@ -4,7 +4,6 @@ import sys
 from typing import Optional
 import typer
 
-from poexy import poetry
 from poexy.pyproject import Pyproject, PyprojectError
 from poexy.safe_print import safe_print_done, safe_print_info, safe_print_start
 from rich.console import Console
@@ -19,6 +18,12 @@ def _entry_point_parser(value: str) -> str:
     return f"{value}.py"
 
 
+def _format_size(size: int) -> str:
+    if size < 1024 * 1024:
+        return f"{size / 1024:.2f} KB"
+    return f"{size / (1024 * 1024):.2f} MB"
+
+
 def _validate_path(poetry_project_path: Path, module_path: Path) -> Path:
     path = poetry_project_path / module_path
     if not path.exists():
@@ -68,6 +73,9 @@ def command(
         help="Clean the build directory.",
     ),
 ):
+    # The build stack is only needed once a build runs, not to render --help
+    from poexy import poetry
+
     _validate_path(poetry_project_path, package_path)
     
     pyproject = Pyproject(poetry_project_path)
@@ -131,16 +139,8 @@ def command(
             executable_name=executable_name
         )
 
-        executable_size_kb = executable_size / 1024
-        executable_size_mb = executable_size / 1024 / 1024
-
-        if executable_size_kb < 1024:
-            executable_size_str = f"{executable_size_kb:.2f} KB"
-        else:
-            executable_size_str = f"{executable_size_mb:.2f} MB"
-
         safe_print_info(
-            f"Executable size: {executable_size_str}", 
+            f"Executable size: {_format_size(executable_size)}", 
             printer=logger.info
         )
 
@@ -1,19 +1,22 @@
+import functools
 import logging
 from pathlib import Path
 
 import typer
-from poexy.cli import app, command
-from rich.console import Console
 
 
-console = Console()
+@functools.cache
+def console():
+    # Created on the first log record, not when the module is imported
+    from rich.console import Console
+    return Console()
 
 
 class ConsoleHandler(logging.Handler):
     def emit(self, record):
         try:
             msg = self.format(record)
-            console.log(msg, emoji=True)
+            console().log(msg, emoji=True)
         except Exception:
             self.handleError(record)
             typer.Exit(1)
@@ -30,6 +33,7 @@ logger.handlers.clear()
 logger.addHandler(console_handler)
 
 def self_build():
+    from poexy.cli import command
     poetry_project_path = Path(__file__).parent.parent
     command(
         poetry_project_path=poetry_project_path,
@@ -40,6 +44,7 @@ def self_build():
     )
 
 def main():
+    from poexy.cli import app
     app()
 
 if __name__ == "__main__":
@@ -4,12 +4,13 @@ from pathlib import Path
 import shutil
 import sys
 import tomllib
+from typing import Dict, List, Tuple
 import zipfile
 
 
 from poexy import safe_command
 from poexy.safe_print import safe_print_done, safe_print_error, safe_print_info, safe_print_start, safe_print_success
-from poexy.wheel import WheelBuilder
+from poexy.wheel import ManifestPatch, WheelBuilder
 
 logger = logging.getLogger(__name__)
 
@@ -17,6 +18,19 @@ class PoetryProjectError(Exception):
     pass
 
 
+# Wheels found per dist folder state, a rewrite of the folder changes its mtime
+_WHEEL_CACHE: Dict[Tuple[str, int, str], List[Path]] = {}
+
+
+def _find_wheels(distribuable_path: Path, project_version: str) -> List[Path]:
+    key = (str(distribuable_path), distribuable_path.stat().st_mtime_ns, project_version)
+    wheels = _WHEEL_CACHE.get(key)
+    if wheels is None:
+        wheels = list(distribuable_path.glob(f"*{project_version}*.whl"))
+        _WHEEL_CACHE[key] = wheels
+    return list(wheels)
+
+
 def get_executable_size(project_path: Path, executable_name: str) -> int:
     distribuable_path = project_path / "dist"
     executable_path = distribuable_path / executable_name
@@ -110,8 +124,7 @@ def package_wheel(
         printer=logger.info
     )
 
-    wheel_file_filter = f"*{project_version}*.whl"
-    distribuable_files = list(distribuable_path.glob(wheel_file_filter))
+    distribuable_files = _find_wheels(distribuable_path, project_version)
 
     if len(distribuable_files) == 0:
         raise PoetryProjectError(f"No distribuable files found at '{distribuable_path}'")
@@ -121,28 +134,25 @@ def package_wheel(
         printer=logger.info
     )
     
+    python_version = f"{sys.version_info.major}.{sys.version_info.minor}"
+    # Formatted once, the classifier filter then only runs endswith per entry
+    classifier_suffix = f"Python :: {python_version}"
+
     # Add to wheel packages
     for distribuable_file in distribuable_files:
         with WheelBuilder.extract(distribuable_file, project_name, project_version) as builder:
-            builder.manifests.metadata.set_required_python_version(
-                f"=={sys.version_info.major}.{sys.version_info.minor}.*"
-            )
-            builder.manifests.metadata.set_platform(builder.metadata.platform)
-            builder.manifests.metadata.set_supported_platform(builder.metadata.platform)
-            builder.manifests.metadata.delete_requires_dist()
-            builder.manifests.metadata.delete_classifiers(
-                "Classifier",
-                lambda v: not v.endswith(f"Python :: {sys.version_info.major}.{sys.version_info.minor}")
-            )
-            builder.manifests.wheel.set_root_is_purelib(False)
-            builder.manifests.wheel.set_tag(builder.metadata.tag)
-            builder.manifests.record.delete(
-                builder.metadata.dist_info_folder / "entry_points.txt"
-            )
-            builder.manifests.record.set(
-                source=executable_path,
-                destination=builder.metadata.data_scripts_folder / executable_name
-            )
+            # Queued as one patch, the manifests and the archive are rewritten once
+            builder.apply(ManifestPatch(
+                required_python_version=f"=={python_version}.*",
+                platform=builder.metadata.platform,
+                supported_platform=builder.metadata.platform,
+                delete_requires_dist=True,
+                classifiers_delete_predicate=lambda v, s=classifier_suffix: not v.endswith(s),
+                root_is_purelib=False,
+                tag=builder.metadata.tag,
+                record_delete=[builder.metadata.dist_info_folder / "entry_points.txt"],
+                record_set=[(executable_path, builder.metadata.data_scripts_folder / executable_name)],
+            ))
             builder.build()
         
     safe_print_done("Executable packaged successfully", printer=logger.info)
\ No newline at end of file
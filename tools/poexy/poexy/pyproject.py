@@ -1,10 +1,21 @@
+from concurrent.futures import ThreadPoolExecutor, as_completed
+import functools
+import itertools
 import mmap
+import os
 from pathlib import Path
+import re
 import tomllib
-from typing import Dict, List, Union
+from typing import Dict, Iterator, List
 
-ENTRY_POINT_SEARCH_STRING_1 = b'if __name__ == "__main__":'
-ENTRY_POINT_SEARCH_STRING_2 = b"if __name__ == '__main__':"
+ENTRY_POINT_SEARCH_PATTERN = re.compile(rb"""if __name__ == ["']__main__["']:""")
+# Sources above this size are mapped instead of read in one go
+ENTRY_POINT_MMAP_THRESHOLD = 256 * 1024
+# Environments, caches and build outputs never hold the project entry point
+ENTRY_POINT_SKIP_DIRECTORIES = frozenset({
+    ".venv", "venv", "__pycache__", ".git", ".tox", "dist", "build",
+    ".mypy_cache", ".pytest_cache", "node_modules", ".eggs"
+})
 
 class PyprojectError(Exception):
     pass
@@ -12,29 +23,33 @@ class PyprojectError(Exception):
 class Pyproject:
     def __init__(self, project_path: Path):
         self.project_path = project_path
-        self.__ensure_poetry_project()
-        pyproject_path = self.project_path / "pyproject.toml"
-        with open(pyproject_path, "rb") as file:
-            self.pyproject = tomllib.load(file)
+        self.pyproject = self.__load_poetry_project()
+        # Every property reads from these sections, resolve them once
+        tool = self.pyproject.get("tool", {})
+        self._poetry = tool.get("poetry", {})
+        self._poexy = tool.get("poexy", {})
 
-    def __ensure_poetry_project(self):
+    def __load_poetry_project(self) -> Dict:
         pyproject_path = self.project_path / "pyproject.toml"
-        if not pyproject_path.exists():
+        try:
+            with open(pyproject_path, "rb") as file:
+                return tomllib.load(file)
+        except FileNotFoundError:
             raise PyprojectError(f"Not a Poetry project: {self.project_path}")
 
-    @property
+    @functools.cached_property
     def project_name(self) -> str:
         if "project" in self.pyproject:
             return self.pyproject["project"]["name"]
         else:
-            return self.pyproject["tool"]["poetry"]["name"]
+            return self._poetry["name"]
 
-    @property
+    @functools.cached_property
     def project_version(self) -> str:
         if "project" in self.pyproject:
             return self.pyproject["project"]["version"]
         else:
-            return self.pyproject["tool"]["poetry"]["version"]
+            return self._poetry["version"]
     
     def __search_poetry_packages(self, packages: List[Dict]) -> Path:
         def search_package(package: dict) -> Path:
@@ -51,54 +66,72 @@ class Pyproject:
             raise PyprojectError("Multiple packages found in pyproject.toml. Please specify the package to use either in tool.poetry.packages or in tool.poexy.package section.")
         return includes[0]
     
-    @property
+    @functools.cached_property
     def package_path(self) -> Path:
-        poetry = self.pyproject["tool"]["poetry"]
-        poetry_packages = poetry["packages"]
+        poetry_packages = self._poetry.get("packages")
         if  poetry_packages:
             if isinstance(poetry_packages, list):
                 return self.__search_poetry_packages(poetry_packages)
             else:
                 raise PyprojectError("Invalid packages format in pyproject.toml")
         else:
-            poexy = self.pyproject["tool"]["poexy"]
-            if "package" in poexy:
-                return Path(poexy["package"])
+            if "package" in self._poexy:
+                return Path(self._poexy["package"])
             else:
                 raise PyprojectError("No package found in pyproject.toml. Please specify the package to use in tool.poexy.package section.")
             
-    def __search_entry_point_file(self, path: Path) -> Union[Path, None]:
-        with open(path, 'rb', buffering=0) as file:
-            data = mmap.mmap(file.fileno(), 0, access=mmap.ACCESS_READ)
-            matched_first_pattern = data.find(ENTRY_POINT_SEARCH_STRING_1) != -1
-            matched_second_pattern = data.find(ENTRY_POINT_SEARCH_STRING_2) != -1
-            if matched_first_pattern or matched_second_pattern:
-                return path
+    def __search_entry_point_file(self, path: str) -> bool:
+        with open(path, 'rb') as file:
+            if os.fstat(file.fileno()).st_size <= ENTRY_POINT_MMAP_THRESHOLD:
+                matched = ENTRY_POINT_SEARCH_PATTERN.search(file.read())
             else:
-                return None
+                with mmap.mmap(file.fileno(), 0, access=mmap.ACCESS_READ) as data:
+                    # Advice values are not flags, each one is its own call
+                    if hasattr(mmap, "MADV_SEQUENTIAL"):
+                        data.madvise(mmap.MADV_SEQUENTIAL)
+                        data.madvise(mmap.MADV_WILLNEED)
+                    matched = ENTRY_POINT_SEARCH_PATTERN.search(data)
+            return matched is not None
             
-    def __search_entry_point(self, path: Path) -> Union[List[Path], None]:
-        result = []
-        for path in path.iterdir():
-            if path.is_dir():
-                entry_point = self.__search_entry_point(path)
-                if entry_point:
-                    result.extend(entry_point)
-            elif path.is_file() and path.suffix == ".py":
-                entry_point = self.__search_entry_point_file(path)
-                if entry_point:
-                    result.append(entry_point)
-        if len(result) == 0:
-            return None
-        return result
+    def __search_entry_point_candidates(self, path: str) -> Iterator[str]:
+        with os.scandir(path) as entries:
+            for entry in entries:
+                if entry.is_dir(follow_symlinks=False):
+                    if entry.name in ENTRY_POINT_SKIP_DIRECTORIES:
+                        continue
+                    yield from self.__search_entry_point_candidates(entry.path)
+                elif entry.is_file(follow_symlinks=False) and entry.name.endswith(".py"):
+                    yield entry.path
+
+    def __search_entry_point(self, path: str) -> Iterator[Path]:
+        # Paths stay plain strings during the walk, only matches become Path
+        candidates = list(self.__search_entry_point_candidates(path))
+        if not candidates:
+            return
+        max_workers = min(32, (os.cpu_count() or 1) * 4, len(candidates))
+        with ThreadPoolExecutor(max_workers=max_workers) as executor:
+            futures = {executor.submit(self.__search_entry_point_file, candidate): candidate for candidate in candidates}
+            try:
+                # Lazily yielded, the caller stops consuming once it has seen enough matches
+                for future in as_completed(futures):
+                    if future.result():
+                        yield Path(futures[future])
+            finally:
+                for future in futures:
+                    future.cancel()
     
-    @property
+    @functools.cached_property
     def entry_point(self) -> str:
-        poexy = self.pyproject["tool"]["poexy"]
-        if "entry-point" in poexy:
-            return poexy["entry-point"]
+        if "entry-point" in self._poexy:
+            return self._poexy["entry-point"]
         else:            
-            entry_points = self.__search_entry_point(self.project_path)
+            # The entry point lives in the package, fall back to the whole project without one
+            try:
+                search_path = self.project_path / self.package_path
+            except PyprojectError:
+                search_path = self.project_path
+            # A second match is already ambiguous, the rest of the tree is not needed
+            entry_points = list(itertools.islice(self.__search_entry_point(os.fspath(search_path)), 2))
 
             if len(entry_points) == 0:
                 raise PyprojectError("No entry point found in pyproject.toml. Please specify the entry point to use in tool.poexy.entry-point section.")
@@ -107,10 +140,9 @@ class Pyproject:
             else:
                 raise PyprojectError("Multiple entry points found in pyproject.toml. Please specify the entry point to use in tool.poexy.entry-point section.")
             
-    @property
+    @functools.cached_property
     def executable_name(self) -> str:
-        poexy = self.pyproject["tool"]["poexy"]
-        if "executable-name" in poexy:
-            return poexy["executable-name"]
+        if "executable-name" in self._poexy:
+            return self._poexy["executable-name"]
         else:
             return self.project_name
\ No newline at end of file
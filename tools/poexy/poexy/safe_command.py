@@ -1,40 +1,56 @@
 import os
 import subprocess
 import sys
-from typing import Callable
+from typing import Callable, Optional
 
 Printer = Callable[[str], None]
 
-def run(cmd: list[str], printer: Printer, **kwargs) -> int:
-    """Run subprocess with proper encoding for Windows compatibility."""
-    # Force UTF-8 encoding for subprocess
-    env = os.environ.copy()
-    env['PYTHONIOENCODING'] = 'utf-8'
-    
+# Force UTF-8 encoding for subprocess, the environment is snapshotted once at import
+_BASE_ENV = {
+    **os.environ,
+    'PYTHONIOENCODING': 'utf-8',
     # On Windows, set additional encoding environment variables
-    if sys.platform == 'win32':
-        env['PYTHONLEGACYWINDOWSSTDIO'] = 'utf-8'
+    **({'PYTHONLEGACYWINDOWSSTDIO': 'utf-8'} if sys.platform == 'win32' else {})
+}
+
+def _print_lines(lines: list[bytes], printer: Printer) -> None:
+    # One decode and one printer call for every line of a chunk
+    text = b"\n".join(line.strip() for line in lines).decode('utf-8', errors='replace')
+    if text:
+        printer(text)
+
+def run(cmd: list[str], printer: Printer, error_printer: Optional[Printer] = None, **kwargs) -> int:
+    """Run subprocess with proper encoding for Windows compatibility."""
+    # Popen never mutates env, the shared mapping is only copied for overrides
+    env = kwargs.pop('env', None)
+    env = {**_BASE_ENV, **env} if env else _BASE_ENV
 
     arguments = {
         'stdout': subprocess.PIPE, 
         'stderr': subprocess.STDOUT,
-        'shell': False,
-        'text': True,
-        'encoding': 'utf-8'
+        'shell': False
     }
 
     arguments.update(kwargs)
 
     process = subprocess.Popen(cmd, env=env, **arguments)
 
-    while True:
-        output = process.stdout.readline()
-        if output:
-            printer(output.strip())
-        if process.poll() is not None:
-            break
+    # Output is drained in raw chunks until EOF, a blocking read works on every platform
+    fd = process.stdout.fileno()
+    pending = b""
+    while chunk := os.read(fd, 65536):
+        lines = (pending + chunk).split(b"\n")
+        pending = lines.pop()
+        if lines:
+            _print_lines(lines, printer)
+    if pending:
+        _print_lines([pending], printer)
+    process.stdout.close()
 
-    exit_code = process.poll()
+    exit_code = process.wait()
+    # stderr is folded into the printed output, only the failure itself is reported here
+    if exit_code != 0 and error_printer is not None:
+        error_printer(f"Command '{cmd[0]}' exited with code {exit_code}")
     return exit_code
 
 
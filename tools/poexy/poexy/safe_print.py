@@ -1,9 +1,21 @@
 import os
+import re
 import sys
 from typing import Callable
 
 
-Printer = Callable[[str], None]
+Printer = Callable[..., None]
+
+_FALLBACK_MAP = {
+    "🔄": "[INFO]",
+    "❌": "[ERROR]",
+    "✅": "[SUCCESS]",
+    "⚠️": "[WARNING]",
+    "🚀": "[START]",
+    "🎉": "[SUCCESS]"
+}
+# Every emoji is replaced in a single pass over the text
+_FALLBACK_PATTERN = re.compile("|".join(map(re.escape, _FALLBACK_MAP)))
 
 # Force UTF-8 encoding for Windows compatibility
 os.environ['PYTHONIOENCODING'] = 'utf-8'
@@ -12,44 +24,36 @@ if sys.platform == 'win32':
     sys.stdout.reconfigure(encoding='utf-8', errors='replace')
     sys.stderr.reconfigure(encoding='utf-8', errors='replace')
 
-def safe_print(text: str, printer: Printer) -> None:
+def safe_print(text: str, *args: object, printer: Printer) -> None:
     """Print text with emoji fallback for Windows compatibility."""
+    # Arguments are %-style and left to the printer, a logger only formats emitted records
     try:
-        printer(text)
+        printer(text, *args)
     except UnicodeEncodeError:
         # Fallback to ASCII if emoji encoding fails
-        fallback_map = {
-            "🔄": "[INFO]",
-            "❌": "[ERROR]",
-            "✅": "[SUCCESS]",
-            "⚠️": "[WARNING]",
-            "🚀": "[START]",
-            "🎉": "[SUCCESS]"
-        }
-        for emoji, replacement in fallback_map.items():
-            text = text.replace(emoji, replacement)
-        printer(text)
-
-def safe_print_info(text: str, printer: Printer) -> None:
+        text = _FALLBACK_PATTERN.sub(lambda match: _FALLBACK_MAP[match.group(0)], text)
+        printer(text, *args)
+
+def safe_print_info(text: str, *args: object, printer: Printer) -> None:
     """Print text with emoji fallback for Windows compatibility."""
-    safe_print(f"🔄 {text}", printer=printer)
+    safe_print(f"🔄 {text}", *args, printer=printer)
 
-def safe_print_error(text: str, printer: Printer) -> None:
+def safe_print_error(text: str, *args: object, printer: Printer) -> None:
     """Print text with emoji fallback for Windows compatibility."""
-    safe_print(f"❌ {text}", printer=printer)
+    safe_print(f"❌ {text}", *args, printer=printer)
 
-def safe_print_success(text: str, printer: Printer) -> None:
+def safe_print_success(text: str, *args: object, printer: Printer) -> None:
     """Print text with emoji fallback for Windows compatibility."""
-    safe_print(f"✅ {text}", printer=printer)
+    safe_print(f"✅ {text}", *args, printer=printer)
 
-def safe_print_warning(text: str, printer: Printer) -> None:
+def safe_print_warning(text: str, *args: object, printer: Printer) -> None:
     """Print text with emoji fallback for Windows compatibility."""
-    safe_print(f"⚠️ {text}", printer=printer)
+    safe_print(f"⚠️ {text}", *args, printer=printer)
 
-def safe_print_start(text: str, printer: Printer) -> None:
+def safe_print_start(text: str, *args: object, printer: Printer) -> None:
     """Print text with emoji fallback for Windows compatibility."""
-    safe_print(f"🚀 {text}", printer=printer)
+    safe_print(f"🚀 {text}", *args, printer=printer)
 
-def safe_print_done(text: str, printer: Printer) -> None:
+def safe_print_done(text: str, *args: object, printer: Printer) -> None:
     """Print text with emoji fallback for Windows compatibility."""
-    safe_print(f"🎉 {text}", printer=printer)
\ No newline at end of file
+    safe_print(f"🎉 {text}", *args, printer=printer)
\ No newline at end of file
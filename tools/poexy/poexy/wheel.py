@@ -1,30 +1,51 @@
+from collections import defaultdict
+from concurrent.futures import ThreadPoolExecutor
 import contextlib
 import csv
+from dataclasses import dataclass, field
 from enum import Enum
 import hashlib
+import io
 import logging
+import mmap
+import os
 import sys
 from pathlib import Path
 import shutil
+import stat
 import sysconfig
+import time
 from tempfile import TemporaryDirectory
-from typing import Callable, Generator, List, Optional, Tuple, Union
+from typing import Callable, Dict, Generator, List, Optional, Tuple, Union
 import zipfile
 from email.message import Message
 from email.parser import Parser
 
 from poexy.safe_print import safe_print_info, safe_print_start, safe_print_success
 
+try:
+    from isal import isal_zlib
+except ImportError:
+    isal_zlib = None
+
 logger = logging.getLogger(__name__)
 
+# Windows has no meaningful inode numbers to order files by
+_SORT_BY_INODE = sys.platform != "win32"
+
+# Skips compression entirely, for throwaway wheels where build time matters more than size
+FAST_BUILD_ENV = "POEXY_FAST"
+
 ManifestStorage = List[Tuple[str, str]]
-ManifestStorageOperation = Callable[[ManifestStorage], None]
+ManifestIndex = Dict[str, List[int]]
 
 
 class Manifest:
     def __init__(self, path: Path):
         self.__path = path
-        self.__operations: List[ManifestStorageOperation] = []
+        self.__storage: Optional[ManifestStorage] = None
+        # Header name to its row positions, kept in step with the ordered storage
+        self.__index: ManifestIndex = defaultdict(list)
     
     def __read(self) -> ManifestStorage:
         with open(self.__path, "r", encoding="utf-8") as file:
@@ -32,79 +53,67 @@ class Manifest:
         data = Parser().parsestr(storage)
         return data.items()
     
-    def __write(self, storage: ManifestStorage):
+    def __write(self, storage: ManifestStorage) -> bytes:
         message = Message()
         for k, v in storage:
             message.add_header(k, v)
-        with open(self.__path, "w", encoding="utf-8") as file:
-            file.write(message.as_string())
-
-    def build(self):
-        storage = self.__read()
-        for operation in self.__operations:
-            operation(storage)
-        self.__write(storage)
-
-    def get(self, key: str, callback: Callable[[str], None]):
-        def operation(storage: ManifestStorage):
-            for k, v in storage:
-                if k == key:
-                    callback(v)
-                    return
+        return message.as_string().encode("utf-8")
+
+    def __load(self) -> ManifestStorage:
+        if self.__storage is None:
+            self.__storage = self.__read()
+            self.__reindex()
+        return self.__storage
+
+    def __reindex(self):
+        self.__index.clear()
+        for i, (k, _) in enumerate(self.__storage):
+            self.__index[k].append(i)
+
+    def build(self) -> bytes:
+        return self.__write(self.__load())
+
+    def get(self, key: str) -> str:
+        self.__load()
+        indexes = self.__index.get(key)
+        if not indexes:
             raise KeyError(key)
-        self.__operations.append(operation)
+        return self.__storage[indexes[0]][1]
 
     def find_and_delete(self, filter: Callable[[str, str], bool]):
-        indexes_to_delete = []
-        def operation(storage: ManifestStorage):
-            for i, (k, v) in zip(range(len(storage)), storage):
-                if filter(k, v):
-                    indexes_to_delete.append(i)
-            for i in reversed(indexes_to_delete):
-                del storage[i]
-        self.__operations.append(operation)
+        storage = self.__load()
+        storage[:] = [(k, v) for k, v in storage if not filter(k, v)]
+        self.__reindex()
     
     def set(self, key: str, value: str):
-        def operation(storage: ManifestStorage):
-            for k, _ in storage:
-                if k == key:
-                    raise KeyError(key)
-            storage.append((key, value))
-        self.__operations.append(operation)
+        storage = self.__load()
+        if self.__index.get(key):
+            raise KeyError(key)
+        self.__index[key].append(len(storage))
+        storage.append((key, value))
 
     def replace(self, key: str, value: str):
-        def operation(storage: ManifestStorage):
-            for i, (k, _) in zip(range(len(storage)), storage):
-                if k == key:
-                    storage[i] = (key, value)
-                    return
+        storage = self.__load()
+        indexes = self.__index.get(key)
+        if not indexes:
             raise KeyError(key)
-        self.__operations.append(operation)
+        storage[indexes[0]] = (key, value)
 
     def replace_or_set(self, key: str, value: str):
-        def operation(storage: ManifestStorage):
-            for i, (k, _) in zip(range(len(storage)), storage):
-                if k == key:
-                    storage[i] = (key, value)
-                    return
-            storage.append((key, value))
-        self.__operations.append(operation)
+        self.__load()
+        if self.__index.get(key):
+            self.replace(key, value)
+        else:
+            self.set(key, value)
 
     def delete(self, key: str, all: bool = False):
-        def operation(storage: ManifestStorage):
-            count = 0
-            indexes_to_delete = []
-            for i, (k, v) in zip(range(len(storage)), storage):
-                if k == key:
-                    indexes_to_delete.append(i)
-                    count += 1
-                    if not all:
-                        break
-            for i in reversed(indexes_to_delete):
-                del storage[i]
-            if count == 0:
-                raise KeyError(key)
-        self.__operations.append(operation)
+        storage = self.__load()
+        indexes = self.__index.get(key)
+        if not indexes:
+            raise KeyError(key)
+        indexes_to_delete = set(indexes if all else indexes[:1])
+        storage[:] = [item for i, item in enumerate(storage) if i not in indexes_to_delete]
+        self.__reindex()
 
 
 ManifestOperation = Callable[[Manifest], None]
@@ -116,11 +125,10 @@ class MetadataManifest:
         self.__manifest = Manifest(path)
         self.__operations: List[ManifestOperation] = []
 
-    def build(self) -> bool:
+    def build(self) -> bytes:
         for operation in self.__operations:
             operation(self.__manifest)
-        self.__manifest.build()
-        return len(self.__operations) > 0
+        return self.__manifest.build()
     
     def set_required_python_version(self, value: str):
         def operation(manifest: Manifest):
@@ -153,11 +161,10 @@ class WheelManifest:
         self.__manifest = Manifest(path)
         self.__operations: List[ManifestOperation] = []
 
-    def build(self) -> bool:
+    def build(self) -> bytes:
         for operation in self.__operations:
             operation(self.__manifest)
-        self.__manifest.build()
-        return len(self.__operations) > 0
+        return self.__manifest.build()
 
     def set_root_is_purelib(self, value: bool):
         def operation(manifest: Manifest):
@@ -170,8 +177,19 @@ class WheelManifest:
         self.__operations.append(operation)
 
 
+def _sha256_file(path: Path) -> str:
+    with open(path, "rb") as file:
+        if hasattr(hashlib, "file_digest"):
+            return hashlib.file_digest(file, "sha256").hexdigest()
+        digest = hashlib.sha256()
+        if os.fstat(file.fileno()).st_size > 0:
+            with mmap.mmap(file.fileno(), 0, access=mmap.ACCESS_READ) as mapped:
+                digest.update(mapped)
+        return digest.hexdigest()
+
+
 class Record:
-    def __init__(self, path: Path, sha: str, size: int):
+    def __init__(self, path: Path, sha: Optional[str], size: Optional[int]):
         self.path = path
         self.sha = sha
         self.size = size
@@ -189,14 +207,25 @@ class Record:
     def from_path(path: Path) -> "Record":
         if not path.is_absolute():
             raise ValueError(f"{path} is not an absolute path")
-        if not path.is_file():
+        # A single stat answers both the existence and the size
+        try:
+            path_stat = os.stat(path)
+        except FileNotFoundError:
+            raise FileNotFoundError(f"{path} does not exist") from None
+        if not stat.S_ISREG(path_stat.st_mode):
             raise FileNotFoundError(f"{path} is not a file")
-        if not path.exists():
-            raise FileNotFoundError(f"{path} does not exist")
         return Record(
             path, 
-            f"sha256={hashlib.sha256(path.read_bytes()).hexdigest()}", 
-            path.stat().st_size
+            f"sha256={_sha256_file(path)}", 
+            path_stat.st_size
+        )
+
+    @staticmethod
+    def from_data(path: Path, data: bytes) -> "Record":
+        return Record(
+            path, 
+            f"sha256={hashlib.sha256(data).hexdigest()}", 
+            len(data)
         )
 
 
@@ -207,33 +236,48 @@ ManifestRecordStorageOperation = Callable[[ManifestRecordStorage], None]
 class RecordManifest:
     def __init__(self, path: Path):
         self.__base_path = path.parent.parent # /dist-info/..
-        self.__path = path
+        self.path = path
         self.__operations: List[ManifestRecordStorageOperation] = []
 
     def __read(self) -> List[Record]:
-        with open(self.__path, "r") as file:
-            records = csv.reader(file)
-            records = [Record(Path(line[0]), line[1], line[2]) for line in records]
-            for record in records:
-                record.path = self.__base_path / record.path
-            return records
+        with open(self.path, "r") as file:
+            return [
+                Record(self.__base_path / line[0], line[1], int(line[2]) if line[2] else None) 
+                for line in csv.reader(file)
+            ]
     
-    def __write(self, records: List[Record]):
-        for record in records:
-            record.to_relative_path(self.__base_path)
-        with open(self.__path, "w") as file:
-            writer = csv.writer(file, lineterminator="\n")
-            rows = [[str(record.path), record.sha, str(record.size)] for record in records]
-            writer.writerows(rows)
-
-    def __copy(self, source: Path, destination: Path):
+    def __write(self, records: List[Record]) -> bytes:
+        buffer = io.StringIO()
+        writer = csv.writer(buffer, lineterminator="\n")
+        writer.writerows(
+            (
+                str(record.path.relative_to(self.__base_path)), 
+                record.sha, 
+                "" if record.size is None else str(record.size)
+            ) 
+            for record in records
+        )
+        return buffer.getvalue().encode("utf-8")
+
+    def __copy(self, source: Path, destination: Path) -> Record:
         if not destination.is_relative_to(self.__base_path):
             raise ValueError(f"Destination {destination} is not relative to {self.__base_path}")
         if not destination.is_dir():
             destination.parent.mkdir(parents=True, exist_ok=True)
+            target = destination
         else:
             destination.mkdir(parents=True, exist_ok=True)
-        shutil.copy(source, destination)
+            target = destination / source.name
+        # Hash while copying, the copy would otherwise be read back just to be hashed
+        digest = hashlib.sha256()
+        size = 0
+        with open(source, "rb") as source_file, open(target, "wb") as target_file:
+            while chunk := source_file.read(1 << 20):
+                digest.update(chunk)
+                target_file.write(chunk)
+                size += len(chunk)
+        shutil.copymode(source, target)
+        return Record(target, f"sha256={digest.hexdigest()}", size)
 
     def __delete(self, path: Path):
         if not path.exists():
@@ -241,13 +285,26 @@ class RecordManifest:
         if not path.is_relative_to(self.__base_path):
             raise ValueError(f"Path {path} is not relative to {self.__base_path}")
 
-    def build(self):
+    @staticmethod
+    def __hash_pending(records: ManifestRecordStorage):
+        # Rewritten files are only queued, their digests are computed together on a pool
+        pending = [i for i, record in enumerate(records) if record.sha is None]
+        if not pending:
+            return
+        with ThreadPoolExecutor(max_workers=min(len(pending), os.cpu_count() or 1)) as executor:
+            hashed = executor.map(Record.from_path, [records[i].path for i in pending])
+            for i, record in zip(pending, hashed):
+                records[i] = record
+
+    def build(self) -> bytes:
         records = self.__read()
         for operation in self.__operations:
             operation(records)
-        for record in records:
-            print(record.path, record.sha, record.size)
-        self.__write(records)
+        self.__hash_pending(records)
+        if logger.isEnabledFor(logging.DEBUG):
+            for record in records:
+                logger.debug("%s %s %s", record.path, record.sha, record.size)
+        return self.__write(records)
 
     def get(self, path: Path) -> Record:
         def operation(records: ManifestRecordStorage):
@@ -262,34 +319,40 @@ class RecordManifest:
             for record in records:
                 if record.path == destination:
                     raise KeyError(destination)
-            self.__copy(source, destination)
-            records.append(Record.from_path(destination))
+            records.append(self.__copy(source, destination))
         self.__operations.append(operation)
 
     def replace(self, source: Path, destination: Path,):
         def operation(records: ManifestRecordStorage):
             record_path = self.__base_path / destination / source.name
-            for i, record in zip(range(len(records)), records):
+            for i, record in enumerate(records):
                 if record.path == record_path:
-                    self.__copy(source, record_path)
-                    records[i] = Record.from_path(record_path)
+                    records[i] = self.__copy(source, record_path)
                     return
             raise KeyError(destination)
         self.__operations.append(operation)
         
     def replace_in_place(self, path: Path):
         def operation(records: ManifestRecordStorage):
-            for i, record in zip(range(len(records)), records):
+            for i, record in enumerate(records):
+                if record.path == path:
+                    records[i] = Record(path, None, None)
+                    return
+        self.__operations.append(operation)
+
+    def replace_with_data(self, path: Path, data: bytes):
+        def operation(records: ManifestRecordStorage):
+            for i, record in enumerate(records):
                 if record.path == path:
-                    records[i] = Record.from_path(path)
+                    records[i] = Record.from_data(path, data)
                     return
         self.__operations.append(operation)
 
     def delete(self, path: Path):
         def operation(records: ManifestRecordStorage):
-            for record in records:
+            for i, record in enumerate(records):
                 if record.path == path:
-                    records.remove(record)
+                    del records[i]
                     self.__delete(path)
                     record.delete()
                     return
@@ -302,14 +365,18 @@ class Manifests:
         self.wheel: WheelManifest = WheelManifest(path / "WHEEL")
         self.record: RecordManifest = RecordManifest(path / "RECORD")
     
-    def build(self):
-        is_metadata_changed = self.metadata.build()
-        is_wheel_changed = self.wheel.build()
-        if is_metadata_changed:
-            self.record.replace_in_place(self.metadata.path)
-        if is_wheel_changed:
-            self.record.replace_in_place(self.wheel.path)
-        self.record.build()
+    def build(self) -> Dict[Path, bytes]:
+        # Manifests are rendered in memory, the archive takes them without a disk round-trip
+        metadata = self.metadata.build()
+        wheel = self.wheel.build()
+        self.record.replace_with_data(self.metadata.path, metadata)
+        self.record.replace_with_data(self.wheel.path, wheel)
+        record = self.record.build()
+        return {
+            self.metadata.path: metadata,
+            self.wheel.path: wheel,
+            self.record.path: record
+        }
 
 
 class WheelDataSubFolder(str, Enum):
@@ -355,6 +422,34 @@ class WheelMetadata:
     def __data_folder(self, sub_folder: WheelDataSubFolder) -> Path:
         return self.path / Path(f"{self.name}-{self.version}.data") / sub_folder.value
 
+@contextlib.contextmanager
+def _deflate_backend() -> Generator[int, None, None]:
+    """Deflate through ISA-L when it is installed, yielding the matching compression level."""
+    if isal_zlib is None:
+        # Level 6 is the zlib default made explicit
+        yield 6
+        return
+    # zipfile resolves its compressor through the module global, crc32 stays bound to zlib
+    zlib_module = zipfile.zlib
+    zipfile.zlib = isal_zlib
+    try:
+        yield isal_zlib.ISAL_DEFAULT_COMPRESSION
+    finally:
+        zipfile.zlib = zlib_module
+
+@dataclass
+class ManifestPatch:
+    required_python_version: Optional[str] = None
+    platform: Optional[str] = None
+    supported_platform: Optional[str] = None
+    delete_requires_dist: bool = False
+    classifiers_delete_predicate: Optional[Callable[[str], bool]] = None
+    root_is_purelib: Optional[bool] = None
+    tag: Optional[str] = None
+    record_delete: List[Path] = field(default_factory=list)
+    record_set: List[Tuple[Path, Path]] = field(default_factory=list)
+
+
 class WheelBuilder:
     def __init__(self, path: Path, name: str, version: str):
         self.__path = path
@@ -371,6 +466,29 @@ class WheelBuilder:
         yield builder
         builder.__temp.cleanup()
 
+    def apply(self, patch: ManifestPatch):
+        metadata = self.manifests.metadata
+        if patch.required_python_version is not None:
+            metadata.set_required_python_version(patch.required_python_version)
+        if patch.platform is not None:
+            metadata.set_platform(patch.platform)
+        if patch.supported_platform is not None:
+            metadata.set_supported_platform(patch.supported_platform)
+        if patch.delete_requires_dist:
+            metadata.delete_requires_dist()
+        if patch.classifiers_delete_predicate is not None:
+            metadata.delete_classifiers("Classifier", patch.classifiers_delete_predicate)
+        wheel = self.manifests.wheel
+        if patch.root_is_purelib is not None:
+            wheel.set_root_is_purelib(patch.root_is_purelib)
+        if patch.tag is not None:
+            wheel.set_tag(patch.tag)
+        record = self.manifests.record
+        for path in patch.record_delete:
+            record.delete(path)
+        for source, destination in patch.record_set:
+            record.set(source=source, destination=destination)
+
     def __extract(self):
         safe_print_start(
             f"Extracting wheel package at {self.__temp_path}...", 
@@ -383,53 +501,100 @@ class WheelBuilder:
             printer=logger.info
         )
 
+    def __walk_files(self, root: Path, skip: Optional[str] = None) -> Generator[Tuple[str, str], None, None]:
+        # dist-info always sits at the top of a wheel, pruning it there keeps the walk condition-free
+        root = os.fspath(root)
+        directories = [root]
+        while directories:
+            directory = directories.pop()
+            # Calculate relative path for the zip
+            relative_directory = os.path.relpath(directory, self.__temp_path)
+            files = []
+            with os.scandir(directory) as entries:
+                for entry in entries:
+                    if not entry.is_dir():
+                        files.append(entry)
+                    elif not entry.is_symlink() and not (directory == root and entry.name == skip):
+                        directories.append(entry.path)
+            # Inode order follows the on-disk layout closely enough to help readahead
+            if _SORT_BY_INODE:
+                files.sort(key=os.DirEntry.inode)
+            for entry in files:
+                yield (
+                    entry.path, 
+                    os.path.normpath(os.path.join(relative_directory, entry.name))
+                )
+
     def build(self):
         safe_print_start(
-            f"Building wheel package {self.metadata.archive_filename}...", 
+            "Building wheel package %s...", 
+            self.metadata.archive_filename,
             printer=logger.info
         )
 
-        self.manifests.build()
+        # Rendered manifests are written from memory, their stale copies on disk are skipped
+        manifests = {
+            os.fspath(manifest_path): data
+            for manifest_path, data in self.manifests.build().items()
+        }
 
         path = self.__path.parent / self.metadata.archive_filename;
         dist_info_folder_name = self.metadata.dist_info_folder.name
         
+        file_count = 0
+
+        if os.environ.get(FAST_BUILD_ENV) == "1":
+            compression = zipfile.ZIP_STORED
+        else:
+            compression = zipfile.ZIP_DEFLATED
+
         # Create the wheel archive
-        with zipfile.ZipFile(path, 'w', zipfile.ZIP_DEFLATED) as wheel_zip:
-            dist_info_files = []
-            
+        with _deflate_backend() as compresslevel, zipfile.ZipFile(path, 'w', compression, compresslevel=compresslevel) as wheel_zip:
             # Add all files from temp_path to the zip, except dist-info folder
-            for file_path in self.__temp_path.rglob('*'):
-                if file_path.is_file():
-                    # Calculate relative path for the zip
-                    relative_path = file_path.relative_to(self.__temp_path)
-                    
-                    # Skip dist-info folder files for now, we'll add them last
-                    if str(relative_path.parent).endswith(dist_info_folder_name):
-                        dist_info_files.append((file_path, relative_path))
-                        safe_print_info(
-                            f"File {relative_path} queued to wheel package.", 
-                            printer=logger.info
-                        )
-                        continue
-                    
-                    wheel_zip.write(file_path, relative_path)
-
-                    safe_print_info(
-                        f"File {relative_path} added to wheel package.", 
-                        printer=logger.info
-                    )
+            for file_path, relative_path in self.__walk_files(self.__temp_path, skip=dist_info_folder_name):
+                wheel_zip.write(file_path, relative_path)
+                file_count += 1
+
+                # Formatted by the logger only when the record is emitted
+                safe_print_info(
+                    "File %s added to wheel package.", 
+                    relative_path,
+                    printer=logger.info
+                )
             
             # Add dist-info folder files last for optimization
-            for file_path, relative_path in dist_info_files:
+            for file_path, relative_path in self.__walk_files(self.metadata.dist_info_folder):
+                if file_path in manifests:
+                    continue
                 wheel_zip.write(file_path, relative_path)
+                file_count += 1
                 safe_print_info(
-                    f"File {relative_path} added to wheel package.", 
+                    "File %s added to wheel package.", 
+                    relative_path,
                     printer=logger.info
                 )
 
+            for file_path, data in manifests.items():
+                relative_path = os.path.relpath(file_path, self.__temp_path)
+                info = zipfile.ZipInfo(relative_path, date_time=time.localtime()[:6])
+                info.external_attr = 0o644 << 16
+                wheel_zip.writestr(info, data, compress_type=compression, compresslevel=compresslevel)
+                file_count += 1
+                safe_print_info(
+                    "File %s added to wheel package.", 
+                    relative_path,
+                    printer=logger.info
+                )
+
+        safe_print_info(
+            "%d files added to wheel package.", 
+            file_count,
+            printer=logger.info
+        )
+
         safe_print_success(
-            f"Wheel package {self.metadata.archive_filename} built successfully.", 
+            "Wheel package %s built successfully.", 
+            self.metadata.archive_filename,
             printer=logger.info
         )
         